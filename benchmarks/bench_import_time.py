@@ -0,0 +1,97 @@
+"""Import time benchmark of the dag parsing entry point and of the cli
+
+Runs `python -X importtime` in a fresh interpreter importing dagger.collect_dags, and
+optionally building the dags of a dags folder too, or running a dagger cli command. Then
+prints the total import time, the slowest modules and the heavy packages which got
+imported.
+
+Usage: python benchmarks/bench_import_time.py [--collect | --cli "list-tasks"]
+    [--top 20]
+    AIRFLOW_HOME and ENV have to be set as for dag parsing, --collect reads the dags
+    folder of AIRFLOW_HOME
+"""
+
+import argparse
+import re
+import shlex
+import subprocess
+import sys
+
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+TRACKED_PACKAGES = [
+    "airflow",
+    "boto3",
+    "airflow.providers.amazon",
+    "airflow.providers.databricks",
+    "airflow.providers.postgres",
+    "airflow.providers.snowflake",
+    "airflow.providers.slack",
+]
+
+
+def measure(collect: bool = False, cli_command: str = None) -> list:
+    if cli_command:
+        code = (
+            "from dagger.main import cli; "
+            f"cli({shlex.split(cli_command)!r}, standalone_mode=False)"
+        )
+    else:
+        code = "import dagger.collect_dags"
+        if collect:
+            code += "; dagger.collect_dags.collect_dags()"
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+
+    imports = []
+    for line in result.stderr.splitlines():
+        matched = IMPORT_TIME_RE.match(line)
+        if matched:
+            self_us, cumulative_us, indent, module = matched.groups()
+            imports.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--collect", action="store_true", help="Build the dags after the import"
+    )
+    parser.add_argument(
+        "--cli",
+        default=None,
+        help="Run this dagger command instead of importing collect_dags",
+    )
+    parser.add_argument(
+        "--top", type=int, default=20, help="Number of slowest modules to print"
+    )
+    args = parser.parse_args()
+
+    imports = measure(collect=args.collect, cli_command=args.cli)
+    total_us = sum(
+        cumulative_us for _, _, cumulative_us, level in imports if level == 0
+    )
+    print(f"{len(imports)} modules imported in {total_us / 1e6:.2f}s")
+
+    print(f"\nSlowest {args.top} modules by self time:")
+    for module, self_us, cumulative_us, _ in sorted(imports, key=lambda item: -item[1])[
+        : args.top
+    ]:
+        print(
+            f"{self_us / 1e3:9.1f}ms {cumulative_us / 1e3:9.1f}ms cumulative  {module}"
+        )
+
+    imported_modules = {module for module, _, _, _ in imports}
+    print("\nTracked packages:")
+    for package in TRACKED_PACKAGES:
+        status = "imported" if package in imported_modules else "not imported"
+        print(f"    {package}: {status}")
+
+
+if __name__ == "__main__":
+    main()
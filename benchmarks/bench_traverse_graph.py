@@ -0,0 +1,133 @@
+"""Micro-benchmark of the graph traversal creating the dags
+
+Builds a synthetic task graph of pipelines whose tasks read the output of the previous
+task of their pipeline and the output of a task of another pipeline, then times
+DagCreator.traverse_graph on it. The airflow objects are replaced by stand-ins, so only
+the traversal and the edge creation logic are measured.
+
+Usage: python benchmarks/bench_traverse_graph.py [--tasks 20000]
+    [--tasks-per-pipeline 25] [--with-data-nodes]
+    AIRFLOW_HOME and ENV have to be set as for dag parsing
+"""
+
+import argparse
+import time
+
+from dagger.dag_creator.airflow.dag_creator import DagCreator
+from dagger.graph.task_graph import Graph, TaskGraph
+
+SCHEDULE = "0 3 * * *"
+
+
+class _Pipeline:
+    def __init__(self, name: str):
+        self.name = name
+        self.schedule = SCHEDULE
+
+
+class _Task:
+    def __init__(self, pipeline: _Pipeline, name: str):
+        self.pipeline = pipeline
+        self.pipeline_name = pipeline.name
+        self.name = name
+
+
+class _Dataset:
+    def __init__(self, name: str):
+        self.airflow_name = name
+
+    def alias(self):
+        return self.airflow_name
+
+
+class _Operator:
+    def __rshift__(self, other):
+        return other
+
+
+class _BenchDagCreator(DagCreator):
+    def _create_dag(self, pipe_id, node):
+        self._tasks[self._get_control_flow_task_id(pipe_id)] = _Operator()
+        return pipe_id
+
+    def _create_job_task(self, node):
+        return _Operator()
+
+    def _create_data_task(self, pipe_id, node):
+        self._data_tasks.setdefault(pipe_id, {}).setdefault(
+            node.obj.airflow_name, _Operator()
+        )
+
+    def _get_external_task_sensor(
+        self, from_task_id, to_task_id, follow_external_dependency
+    ):
+        return _Operator()
+
+
+def build_graph(tasks: int, tasks_per_pipeline: int) -> Graph:
+    graph = Graph()
+    pipeline_count = (tasks + tasks_per_pipeline - 1) // tasks_per_pipeline
+    for task_index in range(tasks):
+        pipeline_index, position = divmod(task_index, tasks_per_pipeline)
+        pipeline_name = f"pipeline_{pipeline_index}"
+        if position == 0:
+            graph.add_node(
+                TaskGraph.NODE_TYPE_PIPELINE,
+                pipeline_name,
+                obj=_Pipeline(pipeline_name),
+            )
+        pipeline = graph.get_node(pipeline_name).obj
+
+        task_id = f"{pipeline_name}:task_{position}"
+        graph.add_node(
+            TaskGraph.NODE_TYPE_TASK,
+            task_id,
+            f"task_{position}",
+            _Task(pipeline, f"task_{position}"),
+        )
+        graph.add_edge(pipeline_name, task_id)
+
+        output_id = f"dataset_{pipeline_index}_{position}"
+        graph.add_node(TaskGraph.NODE_TYPE_DATASET, output_id, obj=_Dataset(output_id))
+        graph.add_edge(task_id, output_id)
+
+        if position > 0:
+            graph.add_edge(f"dataset_{pipeline_index}_{position - 1}", task_id)
+        if pipeline_index > 0:
+            upstream_pipeline = (pipeline_index * 7) % pipeline_count % pipeline_index
+            upstream_id = f"dataset_{upstream_pipeline}_{position}"
+            if graph.get_node(upstream_id) is not None:
+                graph.add_edge(
+                    upstream_id,
+                    task_id,
+                    follow_external_dependency={"poke_interval": 60},
+                )
+
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--tasks-per-pipeline", type=int, default=25)
+    parser.add_argument("--with-data-nodes", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = build_graph(args.tasks, args.tasks_per_pipeline)
+    timings = []
+    for _ in range(args.repeat):
+        dag_creator = _BenchDagCreator(graph, with_data_nodes=args.with_data_nodes)
+        start = time.perf_counter()
+        dag_creator.traverse_graph()
+        timings.append(time.perf_counter() - start)
+
+    dataset_count = len(graph.get_nodes(TaskGraph.NODE_TYPE_DATASET))
+    print(f"{args.tasks} tasks, {dataset_count} datasets")
+    print(f"traverse_graph: best {min(timings):.3f}s of {args.repeat}")
+
+
+if __name__ == "__main__":
+    main()
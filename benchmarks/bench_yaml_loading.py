@@ -0,0 +1,124 @@
+"""Micro-benchmark of the yaml loading layer
+
+Generates a dag tree with pipelines of task yaml files and compares the time of loading
+all of them with the pure python SafeLoader and with the libyaml based loader used by
+dagger.
+
+Usage: python benchmarks/bench_yaml_loading.py [--files 5000] [--tasks-per-pipeline 25]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import yaml
+
+from dagger.utilities import yaml_loader
+
+PIPELINE_YAML = """owner: "user@domain.com"
+description: Benchmark pipeline {index}
+schedule: "0 3 * * *"
+start_date: "2019-11-12T02:00"
+airflow_parameters:
+  default_args:
+  dag_parameters:
+alerts:
+"""
+
+TASK_YAML = """type: batch
+description: Benchmark task {index}
+inputs:
+  - type: s3
+    name: input_{index}
+    bucket: cho${{ENV}}-datalake
+    path: input/{index}/{{{{ds}}}}/
+  - type: athena
+    name: upstream_{index}
+    schema: dwh
+    table: upstream_{index}
+    follow_external_dependency:
+      poke_interval: 60
+outputs:
+  - type: athena
+    name: output_{index}
+    schema: dwh
+    table: output_{index}
+task_parameters:
+  job_name: job_{index}
+  absolute_job_name: benchmark
+  executable: job.py
+  executable_prefix: python
+airflow_task_parameters:
+  retries: 2
+template_parameters:
+  frequency: '24'
+environments:
+  local:
+    template_parameters:
+      frequency: '1'
+"""
+
+
+def generate_dag_tree(root: str, files: int, tasks_per_pipeline: int) -> list:
+    yaml_paths = []
+    pipeline_index = 0
+    while len(yaml_paths) < files:
+        pipeline_dir = os.path.join(root, f"pipeline_{pipeline_index}")
+        os.makedirs(pipeline_dir)
+        pipeline_path = os.path.join(pipeline_dir, "pipeline.yaml")
+        with open(pipeline_path, "w") as stream:
+            stream.write(PIPELINE_YAML.format(index=pipeline_index))
+        yaml_paths.append(pipeline_path)
+
+        for task_index in range(min(tasks_per_pipeline, files - len(yaml_paths))):
+            task_path = os.path.join(pipeline_dir, f"task_{task_index}.yaml")
+            with open(task_path, "w") as stream:
+                stream.write(TASK_YAML.format(index=f"{pipeline_index}_{task_index}"))
+            yaml_paths.append(task_path)
+        pipeline_index += 1
+
+    return yaml_paths
+
+
+def load_all(yaml_paths: list, loader) -> float:
+    environment = yaml_loader.get_environment()
+    start = time.perf_counter()
+    for yaml_path in yaml_paths:
+        with open(yaml_path) as stream:
+            content = yaml_loader.substitute_env_vars(
+                stream.read(), environment=environment
+            )
+        yaml.load(content, Loader=loader)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--tasks-per-pipeline", type=int, default=25)
+    args = parser.parse_args()
+
+    os.environ.setdefault("ENV", "local")
+    with tempfile.TemporaryDirectory() as root:
+        yaml_paths = generate_dag_tree(root, args.files, args.tasks_per_pipeline)
+
+        pure_python = load_all(yaml_paths, yaml.SafeLoader)
+        print(f"{len(yaml_paths)} files with yaml.SafeLoader: {pure_python:.2f}s")
+
+        if yaml_loader.SafeLoader is yaml.SafeLoader:
+            print(
+                "PyYAML is not built with libyaml, dagger falls back to yaml.SafeLoader"
+            )
+            return
+
+        libyaml = load_all(yaml_paths, yaml_loader.SafeLoader)
+        loader_name = yaml_loader.SafeLoader.__name__
+        print(f"{len(yaml_paths)} files with {loader_name}: {libyaml:.2f}s")
+        print(f"Speedup: {pure_python / libyaml:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,8 @@ import logging
 from abc import ABC, abstractmethod
 from typing import List
 
-from airflow.utils.types import DagRunType
-from slack.web.client import WebClient
 from dagger import conf
+from dagger.utilities.classes import PluginRegistry
 from dagger.utilities.config_validator import Attribute, ConfigValidator
 
 _logger = logging.getLogger("alerts")
@@ -63,6 +62,10 @@ class SlackAlert(AlertBase):
             self._slack_token = None
 
     def execute(self, dag, task, execution_date, run_time, url):
+        # Imported when an alert is sent, so the cli and the config validation don't
+        # need the slack client
+        from slack.web.client import WebClient
+
         client = WebClient(token=self._slack_token)
 
         slack_msg = f"""
@@ -82,14 +85,17 @@ class SlackAlert(AlertBase):
 
 
 class AlertFactory:
+    registry = PluginRegistry(AlertBase, entry_point_group="dagger.alerts")
+
     def __init__(self):
-        self.factory = dict()
+        self.factory = self.registry.plugins
 
-        for cls in AlertBase.__subclasses__():
-            self.factory[cls.ref_name] = cls
+    @classmethod
+    def register(cls, alert_cls=None, ref_name: str = None):
+        return cls.registry.register(alert_cls, ref_name=ref_name)
 
     def create_alert(self, ref_name, location, alert_config):
-        return self.factory[ref_name](location, alert_config)
+        return self.registry[ref_name](location, alert_config)
 
 
 def get_task_run_time(task_instance):
@@ -97,6 +103,8 @@ def get_task_run_time(task_instance):
 
 
 def airflow_task_fail_alerts(alerts: List[AlertBase], context):
+    from airflow.utils.types import DagRunType
+
     if conf.ENV == "datatst":
         return
     if context["dag_run"].run_type == DagRunType.MANUAL:
@@ -0,0 +1,51 @@
+import click
+
+from dagger import conf
+from dagger.graph.cycle_checker import CycleChecker
+from dagger.graph.builder import build_task_graph
+from dagger.graph.snapshot import read_snapshot
+from dagger.utils import Printer
+
+
+def _check_cycles(
+    root_dir: str = None, snapshot: str = None, levels: bool = False
+) -> CycleChecker:
+    task_graph = read_snapshot(snapshot) if snapshot else build_task_graph(root_dir)
+    cycle_checker = CycleChecker(task_graph)
+
+    if levels:
+        for task_id, level in sorted(
+            cycle_checker.task_levels.items(), key=lambda item: (item[1], item[0])
+        ):
+            click.echo(f"{level}\t{task_id}")
+
+    return cycle_checker
+
+
+@click.command("check-cycles")
+@click.option("--root", "-r", default=conf.DAGS_DIR, help="Root directory")
+@click.option(
+    "--snapshot",
+    "-s",
+    default=None,
+    help="Load the graph from a snapshot created by dagger compile",
+)
+@click.option(
+    "--levels",
+    is_flag=True,
+    default=False,
+    help="Print the topological level of every task",
+)
+def check_cycles(root: str, snapshot: str, levels: bool) -> None:
+    """
+    Checking the cross pipeline dependencies for cycles, which would leave the sensors
+    waiting forever
+    """
+    cycle_checker = _check_cycles(root_dir=root, snapshot=snapshot, levels=levels)
+    if cycle_checker.cycles:
+        Printer.print_error(cycle_checker.describe_cycles())
+        raise click.ClickException(
+            f"{len(cycle_checker.cycles)} dependency cycles found"
+        )
+
+    Printer.print_success("No dependency cycles found")
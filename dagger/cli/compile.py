@@ -0,0 +1,27 @@
+import click
+
+from dagger import conf
+from dagger.graph.builder import build_task_graph
+from dagger.graph.snapshot import write_snapshot
+from dagger.utils import Printer
+
+
+def _compile(root_dir: str, output: str):
+    g = build_task_graph(root_dir)
+    if conf.GRAPH_COMPACT:
+        g.compact()
+    write_snapshot(g, output)
+    return g
+
+
+@click.command("compile")
+@click.option("--root", "-r", default=conf.DAGS_DIR, help="Root directory")
+@click.option("--output", "-o", required=True, help="Path of the snapshot file")
+def compile_graph(root: str, output: str) -> None:
+    """
+    Compiling the task graph into a snapshot file which can be loaded by collect_dags
+    """
+    g = _compile(root, output)
+    Printer.print_success(
+        f"{len(g.get_pipeline_names())} pipelines are compiled into {output}"
+    )
@@ -0,0 +1,99 @@
+import os
+
+import click
+
+from dagger import conf
+from dagger.config_finder.config_cache import get_config_cache
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.graph.producer_index import DatasetProducerIndex
+from dagger.utils import Printer
+
+DAG_FILE_PREFIX = "dagger_"
+DAG_FILE_HEADER = (
+    "# Airflow DAG file generated by dagger generate-dag-files, don't edit it manually"
+)
+DAG_FILE_TEMPLATE = """{header}
+from dagger.collect_dags import collect_dags
+
+globals().update(collect_dags(only_pipelines=[{pipeline_name!r}]))
+"""
+
+
+def _get_dag_file_path(target_dir: str, pipeline_name: str) -> str:
+    return os.path.join(target_dir, f"{DAG_FILE_PREFIX}{pipeline_name}.py")
+
+
+def _is_generated_dag_file(file_path: str) -> bool:
+    with open(file_path, "r") as stream:
+        return stream.readline().rstrip("\n") == DAG_FILE_HEADER
+
+
+def _generate_dag_files(root_dir: str, target_dir: str):
+    """Writes one dag file per pipeline directory and deletes the generated files of the
+    removed pipelines. Existing files are only rewritten when their content changes, so
+    airflow doesn't reparse them. The dataset producer index used by the dag files is
+    refreshed as well."""
+    cf = ConfigFinder(root_dir)
+    cp = ConfigProcessor(
+        cf, config_cache=get_config_cache(), workers=conf.CONFIG_LOADER_WORKERS
+    )
+
+    pipeline_configs = cf.find_configs()
+    pipeline_names = sorted(
+        ConfigProcessor.get_pipeline_name(pipeline_config)
+        for pipeline_config in pipeline_configs
+    )
+
+    producer_index = DatasetProducerIndex.load(conf.PRODUCER_INDEX_PATH, conf.ENV)
+    producer_index.update(pipeline_configs, cp)
+    producer_index.save(conf.PRODUCER_INDEX_PATH)
+    cp.save_cache()
+
+    os.makedirs(target_dir, exist_ok=True)
+    dag_file_paths = set()
+    for pipeline_name in pipeline_names:
+        dag_file_path = _get_dag_file_path(target_dir, pipeline_name)
+        dag_file_paths.add(dag_file_path)
+        content = DAG_FILE_TEMPLATE.format(
+            header=DAG_FILE_HEADER, pipeline_name=pipeline_name
+        )
+
+        if os.path.isfile(dag_file_path):
+            with open(dag_file_path, "r") as stream:
+                if stream.read() == content:
+                    continue
+
+        with open(dag_file_path, "w") as stream:
+            stream.write(content)
+
+    removed_files = []
+    for file_name in sorted(os.listdir(target_dir)):
+        file_path = os.path.join(target_dir, file_name)
+        if (
+            file_name.startswith(DAG_FILE_PREFIX)
+            and file_name.endswith(".py")
+            and file_path not in dag_file_paths
+            and _is_generated_dag_file(file_path)
+        ):
+            os.remove(file_path)
+            removed_files.append(file_path)
+
+    return pipeline_names, removed_files
+
+
+@click.command()
+@click.option("--root", "-r", default=conf.DAGS_DIR, help="Root directory")
+@click.option(
+    "--target_dir", "-t", required=True, help="Directory to generate the dag files to"
+)
+def generate_dag_files(root: str, target_dir: str) -> None:
+    """
+    Generating one airflow dag file per pipeline, so airflow can parse the pipelines in
+    parallel
+    """
+    pipeline_names, removed_files = _generate_dag_files(root, target_dir)
+    Printer.print_success(
+        f"Dag files are generated for {len(pipeline_names)} pipelines, "
+        f"{len(removed_files)} stale files are removed"
+    )
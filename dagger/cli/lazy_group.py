@@ -0,0 +1,36 @@
+import importlib
+from typing import Dict, List
+
+import click
+
+
+class LazyGroup(click.Group):
+    """Click group importing the module of a subcommand only when the subcommand is run
+    or described in the help
+
+    lazy_subcommands maps the command names to the "<module>.<command attribute>" paths
+    of the commands, so `dagger list-tasks` doesn't import what `dagger compile` needs.
+    """
+
+    def __init__(self, *args, lazy_subcommands: Dict[str, str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(
+            set(super().list_commands(ctx)) | set(self.lazy_subcommands.keys())
+        )
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        module_name, command_name = self.lazy_subcommands[cmd_name].rsplit(".", 1)
+        command = getattr(importlib.import_module(module_name), command_name)
+        if not isinstance(command, click.Command):
+            raise ValueError(
+                f"{self.lazy_subcommands[cmd_name]} is not a click command"
+            )
+        return command
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import click
+
+from dagger import conf
+from dagger.graph.lineage import GraphLineage
+from dagger.graph.builder import build_task_graph
+from dagger.graph.snapshot import read_snapshot
+from dagger.graph.task_graph import TaskGraph
+from dagger.utils import Printer
+
+
+def _lineage(
+    node_id: str,
+    root_dir: str = None,
+    snapshot: str = None,
+    upstream: bool = False,
+    node_type: str = None,
+    path_to: str = None,
+    critical_path: bool = False,
+    logical_date: datetime = None,
+):
+    task_graph = read_snapshot(snapshot) if snapshot else build_task_graph(root_dir)
+    lineage = GraphLineage(task_graph)
+
+    if path_to:
+        path = lineage.shortest_path(node_id, path_to)
+        if path is None:
+            Printer.print_warning(f"{path_to} doesn't depend on {node_id}")
+            return []
+        lines = path
+    elif critical_path:
+        lines = [
+            f"{task_id} {tick.isoformat() if tick else '-'}"
+            for task_id, tick in lineage.critical_path(
+                node_id, logical_date=logical_date
+            )
+        ]
+    elif upstream:
+        lines = lineage.ancestors(node_id, node_type=node_type)
+    else:
+        lines = lineage.descendants(node_id, node_type=node_type)
+
+    for line in lines:
+        click.echo(line)
+    return lines
+
+
+@click.command()
+@click.argument("node_id")
+@click.option("--root", "-r", default=conf.DAGS_DIR, help="Root directory")
+@click.option(
+    "--snapshot",
+    "-s",
+    default=None,
+    help="Load the graph from a snapshot created by dagger compile",
+)
+@click.option(
+    "--upstream/--downstream",
+    default=False,
+    help="Direction of the lineage, downstream by default",
+)
+@click.option(
+    "--node_type",
+    "-t",
+    type=click.Choice([TaskGraph.NODE_TYPE_TASK, TaskGraph.NODE_TYPE_DATASET]),
+    default=None,
+    help="Only list the nodes of this type",
+)
+@click.option(
+    "--path_to",
+    "-p",
+    default=None,
+    help="Print the shortest dependency path from NODE_ID to this node",
+)
+@click.option(
+    "--critical_path",
+    is_flag=True,
+    default=False,
+    help="Print the upstream tasks gating NODE_ID",
+)
+@click.option(
+    "--logical_date",
+    type=click.DateTime(),
+    default=None,
+    help="Logical date of the run of NODE_ID for --critical_path, now by default",
+)
+def lineage(
+    node_id: str,
+    root: str,
+    snapshot: str,
+    upstream: bool,
+    node_type: str,
+    path_to: str,
+    critical_path: bool,
+    logical_date: datetime,
+) -> None:
+    """
+    Listing what depends on a task or dataset (e.g. s3://bucket/path) or what it depends
+    on. Task ids are <task name>:<pipeline name>
+    """
+    _lineage(
+        node_id,
+        root_dir=root,
+        snapshot=snapshot,
+        upstream=upstream,
+        node_type=node_type,
+        path_to=path_to,
+        critical_path=critical_path,
+        logical_date=logical_date,
+    )
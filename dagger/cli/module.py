@@ -1,8 +1,8 @@
 import json
 
 import click
-import yaml
 
+from dagger.utilities import yaml_loader
 from dagger.utilities.module import Module
 from dagger.utils import Printer
 
@@ -23,21 +23,33 @@ def parse_key_value(ctx, param, value):
     key_value_dict = {}
     for pair in value:
         try:
-            key, val_file_path = pair.split('=', 1)
-            with open(val_file_path, 'r') as f:
-                if val_file_path.endswith(('.yaml', '.yml')):
-                    val = yaml.safe_load(f)
+            key, val_file_path = pair.split("=", 1)
+            with open(val_file_path, "r") as f:
+                if val_file_path.endswith((".yaml", ".yml")):
+                    val = yaml_loader.safe_load(f)
                 else:
                     val = json.load(f)
             key_value_dict[key] = val
         except ValueError:
-            raise click.BadParameter(f"Key-value pair '{pair}' is not in the format key=value")
+            raise click.BadParameter(
+                f"Key-value pair '{pair}' is not in the format key=value"
+            )
     return key_value_dict
 
+
 @click.command()
 @click.option("--config_file", "-c", help="Path to module config file")
-@click.option("--target_dir", "-t", help="Path to directory to generate the task configs to")
-@click.option("--jinja_parameters", "-j", callback=parse_key_value, multiple=True, default=None, help="Jinja parameters file in the format: <var_name>=<path to json/yaml file>")
+@click.option(
+    "--target_dir", "-t", help="Path to directory to generate the task configs to"
+)
+@click.option(
+    "--jinja_parameters",
+    "-j",
+    callback=parse_key_value,
+    multiple=True,
+    default=None,
+    help="Jinja parameters file in the format: <var_name>=<path to json/yaml file>",
+)
 def generate_tasks(config_file: str, target_dir: str, jinja_parameters: dict) -> None:
     """
     Generating tasks for a module based on config
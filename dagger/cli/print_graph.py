@@ -1,30 +1,42 @@
 import click
 
-from dagger.config_finder.config_finder import ConfigFinder
-from dagger.config_finder.config_processor import ConfigProcessor
-from dagger.graph.task_graph import TaskGraph
+from dagger import conf
+from dagger.graph.builder import build_task_graph
+from dagger.graph.snapshot import read_snapshot
+from dagger.graph.task_graph import GRAPH_OUTPUT_FORMATS
 
 
-def _print_graph(root_dir: str):
-    cf = ConfigFinder(root_dir)
-    cp = ConfigProcessor(cf)
-
-    pipelines = cp.process_pipeline_configs()
-
-    g = TaskGraph()
-    for pipeline in pipelines:
-        g.add_pipeline(pipeline)
-
-    g.print_graph()
+def _print_graph(
+    root_dir: str, output_format: str = "text", output: str = None, snapshot: str = None
+):
+    g = read_snapshot(snapshot) if snapshot else build_task_graph(root_dir)
+    g.print_graph(out_file=output, output_format=output_format)
 
 
 @click.command()
-@click.option("--root", "-r", help="Root directory")
-def print_graph(root: str) -> None:
+@click.option("--root", "-r", default=conf.DAGS_DIR, help="Root directory")
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(GRAPH_OUTPUT_FORMATS),
+    default="text",
+    help="Output format",
+)
+@click.option(
+    "--output", "-o", default=None, help="Output file, standard output by default"
+)
+@click.option(
+    "--snapshot",
+    "-s",
+    default=None,
+    help="Load the graph from a snapshot created by dagger compile",
+)
+def print_graph(root: str, output_format: str, output: str, snapshot: str) -> None:
     """
-    Printing task template config
+    Printing the task graph
     """
-    _print_graph(root)
+    _print_graph(root, output_format=output_format, output=output, snapshot=snapshot)
 
 
 if __name__ == "__main__":
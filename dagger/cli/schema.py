@@ -0,0 +1,41 @@
+import json
+
+import click
+
+from dagger.utilities.config_schema import SCHEMA_KINDS
+from dagger.utils import Printer
+
+
+def _write_schema(kind: str, output: str = None) -> dict:
+    schema = SCHEMA_KINDS[kind]()
+    schema_json = json.dumps(schema, indent=2, sort_keys=True)
+    if output:
+        with open(output, "w") as stream:
+            stream.write(schema_json + "\n")
+    else:
+        click.echo(schema_json)
+    return schema
+
+
+@click.command()
+@click.option(
+    "--kind",
+    "-k",
+    type=click.Choice(sorted(SCHEMA_KINDS.keys())),
+    default="task",
+    help="Config the schema is generated for",
+)
+@click.option(
+    "--output",
+    "-o",
+    default=None,
+    help="Path of the schema file, printed to the standard output if not set",
+)
+def schema(kind: str, output: str) -> None:
+    """
+    Printing the json schema of the pipeline or task configs for editor validation and
+    autocompletion
+    """
+    _write_schema(kind, output)
+    if output:
+        Printer.print_success(f"The {kind} schema is written into {output}")
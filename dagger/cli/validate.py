@@ -0,0 +1,50 @@
+from itertools import groupby
+from typing import List
+
+import click
+
+from dagger import conf
+from dagger.config_finder.config_validation import validate_directory
+from dagger.utilities.config_validator import ConfigError
+from dagger.utils import Printer
+
+
+def _validate(root_dir: str, workers: int = 1, fast: bool = False) -> List[ConfigError]:
+    errors = validate_directory(root_dir, workers=workers, schema_only=fast)
+
+    for location, location_errors in groupby(errors, key=lambda error: error.location):
+        click.echo(location)
+        for error in location_errors:
+            click.echo(f"    {error.field_path or '-'}: {error.message}")
+
+    return errors
+
+
+@click.command()
+@click.option("--root", "-r", default=conf.DAGS_DIR, help="Root directory")
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=conf.CONFIG_LOADER_WORKERS,
+    help="Number of processes validating the pipelines in parallel",
+)
+@click.option(
+    "--fast",
+    is_flag=True,
+    default=False,
+    help="Only check the configs against the json schemas without building the tasks",
+)
+def validate(root: str, workers: int, fast: bool) -> None:
+    """
+    Validating every pipeline, task and input/output config and reporting all the errors
+    at once
+    """
+    errors = _validate(root, workers=workers, fast=fast)
+    if errors:
+        file_count = len({error.location for error in errors})
+        raise click.ClickException(
+            f"{len(errors)} errors found in {file_count} config files"
+        )
+
+    Printer.print_success("All configs are valid")
@@ -1,20 +1,216 @@
+import logging
+from typing import List
+
 from dagger import conf
+from dagger.config_finder.config_cache import ConfigCache, get_config_cache
 from dagger.config_finder.config_finder import ConfigFinder
 from dagger.config_finder.config_processor import ConfigProcessor
 from dagger.dag_creator.airflow.dag_creator import DagCreator
+from dagger.graph.builder import build_task_graph
+from dagger.graph.cycle_checker import CycleChecker
+from dagger.graph.producer_index import DatasetProducerIndex
+from dagger.graph.snapshot import read_snapshot
 from dagger.graph.task_graph import TaskGraph
+from dagger.utilities.exceptions import DependencyCycleException
+
+_logger = logging.getLogger("graph")
+
+
+def _check_cycles(task_graph: TaskGraph):
+    if not conf.GRAPH_CHECK_CYCLES:
+        return
+
+    cycle_checker = CycleChecker(task_graph)
+    if not cycle_checker.cycles:
+        return
+
+    if conf.GRAPH_CHECK_CYCLES == "fail":
+        raise DependencyCycleException(cycle_checker.describe_cycles())
+    _logger.error(
+        "Dependency cycles found in the task graph:\n%s",
+        cycle_checker.describe_cycles(),
+    )
+
+
+class IncrementalDagCollector:
+    """Keeps the task graph and the dags between runs and only rebuilds the pipelines
+    whose config files changed together with the pipelines depending on their datasets.
+    Meant for long-lived dag parsing processes."""
+
+    def __init__(self, root: str, config_cache: ConfigCache = None):
+        self._config_finder = ConfigFinder(root)
+        self._config_processor = ConfigProcessor(
+            self._config_finder,
+            config_cache=config_cache,
+            workers=conf.CONFIG_LOADER_WORKERS,
+        )
+        self._task_graph = TaskGraph()
+        self._dags = {}
+
+    @property
+    def task_graph(self):
+        return self._task_graph
+
+    def collect(self) -> dict:
+        pipeline_configs = {}
+        fingerprints = {}
+        for pipeline_config in self._config_finder.find_configs():
+            fingerprint = pipeline_config.fingerprint()
+            # A file deleted while collecting, the pipeline is removed until it is found
+            # complete again
+            if fingerprint is None:
+                continue
+            pipeline_name = ConfigProcessor.get_pipeline_name(pipeline_config)
+            pipeline_configs[pipeline_name] = pipeline_config
+            fingerprints[pipeline_name] = fingerprint
+
+        removed_pipelines = set(self._task_graph.get_pipeline_names()) - set(
+            pipeline_configs.keys()
+        )
+        changed_pipelines = {
+            pipeline_name
+            for pipeline_name, fingerprint in fingerprints.items()
+            if self._task_graph.get_fingerprint(pipeline_name) != fingerprint
+        }
+
+        # Every changed config is processed before the graph is touched, so a config
+        # failing to parse leaves the graph, the fingerprints and the dags of the
+        # previous call in place and the next call retries it
+        self._config_processor.load_configs(
+            [
+                pipeline_configs[pipeline_name]
+                for pipeline_name in sorted(changed_pipelines)
+            ]
+        )
+        pipelines = {
+            pipeline_name: self._config_processor.process_pipeline_config(
+                pipeline_configs[pipeline_name]
+            )
+            for pipeline_name in sorted(changed_pipelines)
+        }
+
+        affected_pipelines = set(changed_pipelines)
+        for pipeline_name in removed_pipelines | changed_pipelines:
+            affected_pipelines |= self._task_graph.get_dependent_pipelines(
+                pipeline_name
+            )
+            self._task_graph.remove_pipeline(pipeline_name)
+            self._dags.pop(pipeline_name, None)
+
+        for pipeline_name, pipeline in pipelines.items():
+            if pipeline:
+                self._task_graph.add_pipeline(
+                    pipeline, fingerprint=fingerprints[pipeline_name]
+                )
 
+        for pipeline_name in changed_pipelines:
+            affected_pipelines |= self._task_graph.get_dependent_pipelines(
+                pipeline_name
+            )
+        self._config_processor.save_cache()
 
-def collect_dags():
+        if conf.GRAPH_COMPACT and (changed_pipelines or removed_pipelines):
+            self._task_graph.compact()
+
+        if changed_pipelines or removed_pipelines:
+            _check_cycles(self._task_graph)
+
+        # Pipelines whose dags failed to be created by a previous call are rebuilt too
+        graph_pipelines = set(self._task_graph.get_pipeline_names())
+        affected_pipelines |= graph_pipelines - set(self._dags.keys())
+        affected_pipelines &= graph_pipelines
+        _logger.info(
+            "Rebuilding dags of pipelines: %s", ", ".join(sorted(affected_pipelines))
+        )
+        if affected_pipelines:
+            dc = DagCreator(self._task_graph._graph)
+            self._dags.update(dc.traverse_graph(pipeline_ids=affected_pipelines))
+
+        return dict(self._dags)
+
+
+def _build_selected_task_graph(only_pipelines: List[str]) -> TaskGraph:
+    """Builds the selected pipelines only, their upstream tasks in other pipelines are
+    added from the dataset producer index. Only the directories of the selected
+    pipelines are read, the index is never written here, as the dag files of all
+    pipelines are parsed in parallel. A selected pipeline changed since the index was
+    built is built from its current config files with a warning, instead of failing the
+    import of its dag file"""
+    producer_index = DatasetProducerIndex.read(conf.PRODUCER_INDEX_PATH, conf.ENV)
     cf = ConfigFinder(conf.DAGS_DIR)
-    cp = ConfigProcessor(cf)
+    cp = ConfigProcessor(
+        cf, config_cache=get_config_cache(), workers=conf.CONFIG_LOADER_WORKERS
+    )
 
-    pipelines = cp.process_pipeline_configs()
+    selected_pipeline_configs = [
+        producer_index.get_pipeline_config(pipeline_name, cf)
+        for pipeline_name in only_pipelines
+    ]
 
     g = TaskGraph()
-    for pipeline in pipelines:
-        g.add_pipeline(pipeline)
+    cp.load_configs(selected_pipeline_configs)
+    for pipeline_name, pipeline_config in zip(
+        only_pipelines, selected_pipeline_configs
+    ):
+        pipeline = cp.process_pipeline_config(pipeline_config)
+        producer_index.refresh_pipeline(pipeline_name, pipeline)
+        if pipeline:
+            g.add_pipeline(pipeline)
+
+    producer_index.add_upstream_tasks(g)
+    cp.save_cache()
+
+    return g
+
+
+_incremental_collector = None
+
+
+def collect_dags(
+    incremental: bool = False, snapshot: str = None, only_pipelines: List[str] = None
+):
+    """Builds the airflow dags of all pipelines
+
+    Args:
+        incremental: Reuse the graph and the dags of the previous call and only rebuild
+            the changed pipelines
+        snapshot: Path of a snapshot created by dagger compile, the graph is loaded from
+            it without reading any yaml
+        only_pipelines: Names of the pipelines to create dags for. The other pipelines
+            are not read, the cross pipeline dependencies come from the dataset producer
+            index written by dagger generate-dag-files. Used by the dag files generated
+            with dagger generate-dag-files
+    """
+    global _incremental_collector
+
+    if incremental and snapshot:
+        raise ValueError(
+            "collect_dags can't be incremental and load a snapshot, "
+            "the snapshot is never reloaded"
+        )
+
+    if incremental:
+        if _incremental_collector is None:
+            _incremental_collector = IncrementalDagCollector(
+                conf.DAGS_DIR, config_cache=get_config_cache()
+            )
+        dags = _incremental_collector.collect()
+        if only_pipelines is not None:
+            dags = {
+                pipe_id: dag
+                for pipe_id, dag in dags.items()
+                if pipe_id in only_pipelines
+            }
+        return dags
+
+    if snapshot:
+        g = read_snapshot(snapshot)
+    elif only_pipelines is not None:
+        g = _build_selected_task_graph(only_pipelines)
+    else:
+        g = build_task_graph(conf.DAGS_DIR)
 
+    _check_cycles(g)
     dc = DagCreator(g._graph)
-    dags = dc.traverse_graph()
+    dags = dc.traverse_graph(pipeline_ids=only_pipelines)
     return dags
@@ -0,0 +1,235 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from dagger import conf
+from dagger.utilities.yaml_loader import (
+    get_env_file,
+    read_env_file,
+    referenced_env_vars,
+)
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_logger = logging.getLogger("configFinder")
+
+CACHE_VERSION = 1
+
+
+class _CacheEntry:
+    def __init__(
+        self,
+        mtime_ns: int,
+        size: int,
+        env: str,
+        env_vars: List[str],
+        env_fingerprint: str,
+        payload: bytes,
+    ):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.env = env
+        self.env_vars = env_vars
+        self.env_fingerprint = env_fingerprint
+        self.payload = payload
+
+
+class ConfigCache:
+    """On-disk cache of localized config dicts
+
+    Entries are keyed by the absolute path of the yaml file and are only valid while the
+    file's mtime and size, the dagger ENV and the values of the variables referenced in
+    the file, from the environment or from the env file, stay the same. Payloads are
+    kept pickled so every lookup returns a fresh copy which callers are free to mutate.
+    Several DAG processors can share the cache: on save the entries are merged with the
+    ones on disk under a lock, and the entries of deleted yaml files are dropped.
+    """
+
+    def __init__(self, cache_path: str, env: str):
+        self._cache_path = cache_path
+        self._env = env
+        self._entries = None
+        self._updated_paths = set()
+        self._env_file_stat = None
+        self._env_file_variables = {}
+
+    @property
+    def cache_path(self):
+        return self._cache_path
+
+    def _get_env_file_variables(self) -> Dict[str, str]:
+        """The variables of the env file, read again only when the file changes"""
+        env_file = get_env_file()
+        try:
+            stat = os.stat(env_file) if env_file else None
+        except OSError:
+            stat = None
+        env_file_stat = (env_file, stat.st_mtime_ns, stat.st_size) if stat else None
+
+        if env_file_stat != self._env_file_stat:
+            try:
+                self._env_file_variables = (
+                    read_env_file(env_file) if env_file_stat else {}
+                )
+            except (OSError, ValueError):
+                self._env_file_variables = {}
+            self._env_file_stat = env_file_stat
+        return self._env_file_variables
+
+    def _env_fingerprint(self, env_vars: List[str]) -> str:
+        env_file_variables = self._get_env_file_variables()
+        fingerprint = hashlib.sha1()
+        for env_var in env_vars:
+            value = (
+                env_file_variables[env_var]
+                if env_var in env_file_variables
+                else os.environ.get(env_var)
+            )
+            fingerprint.update(f"{env_var}={value!r}\0".encode())
+        return fingerprint.hexdigest()
+
+    def _read(self) -> Dict[str, _CacheEntry]:
+        try:
+            with open(self._cache_path, "rb") as stream:
+                version, entries = pickle.load(stream)
+            if version == CACHE_VERSION:
+                return entries
+            _logger.info(
+                "Ignoring config cache with version %s at: %s",
+                version,
+                self._cache_path,
+            )
+        except FileNotFoundError:
+            _logger.info("Config cache doesn't exist yet: %s", self._cache_path)
+        except Exception as e:
+            _logger.warning(
+                "Couldn't read config cache %s: %s", self._cache_path, str(e)
+            )
+        return {}
+
+    def _load(self) -> Dict[str, _CacheEntry]:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def get(self, yaml_path: str, default=None) -> Optional[dict]:
+        """Returns the cached config of yaml_path or default if the entry is missing or
+        stale"""
+        entry = self._load().get(yaml_path)
+        if entry is None:
+            return default
+
+        try:
+            stat = os.stat(yaml_path)
+        except OSError:
+            return default
+
+        if (
+            entry.mtime_ns != stat.st_mtime_ns
+            or entry.size != stat.st_size
+            or entry.env != self._env
+            or entry.env_fingerprint != self._env_fingerprint(entry.env_vars)
+        ):
+            return default
+
+        return pickle.loads(entry.payload)
+
+    def put(
+        self,
+        yaml_path: str,
+        content: str,
+        config: Optional[dict],
+        file_stat: os.stat_result,
+    ) -> None:
+        """Stores the config parsed from content, which is the raw text of yaml_path.
+        file_stat is the stat of yaml_path taken before reading it, nothing is stored if
+        the file changed since then"""
+        try:
+            stat = os.stat(yaml_path)
+        except OSError:
+            return
+        if (stat.st_mtime_ns, stat.st_size) != (
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+        ):
+            _logger.info(
+                "Config file changed while it was loaded, not caching it: %s", yaml_path
+            )
+            return
+
+        env_vars = referenced_env_vars(content)
+        self._load()[yaml_path] = _CacheEntry(
+            mtime_ns=file_stat.st_mtime_ns,
+            size=file_stat.st_size,
+            env=self._env,
+            env_vars=env_vars,
+            env_fingerprint=self._env_fingerprint(env_vars),
+            payload=pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        self._updated_paths.add(yaml_path)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+
+        with open(self._cache_path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        if not self._updated_paths:
+            return
+
+        cache_dir = os.path.dirname(self._cache_path) or "."
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with self._lock():
+                # Other DAG processors may have saved their entries since this cache was
+                # loaded
+                entries = self._read()
+                entries.update(
+                    (yaml_path, self._entries[yaml_path])
+                    for yaml_path in self._updated_paths
+                )
+                entries = {
+                    yaml_path: entry
+                    for yaml_path, entry in entries.items()
+                    if os.path.exists(yaml_path)
+                }
+
+                # Readers don't take the lock, the file is replaced atomically
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=".config_cache")
+                with os.fdopen(fd, "wb") as stream:
+                    pickle.dump(
+                        (CACHE_VERSION, entries),
+                        stream,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(tmp_path, self._cache_path)
+            self._entries = entries
+            self._updated_paths = set()
+        except OSError as e:
+            _logger.warning(
+                "Couldn't write config cache %s: %s", self._cache_path, str(e)
+            )
+
+
+def get_config_cache() -> Optional[ConfigCache]:
+    """The config cache of the dagger config, None if it is disabled"""
+    return (
+        ConfigCache(conf.CONFIG_CACHE_PATH, conf.ENV)
+        if conf.CONFIG_CACHE_ENABLED
+        else None
+    )
@@ -1,9 +1,15 @@
 import fnmatch
+import hashlib
 import logging
 import os
-from typing import List
+import re
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+from dagger import conf
 
 PIPELINE_CONFIG_FILENAME = "pipeline.yaml"
+DAGGER_IGNORE_FILENAME = ".daggerignore"
+PRUNED_DIRECTORIES = {"__pycache__", "node_modules"}
 _logger = logging.getLogger("configFinder")
 
 
@@ -43,37 +49,202 @@ class PipelineConfig:
     def job_configs(self):
         return self._job_configs
 
+    def fingerprint(self) -> Optional[Tuple]:
+        """Fingerprint of the config files of the pipeline, it changes whenever any of
+        the files is modified, added or deleted. None if a file was deleted since the
+        pipeline was found, the pipeline is treated as removed until it is found
+        again"""
+        file_stats = []
+        for file_name in [self._config] + [
+            job_config.config for job_config in self._job_configs
+        ]:
+            try:
+                stat = os.stat(os.path.join(self._directory, file_name))
+            except FileNotFoundError:
+                _logger.warning(
+                    "Config file %s of %s was removed", file_name, self._directory
+                )
+                return None
+            file_stats.append((file_name, stat.st_mtime_ns, stat.st_size))
+
+        return tuple(sorted(file_stats))
+
+    def content_fingerprint(self) -> Optional[str]:
+        """Hash of the names and the contents of the config files of the pipeline.
+        Unlike fingerprint, it doesn't depend on the file stats, so it stays the same on
+        every checkout of the same files. None if a file was deleted since the pipeline
+        was found"""
+        content_hash = hashlib.sha1()
+        for file_name in sorted(
+            [self._config] + [job_config.config for job_config in self._job_configs]
+        ):
+            try:
+                with open(os.path.join(self._directory, file_name), "rb") as stream:
+                    content = stream.read()
+            except FileNotFoundError:
+                _logger.warning(
+                    "Config file %s of %s was removed", file_name, self._directory
+                )
+                return None
+            content_hash.update(f"{file_name}\0{len(content)}\0".encode())
+            content_hash.update(content)
+
+        return content_hash.hexdigest()
+
 
 class ConfigFinder:
-    def __init__(self, root: str):
+    """Finds the pipeline directories under root
+
+    A directory is a pipeline if it contains pipeline.yaml and at least one task yaml.
+    Hidden directories, __pycache__ and everything matching the ignore patterns are
+    pruned without being listed. Patterns are glob patterns read from the .daggerignore
+    file of root and from the config_finder.ignore setting:
+        - patterns without "/" are matched against the name of the file or directory,
+          e.g. "sql" or "*_draft.yaml"
+        - patterns with "/" are matched against the path relative to root, e.g.
+          "test_batch/batch_job"
+        - patterns ending with "/" only match directories
+
+    Without nested_pipelines the directories under a pipeline directory hold the code of
+    its jobs, they are not listed at all.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        ignore_patterns: List[str] = None,
+        nested_pipelines: bool = None,
+    ):
         self._root = root
-
-    def find_configs(self) -> List[PipelineConfig]:
-        _logger.info("Collecting config files from: %s", self._root)
-        pipeline_configs = []
-
-        for root, _, files in os.walk(self._root):
-            confs = fnmatch.filter(files, "*.yaml")
-            if len(confs) <= 1:
+        self._ignore_patterns = (
+            conf.CONFIG_FINDER_IGNORE if ignore_patterns is None else ignore_patterns
+        )
+        self._nested_pipelines = (
+            conf.CONFIG_FINDER_NESTED_PIPELINES
+            if nested_pipelines is None
+            else nested_pipelines
+        )
+
+    def _read_ignore_file(self) -> List[str]:
+        try:
+            with open(os.path.join(self._root, DAGGER_IGNORE_FILENAME), "r") as stream:
+                lines = stream.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+        return [
+            line.strip()
+            for line in lines
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+    def _compile_ignore_patterns(self) -> Tuple[Optional[Pattern], Optional[Pattern]]:
+        """Returns the regexes matching the ignored files and the ignored directories by
+        their relative path"""
+        file_patterns = []
+        dir_patterns = []
+        for pattern in list(self._ignore_patterns) + self._read_ignore_file():
+            dir_only = pattern.endswith("/")
+            pattern = pattern.strip("/")
+            if not pattern:
                 continue
 
-            job_configs = []
-
-            _logger.info("Searching pipeline config in directory: %s", root)
-            pipeline_config_file = ""
-            for conf in confs:
-                if conf == PIPELINE_CONFIG_FILENAME:
-                    pipeline_config_file = conf
-                    _logger.info("Config found in directory: %s", root)
-                else:
-                    job_configs.append(TaskConfig(conf))
-
-            if pipeline_config_file == "":
-                _logger.info("Didn't find config in directory: %s", root)
+            # Patterns without "/" match in any directory
+            regex = (
+                fnmatch.translate(pattern)
+                if "/" in pattern
+                else r"(?:.*/)?" + fnmatch.translate(pattern)
+            )
+            dir_patterns.append(regex)
+            if not dir_only:
+                file_patterns.append(regex)
+
+        def _compile(patterns):
+            return re.compile("|".join(patterns)) if patterns else None
+
+        return _compile(file_patterns), _compile(dir_patterns)
+
+    @staticmethod
+    def _scan_directory(
+        directory: str, rel_directory: str, ignored_files, ignored_dirs
+    ) -> Tuple[List, List]:
+        """Returns the yaml file names and the (path, relative path) of the sub
+        directories to descend into"""
+        confs = []
+        sub_directories = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                rel_path = rel_directory + entry.name
+                if entry.is_dir():
+                    if (
+                        entry.name.startswith(".")
+                        or entry.name in PRUNED_DIRECTORIES
+                        or entry.is_symlink()
+                        or (ignored_dirs and ignored_dirs.match(rel_path))
+                    ):
+                        continue
+                    sub_directories.append((entry.path, rel_path + "/"))
+                elif entry.name.endswith(".yaml") and not (
+                    ignored_files and ignored_files.match(rel_path)
+                ):
+                    confs.append(entry.name)
+        return confs, sub_directories
+
+    @staticmethod
+    def _get_pipeline_config(
+        directory: str, confs: List[str]
+    ) -> Optional[PipelineConfig]:
+        if len(confs) <= 1 or PIPELINE_CONFIG_FILENAME not in confs:
+            return None
+
+        job_configs = [
+            TaskConfig(conf_file)
+            for conf_file in sorted(confs)
+            if conf_file != PIPELINE_CONFIG_FILENAME
+        ]
+        return PipelineConfig(directory, PIPELINE_CONFIG_FILENAME, job_configs)
+
+    def iter_configs(self) -> Iterator[PipelineConfig]:
+        """Yields the pipeline configs in the order of their directory paths"""
+        _logger.info("Collecting config files from: %s", self._root)
+        ignored_files, ignored_dirs = self._compile_ignore_patterns()
+
+        directories = [(self._root, "")]
+        while directories:
+            directory, rel_directory = directories.pop()
+            try:
+                confs, sub_directories = self._scan_directory(
+                    directory, rel_directory, ignored_files, ignored_dirs
+                )
+            except OSError as e:
+                _logger.warning("Couldn't list directory %s: %s", directory, str(e))
                 continue
 
-            pipeline_configs.append(
-                PipelineConfig(root, pipeline_config_file, job_configs)
+            pipeline_config = self._get_pipeline_config(directory, confs)
+            if pipeline_config is not None:
+                _logger.info("Config found in directory: %s", directory)
+
+            # The stack pops the last directory first
+            if pipeline_config is None or self._nested_pipelines:
+                directories.extend(sorted(sub_directories, reverse=True))
+
+            if pipeline_config is not None:
+                yield pipeline_config
+
+    def find_pipeline_config(self, rel_directory: str) -> Optional[PipelineConfig]:
+        """The config of the pipeline in a directory under root, without looking at any
+        other directory. None if the directory is not a pipeline (anymore)"""
+        ignored_files, ignored_dirs = self._compile_ignore_patterns()
+        rel_directory = rel_directory.strip("/") + "/"
+        directory = os.path.join(self._root, rel_directory.rstrip("/"))
+        try:
+            confs, _ = self._scan_directory(
+                directory, rel_directory, ignored_files, ignored_dirs
             )
+        except OSError as e:
+            _logger.warning("Couldn't list directory %s: %s", directory, str(e))
+            return None
+        return self._get_pipeline_config(directory, confs)
 
-        return pipeline_configs
+    def find_configs(self) -> List[PipelineConfig]:
+        return list(self.iter_configs())
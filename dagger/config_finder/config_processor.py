@@ -1,72 +1,225 @@
 import logging
-from os import environ
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+from os import environ, stat, stat_result
 from os.path import join, relpath, splitext
 from mergedeep import merge
 
-import yaml
-from envyaml import EnvYAML
-from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_cache import ConfigCache
+from dagger.config_finder.config_finder import ConfigFinder, PipelineConfig
 from dagger.pipeline.pipeline import Pipeline
 from dagger.pipeline.task_factory import TaskFactory
+from dagger.utilities import yaml_loader
 
 import dagger.conf as conf
 
 
 _logger = logging.getLogger("configFinder")
 DAG_DIR = join(environ.get("AIRFLOW_HOME", "./"), "dags")
+_CACHE_MISS = object()
+# Number of pipelines loaded together by the process pool while streaming pipelines
+PARALLEL_LOADING_BATCH_SIZE = 64
+
+
+def _localize_params(config):
+    env_dependent_params = config.get("environments", {}).get(conf.ENV, {})
+    if env_dependent_params.get("deactivate"):
+        return None
+    merge(config, env_dependent_params)
+    return config
+
+
+def _load_yaml_file(yaml_path) -> Tuple[str, Optional[dict], stat_result]:
+    """Returns the raw content, the localized config and the stat of a yaml file, taken
+    before reading it. Runs in the worker processes of the parallel loading mode, so it
+    must stay a module level function"""
+    file_stat = stat(yaml_path)
+    with open(yaml_path, "r") as stream:
+        content = stream.read()
+    return (
+        content,
+        _localize_params(yaml_loader.load_env_yaml_content(content)),
+        file_stat,
+    )
 
 
 class ConfigProcessor:
-    def __init__(self, config_finder: ConfigFinder):
+    def __init__(
+        self,
+        config_finder: ConfigFinder,
+        config_cache: ConfigCache = None,
+        workers: int = 1,
+    ):
         self._config_finder = config_finder
+        self._config_cache = config_cache
+        self._workers = workers
         self._task_factory = TaskFactory()
+        self._loaded_configs = {}
+        self._executor = None
 
     def _load_yaml(self, yaml_path):
-        config_dict = EnvYAML(yaml_path).export()
-        config_dict = self.localize_params(config_dict)
+        config_dict = self._loaded_configs.pop(yaml_path, _CACHE_MISS)
+        if config_dict is not _CACHE_MISS:
+            return config_dict
+
+        if self._config_cache is None:
+            return self.localize_params(yaml_loader.load_env_yaml(yaml_path))
+
+        config_dict = self._config_cache.get(yaml_path, default=_CACHE_MISS)
+        if config_dict is not _CACHE_MISS:
+            return config_dict
+
+        content, config_dict, file_stat = _load_yaml_file(yaml_path)
+        self._config_cache.put(yaml_path, content, config_dict, file_stat)
         return config_dict
 
     def localize_params(self, config):
-        env_dependent_params = config.get("environments", {}).get(conf.ENV, {})
-        if env_dependent_params.get("deactivate"):
-            return None
-        merge(config, env_dependent_params)
-        return config
-
-    def process_pipeline_configs(self):
-        configs = self._config_finder.find_configs()
-        pipelines = []
+        return _localize_params(config)
 
-        for pipeline_config in configs:
-            pipeline_name = relpath(pipeline_config.directory, DAG_DIR).replace(
-                "/", "-"
+    def _parallel_loading_enabled(self) -> bool:
+        if self._workers <= 1:
+            return False
+        if multiprocessing.current_process().daemon:
+            _logger.warning(
+                "Daemonic processes can't have children, loading config files serially"
             )
-            config_path = join(pipeline_config.directory, pipeline_config.config)
+            return False
+        return True
 
-            _logger.info("Processing config: %s", config_path)
-            config_dict = self._load_yaml(config_path)
-            if config_dict:
-                pipeline = Pipeline(pipeline_config.directory, config_dict)
-            else:
-                _logger.info(f"{pipeline_name} pipeline is disabled in {conf.ENV} environment")
-                continue
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def load_configs(
+        self, pipeline_configs: List[PipelineConfig], keep_executor: bool = False
+    ) -> None:
+        """Parses the yaml files of the pipelines in a process pool, the results are
+        consumed by process_pipeline_config. Errors are raised for the first failing
+        file in the order of pipeline_configs. With keep_executor the process pool is
+        reused by the next call until _shutdown_executor is called."""
+        self._loaded_configs = {}
+        if not self._parallel_loading_enabled():
+            return
 
+        yaml_paths = []
+        for pipeline_config in pipeline_configs:
+            yaml_paths.append(join(pipeline_config.directory, pipeline_config.config))
             for task_config in pipeline_config.job_configs:
-                task_name = splitext(task_config.config)[0]
-                task_config_path = join(pipeline_config.directory, task_config.config)
-
-                _logger.info("Processing task config: %s", task_config_path)
-                task_config = self._load_yaml(task_config_path)
-                if task_config:
-                    task_type = task_config["type"]
-                    pipeline.add_task(
-                        self._task_factory.create_task(
-                            task_type, task_name, pipeline_name, pipeline, task_config
-                        )
+                yaml_paths.append(join(pipeline_config.directory, task_config.config))
+
+        if self._config_cache is not None:
+            for yaml_path in yaml_paths:
+                config_dict = self._config_cache.get(yaml_path, default=_CACHE_MISS)
+                if config_dict is not _CACHE_MISS:
+                    self._loaded_configs[yaml_path] = config_dict
+            yaml_paths = [
+                yaml_path
+                for yaml_path in yaml_paths
+                if yaml_path not in self._loaded_configs
+            ]
+
+        if len(yaml_paths) == 0:
+            return
+
+        _logger.info(
+            "Loading %s config files with %s workers", len(yaml_paths), self._workers
+        )
+        chunksize = max(1, len(yaml_paths) // (self._workers * 4))
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        try:
+            results = self._executor.map(
+                _load_yaml_file, yaml_paths, chunksize=chunksize
+            )
+            for yaml_path in yaml_paths:
+                try:
+                    content, config_dict, file_stat = next(results)
+                except Exception:
+                    _logger.error("Couldn't load config file: %s", yaml_path)
+                    raise
+                self._loaded_configs[yaml_path] = config_dict
+                if self._config_cache is not None:
+                    self._config_cache.put(yaml_path, content, config_dict, file_stat)
+        finally:
+            if not keep_executor:
+                self._shutdown_executor()
+
+    @staticmethod
+    def get_pipeline_name(pipeline_config: PipelineConfig) -> str:
+        return relpath(pipeline_config.directory, DAG_DIR).replace("/", "-")
+
+    def process_pipeline_config(
+        self, pipeline_config: PipelineConfig
+    ) -> Optional[Pipeline]:
+        pipeline_name = self.get_pipeline_name(pipeline_config)
+        config_path = join(pipeline_config.directory, pipeline_config.config)
+
+        _logger.info("Processing config: %s", config_path)
+        config_dict = self._load_yaml(config_path)
+        if config_dict:
+            pipeline = Pipeline(pipeline_config.directory, config_dict)
+        else:
+            _logger.info(
+                f"{pipeline_name} pipeline is disabled in {conf.ENV} environment"
+            )
+            return None
+
+        for task_config in pipeline_config.job_configs:
+            task_name = splitext(task_config.config)[0]
+            task_config_path = join(pipeline_config.directory, task_config.config)
+
+            _logger.info("Processing task config: %s", task_config_path)
+            task_config = self._load_yaml(task_config_path)
+            if task_config:
+                task_type = task_config["type"]
+                pipeline.add_task(
+                    self._task_factory.create_task(
+                        task_type, task_name, pipeline_name, pipeline, task_config
                     )
-                else:
-                    _logger.info(f"{task_name} job is disabled in {conf.ENV} environment")
+                )
+            else:
+                _logger.info(f"{task_name} job is disabled in {conf.ENV} environment")
+
+        return pipeline
+
+    def save_cache(self) -> None:
+        if self._config_cache is not None:
+            self._config_cache.save()
+
+    def iter_pipelines(
+        self, pipeline_configs: Iterable[PipelineConfig] = None
+    ) -> Iterator[Pipeline]:
+        """Yields the pipelines one by one, so only the pipeline being built and its
+        config dicts are held in memory next to the consumer's own state. With several
+        workers the config files are loaded by batches of PARALLEL_LOADING_BATCH_SIZE
+        pipelines. The config cache is saved once the generator is exhausted or closed.
+        """
+        if pipeline_configs is None:
+            pipeline_configs = self._config_finder.iter_configs()
+        pipeline_configs = iter(pipeline_configs)
+        batch_size = (
+            PARALLEL_LOADING_BATCH_SIZE if self._parallel_loading_enabled() else 1
+        )
+
+        try:
+            while True:
+                batch = list(islice(pipeline_configs, batch_size))
+                if not batch:
+                    break
 
-            pipelines.append(pipeline)
+                if batch_size > 1:
+                    self.load_configs(batch, keep_executor=True)
+                for pipeline_config in batch:
+                    pipeline = self.process_pipeline_config(pipeline_config)
+                    if pipeline:
+                        yield pipeline
+        finally:
+            self._loaded_configs = {}
+            self._shutdown_executor()
+            self.save_cache()
 
-        return pipelines
+    def process_pipeline_configs(self) -> List[Pipeline]:
+        return list(self.iter_pipelines())
@@ -0,0 +1,161 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from os.path import join, splitext
+from typing import Iterable, List
+
+from dagger.config_finder.config_finder import ConfigFinder, PipelineConfig
+from dagger.config_finder.config_processor import ConfigProcessor, _localize_params
+from dagger.pipeline.pipeline import Pipeline
+from dagger.pipeline.task_factory import TaskFactory
+from dagger.utilities import yaml_loader
+from dagger.utilities.config_schema import get_schema_validator
+from dagger.utilities.config_validator import ConfigError, collect_errors
+
+_logger = logging.getLogger("configFinder")
+
+
+class _PipelineStandIn:
+    """Lets the tasks of a pipeline with an invalid pipeline.yaml be validated too"""
+
+    def __init__(self, directory: str, name: str):
+        self.directory = directory
+        self.name = name
+
+
+def _describe_exception(e: Exception) -> str:
+    return "{}: {}".format(type(e).__name__, str(e))
+
+
+def _load_config(config_path: str, errors: List[ConfigError]):
+    try:
+        return _localize_params(yaml_loader.load_env_yaml(config_path))
+    except Exception as e:
+        errors.append(
+            ConfigError(
+                config_path,
+                None,
+                "Couldn't load config file: " + _describe_exception(e),
+            )
+        )
+        return None
+
+
+def _check_schemas(pipeline_config: PipelineConfig) -> List[ConfigError]:
+    errors = []
+    config_path = join(pipeline_config.directory, pipeline_config.config)
+    config_dict = _load_config(config_path, errors)
+    if not config_dict:
+        return errors
+    errors.extend(
+        get_schema_validator("pipeline").iter_errors(config_dict, config_path)
+    )
+
+    for task_config in pipeline_config.job_configs:
+        task_config_path = join(pipeline_config.directory, task_config.config)
+        task_dict = _load_config(task_config_path, errors)
+        if task_dict:
+            errors.extend(
+                get_schema_validator("task").iter_errors(task_dict, task_config_path)
+            )
+
+    return errors
+
+
+def validate_pipeline_config(
+    pipeline_config: PipelineConfig, schema_only: bool = False
+) -> List[ConfigError]:
+    """Builds the pipeline, its tasks and their inputs and outputs and returns every
+    error found on the way instead of stopping at the first one. With schema_only the
+    config dicts are only checked against the json schemas generated from the
+    attributes, which is cheaper but misses the errors of the attribute validators, e.g.
+    a wrong date format. Runs in the worker processes of validate_configs, so it must
+    stay a module level function"""
+    if schema_only:
+        return _check_schemas(pipeline_config)
+
+    pipeline_name = ConfigProcessor.get_pipeline_name(pipeline_config)
+    task_factory = TaskFactory()
+
+    with collect_errors() as errors:
+        config_path = join(pipeline_config.directory, pipeline_config.config)
+        config_dict = _load_config(config_path, errors)
+        if not config_dict:
+            return list(errors)
+
+        error_count = len(errors)
+        try:
+            pipeline = Pipeline(pipeline_config.directory, config_dict)
+        except Exception as e:
+            # An exception following a collected error is most likely caused by the
+            # invalid field
+            if len(errors) == error_count:
+                errors.append(ConfigError(config_path, None, _describe_exception(e)))
+            pipeline = _PipelineStandIn(pipeline_config.directory, pipeline_name)
+
+        for task_config in pipeline_config.job_configs:
+            task_name = splitext(task_config.config)[0]
+            task_config_path = join(pipeline_config.directory, task_config.config)
+            task_dict = _load_config(task_config_path, errors)
+            if not task_dict:
+                continue
+
+            task_type = task_dict.get("type")
+            if task_factory.registry.get(task_type) is None:
+                errors.append(
+                    ConfigError(
+                        task_config_path,
+                        "type",
+                        "Unknown task type: {}".format(task_type),
+                    )
+                )
+                continue
+
+            error_count = len(errors)
+            try:
+                task_factory.create_task(
+                    task_type, task_name, pipeline_name, pipeline, task_dict
+                )
+            except Exception as e:
+                if len(errors) == error_count:
+                    errors.append(
+                        ConfigError(task_config_path, None, _describe_exception(e))
+                    )
+
+        return list(errors)
+
+
+def validate_configs(
+    pipeline_configs: Iterable[PipelineConfig],
+    workers: int = 1,
+    schema_only: bool = False,
+) -> List[ConfigError]:
+    """Validates the pipelines, in a process pool when workers is above 1. The errors
+    are returned in the order of pipeline_configs."""
+    pipeline_configs = list(pipeline_configs)
+    validate = partial(validate_pipeline_config, schema_only=schema_only)
+    if workers > 1 and multiprocessing.current_process().daemon:
+        _logger.warning(
+            "Daemonic processes can't have children, validating pipelines serially"
+        )
+        workers = 1
+
+    if workers <= 1 or len(pipeline_configs) <= 1:
+        results = map(validate, pipeline_configs)
+        return [error for pipeline_errors in results for error in pipeline_errors]
+
+    _logger.info(
+        "Validating %s pipelines with %s workers", len(pipeline_configs), workers
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(validate, pipeline_configs)
+        return [error for pipeline_errors in results for error in pipeline_errors]
+
+
+def validate_directory(
+    root: str, workers: int = 1, schema_only: bool = False
+) -> List[ConfigError]:
+    return validate_configs(
+        ConfigFinder(root).iter_configs(), workers=workers, schema_only=schema_only
+    )
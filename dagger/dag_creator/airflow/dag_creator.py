@@ -1,3 +1,4 @@
+import json
 import re
 from datetime import timedelta, datetime
 from functools import partial
@@ -11,15 +12,38 @@ from dagger.alerts.alert import airflow_task_fail_alerts
 from dagger.dag_creator.airflow.operator_factory import OperatorFactory
 from dagger.dag_creator.airflow.utils.macros import user_defined_macros
 from dagger.dag_creator.graph_traverser_base import GraphTraverserBase
-from dagger.graph.task_graph import Graph, Node
+from dagger.graph.task_graph import Graph, Node, creates_external_sensor
+from dagger.utilities.exceptions import InvalidConfigException
+
+# How the cross pipeline dependencies of a pipeline on the tasks of another pipeline are
+# waited for: one sensor per upstream task, one sensor per upstream pipeline waiting for
+# all of the tasks, or one per upstream pipeline waiting for the whole dag run to
+# succeed
+SENSOR_PER_TASK = "task"
+SENSOR_PER_DAG = "dag"
+SENSOR_PER_DAG_RUN = "dag_run"
+SENSOR_CONSOLIDATIONS = (SENSOR_PER_TASK, SENSOR_PER_DAG, SENSOR_PER_DAG_RUN)
 
 
 # noinspection PyStatementEffect
 class DagCreator(GraphTraverserBase):
-    def __init__(self, task_graph: Graph, with_data_nodes: bool = conf.WITH_DATA_NODES):
+    def __init__(
+        self,
+        task_graph: Graph,
+        with_data_nodes: bool = conf.WITH_DATA_NODES,
+        sensor_consolidation: str = conf.EXTERNAL_SENSOR_CONSOLIDATION,
+    ):
         super().__init__(task_graph=task_graph, with_data_nodes=with_data_nodes)
+        if sensor_consolidation not in SENSOR_CONSOLIDATIONS:
+            raise InvalidConfigException(
+                f"Unknown external sensor consolidation: {sensor_consolidation}, "
+                f"expected one of {', '.join(SENSOR_CONSOLIDATIONS)}"
+            )
+        self._sensor_consolidation = sensor_consolidation
         self._operator_factory = OperatorFactory()
         self._sensor_dict = {}
+        self._sensor_names = {}
+        self._consolidated_dependencies = {}
 
     @staticmethod
     def _get_control_flow_task_id(pipe_id):
@@ -55,31 +79,52 @@ class DagCreator(GraphTraverserBase):
 
         return execution_date_fn
 
+    @staticmethod
+    def _get_external_sensor_args(follow_external_dependency: dict) -> dict:
+        """Arguments of an external task sensor: conf.EXTERNAL_SENSOR_DEFERRABLE,
+        overridden by the default sensor arguments of the config and by the
+        follow_external_dependency of the input. Deferrable sensors wait in the
+        triggerer without holding a worker slot, the others are rescheduled between two
+        pokes unless a mode is set."""
+        extra_args = {"deferrable": conf.EXTERNAL_SENSOR_DEFERRABLE}
+        extra_args.update(conf.EXTERNAL_SENSOR_DEFAULT_ARGS)
+        extra_args.update(follow_external_dependency)
+        if not extra_args["deferrable"]:
+            extra_args.setdefault("mode", "reschedule")
+        return extra_args
+
     def _get_external_task_sensor_name_dict(self, from_task_id: str) -> dict:
-        from_pipeline_name = self._task_graph.get_node(from_task_id).obj.pipeline_name
-        from_task_name = self._task_graph.get_node(from_task_id).obj.name
-        return {
-            "from_pipeline_name": from_pipeline_name,
-            "from_task_name": from_task_name,
-            "external_sensor_name": f"{from_pipeline_name}-{from_task_name}-sensor",
-        }
+        sensor_name_dict = self._sensor_names.get(from_task_id)
+        if sensor_name_dict is None:
+            from_task = self._task_index[from_task_id]
+            sensor_name_dict = self._sensor_names[from_task_id] = {
+                "from_pipeline_name": from_task.pipeline_name,
+                "from_task_name": from_task.name,
+                "external_sensor_name": (
+                    f"{from_task.pipeline_name}-{from_task.name}-sensor"
+                ),
+            }
+        return sensor_name_dict
 
-    def _get_external_task_sensor(self, from_task_id: str, to_task_id: str, follow_external_dependency: dict) -> ExternalTaskSensor:
+    def _get_external_task_sensor(
+        self, from_task_id: str, to_task_id: str, follow_external_dependency: dict
+    ) -> ExternalTaskSensor:
         """
         create an object of external task sensor for a specific from_task_id and to_task_id
         """
-        external_task_sensor_name_dict = self._get_external_task_sensor_name_dict(from_task_id)
+        external_task_sensor_name_dict = self._get_external_task_sensor_name_dict(
+            from_task_id
+        )
         external_sensor_name = external_task_sensor_name_dict["external_sensor_name"]
         from_pipeline_name = external_task_sensor_name_dict["from_pipeline_name"]
         from_task_name = external_task_sensor_name_dict["from_task_name"]
 
-        from_pipeline_schedule = self._task_graph.get_node(from_task_id).obj.pipeline.schedule
-        to_pipeline_schedule = self._task_graph.get_node(to_task_id).obj.pipeline.schedule
+        from_pipeline_schedule = self._task_index[from_task_id].schedule
+        to_pipeline_schedule = self._task_index[to_task_id].schedule
 
-        to_pipe_id = self._task_graph.get_node(to_task_id).obj.pipeline.name
+        to_pipe_id = self._task_index[to_task_id].pipeline_name
 
-        extra_args = conf.EXTERNAL_SENSOR_DEFAULT_ARGS.copy()
-        extra_args.update(follow_external_dependency)
+        extra_args = self._get_external_sensor_args(follow_external_dependency)
 
         return ExternalTaskSensor(
             dag=self._dags[to_pipe_id],
@@ -89,12 +134,88 @@ class DagCreator(GraphTraverserBase):
             execution_date_fn=self._get_execution_date_fn(
                 from_pipeline_schedule, to_pipeline_schedule
             ),
-            **extra_args
+            **extra_args,
         )
 
+    def _add_consolidated_dependency(
+        self, from_task_id: str, to_task_id: str, follow_external_dependency: dict
+    ):
+        """Records the dependency, the sensor waiting for all the dependencies of the
+        downstream pipeline on the upstream pipeline is created once every edge is
+        known. Only the dependencies with the same sensor arguments share a sensor, the
+        sensors of the other arguments get a numbered task id."""
+        from_task = self._task_index[from_task_id]
+        to_task = self._task_index[to_task_id]
+        pipelines_key = (to_task.pipeline_name, from_task.pipeline_name)
+        sensor_args_key = json.dumps(
+            follow_external_dependency, sort_keys=True, default=str
+        )
+        dependencies = self._consolidated_dependencies.setdefault(pipelines_key, {})
+        dependency = dependencies.get(sensor_args_key)
+        if dependency is None:
+            sensor_number = len(dependencies) + 1
+            dependency = dependencies[sensor_args_key] = {
+                "task_id": f"{from_task.pipeline_name}-sensor"
+                + (f"-{sensor_number}" if sensor_number > 1 else ""),
+                "from_schedule": from_task.schedule,
+                "to_schedule": to_task.schedule,
+                "from_task_names": [],
+                "to_task_ids": [],
+                "follow_external_dependency": follow_external_dependency,
+            }
+        if from_task.name not in dependency["from_task_names"]:
+            dependency["from_task_names"].append(from_task.name)
+        if to_task_id not in dependency["to_task_ids"]:
+            dependency["to_task_ids"].append(to_task_id)
+
+    def _get_consolidated_sensor(
+        self, to_pipe_id: str, from_pipe_id: str, dependency: dict
+    ) -> ExternalTaskSensor:
+        """
+        create an object of external task sensor waiting for the tasks of from_pipe_id
+        the tasks of to_pipe_id depend on, or for the whole dag run of from_pipe_id
+        """
+        extra_args = self._get_external_sensor_args(
+            dependency["follow_external_dependency"]
+        )
+        if self._sensor_consolidation == SENSOR_PER_DAG:
+            extra_args["external_task_ids"] = sorted(dependency["from_task_names"])
+
+        return ExternalTaskSensor(
+            dag=self._dags[to_pipe_id],
+            task_id=dependency["task_id"],
+            external_dag_id=from_pipe_id,
+            execution_date_fn=self._get_execution_date_fn(
+                dependency["from_schedule"], dependency["to_schedule"]
+            ),
+            **extra_args,
+        )
+
+    def _finish_dag_creation(self):
+        for (
+            to_pipe,
+            from_pipe,
+        ), dependencies in self._consolidated_dependencies.items():
+            for dependency in dependencies.values():
+                external_task_sensor = self._get_consolidated_sensor(
+                    to_pipe, from_pipe, dependency
+                )
+                self._sensor_dict.setdefault(to_pipe, {})[
+                    external_task_sensor.task_id
+                ] = external_task_sensor
+
+                (
+                    self._tasks[self._get_control_flow_task_id(to_pipe)]
+                    >> external_task_sensor
+                )
+                for to_task_id in dependency["to_task_ids"]:
+                    external_task_sensor >> self._tasks[to_task_id]
+
     def _create_control_flow_task(self, pipe_id, dag):
         control_flow_task_id = self._get_control_flow_task_id(pipe_id)
-        self._tasks[control_flow_task_id] = self._operator_factory.create_control_flow_operator(
+        self._tasks[
+            control_flow_task_id
+        ] = self._operator_factory.create_control_flow_operator(
             conf.IS_DUMMY_OPERATOR_SHORT_CIRCUIT, dag
         )
 
@@ -104,7 +225,9 @@ class DagCreator(GraphTraverserBase):
         default_args.update(pipeline.default_args)
         default_args["owner"] = pipeline.owner.split("@")[0]
         if len(pipeline.alerts) > 0:
-            default_args["on_failure_callback"] = partial(airflow_task_fail_alerts, pipeline.alerts)
+            default_args["on_failure_callback"] = partial(
+                airflow_task_fail_alerts, pipeline.alerts
+            )
         dag = DAG(
             pipeline.name,
             description=pipeline.description,
@@ -129,11 +252,15 @@ class DagCreator(GraphTraverserBase):
 
         dataset_id = node.obj.airflow_name
         if dataset_id not in self._data_tasks[pipe_id]:
-            self._data_tasks[pipe_id][dataset_id] = self._operator_factory.create_dataset_operator(
+            self._data_tasks[pipe_id][
+                dataset_id
+            ] = self._operator_factory.create_dataset_operator(
                 re.sub("[^0-9a-zA-Z-_]+", "_", dataset_id), self._dags[pipe_id]
             )
 
-    def _create_edge_without_data(self, from_task_id: str, to_task_ids: list, node: Node) -> None:
+    def _create_edge_without_data(
+        self, from_task_id: str, to_task_ids: list, node: Node
+    ) -> None:
         """
         Creates an edge between tasks without transferring data.
 
@@ -144,49 +271,74 @@ class DagCreator(GraphTraverserBase):
         """
 
         from_pipe = (
-            self._task_graph.get_node(from_task_id).obj.pipeline_name if from_task_id else None
+            self._task_index[from_task_id].pipeline_name if from_task_id else None
         )
         for to_task_id in to_task_ids:
             edge_properties = self._task_graph.get_edge(node.obj.alias(), to_task_id)
-            to_pipe = self._task_graph.get_node(to_task_id).obj.pipeline_name
+            to_pipe = self._task_index[to_task_id].pipeline_name
             if from_pipe and from_pipe == to_pipe:
                 self._tasks[from_task_id] >> self._tasks[to_task_id]
-            elif from_pipe and from_pipe != to_pipe and edge_properties.follow_external_dependency is not None:
-                from_schedule = self._task_graph.get_node(from_task_id).obj.pipeline.schedule
-                to_schedule = self._task_graph.get_node(to_task_id).obj.pipeline.schedule
-                if not from_schedule.startswith("@") and not to_schedule.startswith("@"):
-                    external_task_sensor_name = self._get_external_task_sensor_name_dict(
-                        from_task_id
-                    )["external_sensor_name"]
+            elif from_pipe and edge_properties.follow_external_dependency is not None:
+                if not creates_external_sensor(
+                    edge_properties,
+                    self._task_index[from_task_id].schedule,
+                    self._task_index[to_task_id].schedule,
+                ):
+                    # A pipeline with a schedule preset: no sensor and no edge from the
+                    # control flow task either
+                    continue
+                if self._sensor_consolidation != SENSOR_PER_TASK:
+                    self._add_consolidated_dependency(
+                        from_task_id,
+                        to_task_id,
+                        edge_properties.follow_external_dependency,
+                    )
+                else:
+                    external_task_sensor_name = (
+                        self._get_external_task_sensor_name_dict(from_task_id)[
+                            "external_sensor_name"
+                        ]
+                    )
                     if (
                         external_task_sensor_name
                         not in self._sensor_dict.get(to_pipe, dict()).keys()
                     ):
                         external_task_sensor = self._get_external_task_sensor(
-                            from_task_id, to_task_id, edge_properties.follow_external_dependency
+                            from_task_id,
+                            to_task_id,
+                            edge_properties.follow_external_dependency,
                         )
 
                         if self._sensor_dict.get(to_pipe) is None:
                             self._sensor_dict[to_pipe] = {}
 
-                        self._sensor_dict[to_pipe].update({
-                            external_task_sensor_name: external_task_sensor
-                        })
+                        self._sensor_dict[to_pipe].update(
+                            {external_task_sensor_name: external_task_sensor}
+                        )
 
-                        self._tasks[self._get_control_flow_task_id(to_pipe)] >> external_task_sensor
-                    self._sensor_dict[to_pipe][external_task_sensor_name] >> self._tasks[to_task_id]
+                        (
+                            self._tasks[self._get_control_flow_task_id(to_pipe)]
+                            >> external_task_sensor
+                        )
+                    (
+                        self._sensor_dict[to_pipe][external_task_sensor_name]
+                        >> self._tasks[to_task_id]
+                    )
             else:
-                self._tasks[self._get_control_flow_task_id(to_pipe)] >> self._tasks[to_task_id]
+                (
+                    self._tasks[self._get_control_flow_task_id(to_pipe)]
+                    >> self._tasks[to_task_id]
+                )
 
     def _create_edge_with_data(self, from_task_id, to_task_ids, node):
         from_pipe = (
-            self._task_graph.get_node(from_task_id).obj.pipeline_name if from_task_id else None
+            self._task_index[from_task_id].pipeline_name if from_task_id else None
         )
         data_id = node.obj.airflow_name
-        if from_pipe:
+        if from_pipe and self._is_pipeline_selected(from_pipe):
             self._tasks[from_task_id] >> self._data_tasks[from_pipe][data_id]
         for to_task_id in to_task_ids:
-            to_pipe = self._task_graph.get_node(to_task_id).obj.pipeline_name
+            to_pipe = self._task_index[to_task_id].pipeline_name
             self._data_tasks[to_pipe][data_id] >> self._tasks[to_task_id]
             if not from_pipe or (from_pipe != to_pipe):
                 (
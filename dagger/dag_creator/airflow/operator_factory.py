@@ -1,23 +1,33 @@
+import logging
+
 from airflow.operators.empty import EmptyOperator
 from dagger.dag_creator.airflow.operator_creator import OperatorCreator
-from dagger.dag_creator.airflow.operator_creators import (
-    airflow_op_creator,
-    athena_transform_creator,
-    batch_creator,
-    declarative_pipeline_creator,
-    dbt_creator,
-    dummy_creator,
-    python_creator,
-    redshift_load_creator,
-    redshift_transform_creator,
-    redshift_unload_creator,
-    reverse_etl_creator,
-    spark_creator,
-    sqoop_creator,
-    soda_creator,
-)
+from dagger.dag_creator.airflow.operator_creators import dummy_creator
 from dagger.dag_creator.airflow.utils.operator_factories import make_control_flow
-from dagger.utilities.classes import get_deep_obj_subclasses
+from dagger.utilities.classes import PluginRegistry
+
+_logger = logging.getLogger("plugins")
+
+_CREATORS_PACKAGE = "dagger.dag_creator.airflow.operator_creators"
+# The operator creators import the airflow providers of their operators, so each of them
+# is imported only when a task of its type is turned into an operator. Every module of
+# operator_creators has to be listed here.
+OPERATOR_CREATOR_MODULES = {
+    "airflow_operator": f"{_CREATORS_PACKAGE}.airflow_op_creator",
+    "athena_transform": f"{_CREATORS_PACKAGE}.athena_transform_creator",
+    "batch": f"{_CREATORS_PACKAGE}.batch_creator",
+    "declarative_pipeline": f"{_CREATORS_PACKAGE}.declarative_pipeline_creator",
+    "dbt": f"{_CREATORS_PACKAGE}.dbt_creator",
+    "dummy": f"{_CREATORS_PACKAGE}.dummy_creator",
+    "python": f"{_CREATORS_PACKAGE}.python_creator",
+    "redshift_load": f"{_CREATORS_PACKAGE}.redshift_load_creator",
+    "redshift_transform": f"{_CREATORS_PACKAGE}.redshift_transform_creator",
+    "redshift_unload": f"{_CREATORS_PACKAGE}.redshift_unload_creator",
+    "reverse_etl": f"{_CREATORS_PACKAGE}.reverse_etl_creator",
+    "spark": f"{_CREATORS_PACKAGE}.spark_creator",
+    "sqoop": f"{_CREATORS_PACKAGE}.sqoop_creator",
+    "soda": f"{_CREATORS_PACKAGE}.soda_creator",
+}
 
 
 class DataOperator(EmptyOperator):
@@ -28,14 +38,30 @@ class DataOperator(EmptyOperator):
 
 
 class OperatorFactory:
+    registry = PluginRegistry(
+        OperatorCreator,
+        entry_point_group="dagger.operator_creators",
+        lazy_modules=OPERATOR_CREATOR_MODULES,
+    )
+
     def __init__(self):
-        self.factory = dict()
+        # Only the creators imported so far, the others are imported by create_operator
+        self.factory = self.registry.loaded
 
-        for cls in get_deep_obj_subclasses(OperatorCreator):
-            self.factory[cls.ref_name] = cls
+    @classmethod
+    def register(cls, creator_cls=None, ref_name: str = None):
+        return cls.registry.register(creator_cls, ref_name=ref_name)
 
     def create_operator(self, task, dag):
-        cls = self.factory.get(task.ref_name, dummy_creator.DummyCreator)
+        cls = self.registry.get(task.ref_name)
+        if cls is None:
+            _logger.warning(
+                "No operator creator for task type %s, "
+                "task %s is created as a dummy operator",
+                task.ref_name,
+                task.name,
+            )
+            cls = dummy_creator.DummyCreator
 
         return cls(task, dag).create_operator()
 
@@ -1,10 +1,11 @@
 from datetime import datetime
 
-import boto3
-
 
 class DynamoDb:
     def __init__(self, region, ddb_table):
+        # boto3 is only needed when the macro is rendered, not while the dags are parsed
+        import boto3
+
         dynamo_db = boto3.resource("dynamodb", region_name=region)
         self._ddb_table = dynamo_db.Table(ddb_table)
 
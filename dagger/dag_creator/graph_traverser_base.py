@@ -4,9 +4,21 @@ from dagger import conf
 from dagger.graph.task_graph import Graph, TaskGraph
 
 import logging
+
 _logger = logging.getLogger("graph")
 
 
+class TaskInfo:
+    """The attributes of a task node used while creating the edges"""
+
+    __slots__ = ("pipeline_name", "name", "schedule")
+
+    def __init__(self, task):
+        self.pipeline_name = task.pipeline_name
+        self.name = task.name
+        self.schedule = task.pipeline.schedule
+
+
 class GraphTraverserBase(ABC):
     def __init__(self, task_graph: Graph, with_data_nodes: bool = conf.WITH_DATA_NODES):
         self._task_graph = task_graph
@@ -15,49 +27,50 @@ class GraphTraverserBase(ABC):
         self._dags = {}
         self._tasks = {}
         self._data_tasks = {}
+        self._pipeline_ids = None
+        self._task_index = {}
+
+    def _build_task_index(self):
+        """Reads the attributes of every task the traversal looks up once per run, the
+        edges of a task are created through each of its datasets"""
+        self._task_index = {
+            node_id: TaskInfo(node.obj)
+            for node_id, node in (
+                self._task_graph.get_nodes(TaskGraph.NODE_TYPE_TASK) or {}
+            ).items()
+        }
+
+    def _iter_nodes(self, node_type):
+        """The nodes of a type by id, so the dags are built in the same order whatever
+        the order the graph was built, or rebuilt incrementally, in. Airflow serializes
+        the tasks in the order they were added to the dag."""
+        return sorted((self._task_graph.get_nodes(node_type) or {}).items())
+
+    def _is_pipeline_selected(self, pipe_id) -> bool:
+        return self._pipeline_ids is None or pipe_id in self._pipeline_ids
 
     @abstractmethod
     def _create_dag(self, pipe_id, node):
         raise NotImplementedError
 
     def _create_dags(self):
-        for pipe_id, node in self._task_graph.get_nodes(
-            TaskGraph.NODE_TYPE_PIPELINE
-        ).items():
-            self._dags[pipe_id] = self._create_dag(pipe_id, node)
+        for pipe_id, node in self._iter_nodes(TaskGraph.NODE_TYPE_PIPELINE):
+            if self._is_pipeline_selected(pipe_id):
+                self._dags[pipe_id] = self._create_dag(pipe_id, node)
 
     @abstractmethod
     def _create_job_task(self, node):
         raise NotImplementedError
 
     def _create_job_tasks(self):
-        for node_id, node in self._task_graph.get_nodes(
-            TaskGraph.NODE_TYPE_TASK
-        ).items():
-            self._tasks[node_id] = self._create_job_task(node)
+        for node_id, node in self._iter_nodes(TaskGraph.NODE_TYPE_TASK):
+            if self._is_pipeline_selected(self._task_index[node_id].pipeline_name):
+                self._tasks[node_id] = self._create_job_task(node)
 
     @abstractmethod
     def _create_data_task(self, pipe_id, node):
         raise NotImplementedError
 
-    def _create_data_tasks(self):
-        for node_id, node in self._task_graph.get_nodes(
-            TaskGraph.NODE_TYPE_DATASET
-        ).items():
-            parent_task_ids = list(node.parents)
-            parent_task_id = (
-                None if len(parent_task_ids) == 0 else parent_task_ids[0]
-            )  # TODO: Something better
-            children_ids = list(node.children)
-
-            if parent_task_id:
-                from_pipe = self._task_graph.get_node(parent_task_id).obj.pipeline_name
-                self._create_data_task(from_pipe, node)
-
-            for children_id in children_ids:
-                to_pipe = self._task_graph.get_node(children_id).obj.pipeline_name
-                self._create_data_task(to_pipe, node)
-
     @abstractmethod
     def _create_edge_without_data(self, from_task_id, to_task_ids, node):
         raise NotImplementedError
@@ -65,34 +78,64 @@ class GraphTraverserBase(ABC):
     def _create_edge_with_data(self, from_task_id, to_task_ids, node):
         raise NotImplementedError
 
-    def _create_edges(self):
-        for node_id, node in self._task_graph.get_nodes(
-            TaskGraph.NODE_TYPE_DATASET
-        ).items():
-            parent_task_ids = list(node.parents)
-            parent_task_id = (
-                None if len(parent_task_ids) == 0 else parent_task_ids[0]
-            )  # TODO: Something better
-            children_ids = list(node.children)
+    def _create_data_tasks_and_edges(self):
+        """Creates the data tasks of a dataset, when the data nodes are shown, and the
+        edges going through it in the same pass over the datasets. The edges of a
+        dataset only use its own data tasks.
+
+        A dataset written by several tasks gets an edge from each of them, in the order
+        of their ids, so the structure of the dags doesn't depend on the order the graph
+        was built in."""
+        for node_id, node in self._iter_nodes(TaskGraph.NODE_TYPE_DATASET):
+            parent_task_ids = sorted(node.parents) or [None]
+            children_ids = [
+                children_id
+                for children_id in sorted(node.children)
+                if self._is_pipeline_selected(
+                    self._task_index[children_id].pipeline_name
+                )
+            ]
 
             if self._with_data_nodes:
-                self._create_edge_with_data(parent_task_id, children_ids, node)
+                for parent_task_id in parent_task_ids:
+                    from_pipe = (
+                        self._task_index[parent_task_id].pipeline_name
+                        if parent_task_id
+                        else None
+                    )
+                    if from_pipe and self._is_pipeline_selected(from_pipe):
+                        self._create_data_task(from_pipe, node)
+                for children_id in children_ids:
+                    self._create_data_task(
+                        self._task_index[children_id].pipeline_name, node
+                    )
+
+                # The consumers read the data task, their edges are created with the
+                # first producer only
+                for position, parent_task_id in enumerate(parent_task_ids):
+                    self._create_edge_with_data(
+                        parent_task_id, children_ids if position == 0 else [], node
+                    )
             else:
-                self._create_edge_without_data(parent_task_id, children_ids, node)
+                for parent_task_id in parent_task_ids:
+                    self._create_edge_without_data(parent_task_id, children_ids, node)
 
     def _finish_dag_creation(self):
         pass
 
-    def traverse_graph(self):
+    def traverse_graph(self, pipeline_ids=None):
+        """Creates the dags of all pipelines or only the ones listed in pipeline_ids.
+        Tasks of other pipelines are only used as the upstream of cross pipeline
+        dependencies"""
+        self._pipeline_ids = set(pipeline_ids) if pipeline_ids is not None else None
+        self._build_task_index()
+
         _logger.info("Start traversing pipelines")
         self._create_dags()
         _logger.info("Traversing jobs")
         self._create_job_tasks()
-        if self._with_data_nodes:
-            _logger.info("Traversing datasets")
-            self._create_data_tasks()
-        _logger.info("Creating edges")
-        self._create_edges()
+        _logger.info("Traversing datasets and creating edges")
+        self._create_data_tasks_and_edges()
         _logger.info("Finalising traverse")
         self._finish_dag_creation()
         _logger.info("Finished traversing")
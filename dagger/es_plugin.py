@@ -7,11 +7,8 @@ from dagger.graph.task_graph import TaskGraph
 cf = ConfigFinder(conf.DAGS_DIR)
 cp = ConfigProcessor(cf)
 
-pipelines = cp.process_pipeline_configs()
-
 g = TaskGraph()
-for pipeline in pipelines:
-    g.add_pipeline(pipeline)
+g.add_pipelines(cp.iter_pipelines())
 
 dc = DagCreator(g._graph)
 dags = dc.traverse_graph()
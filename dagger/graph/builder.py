@@ -0,0 +1,18 @@
+from dagger import conf
+from dagger.config_finder.config_cache import get_config_cache
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.graph.task_graph import TaskGraph
+
+
+def build_task_graph(root_dir: str) -> TaskGraph:
+    """Builds the task graph of every pipeline under root_dir, with the config cache and
+    the workers of the dagger config"""
+    cf = ConfigFinder(root_dir)
+    cp = ConfigProcessor(
+        cf, config_cache=get_config_cache(), workers=conf.CONFIG_LOADER_WORKERS
+    )
+
+    g = TaskGraph()
+    g.add_pipelines(cp.iter_pipelines())
+    return g
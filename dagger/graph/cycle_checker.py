@@ -0,0 +1,200 @@
+import logging
+from collections import deque
+from os.path import join
+from typing import Dict, List, Optional
+
+from dagger.graph.task_graph import TaskGraph, creates_external_sensor
+
+_logger = logging.getLogger("graph")
+
+
+class CycleChecker:
+    """Finds the dependency cycles of the task and dataset graph with Tarjan's strongly
+    connected components algorithm and assigns a topological level to every task, both
+    in linear time
+
+    Only edges which end up as airflow dependencies are followed. A dataset consumed in
+    another pipeline than the one producing it is a dependency only if the DagCreator
+    waits for it with an external task sensor, see creates_external_sensor.
+    """
+
+    def __init__(self, task_graph: TaskGraph):
+        self._graph = task_graph._graph
+        self._ids = []
+        self._index = {}
+        for node_type in (TaskGraph.NODE_TYPE_TASK, TaskGraph.NODE_TYPE_DATASET):
+            for node_id in sorted((self._graph.get_nodes(node_type) or {}).keys()):
+                self._index[node_id] = len(self._ids)
+                self._ids.append(node_id)
+        self._children = [self._dependency_children(node_id) for node_id in self._ids]
+
+        self._components = self._strongly_connected_components()
+        self._cycles = None
+        self._task_levels = None
+
+    def _is_task(self, index: int) -> bool:
+        return self._graph.get_type(self._ids[index]) == TaskGraph.NODE_TYPE_TASK
+
+    def _dependency_children(self, node_id: str) -> List[int]:
+        node = self._graph.get_node(node_id)
+        if self._graph.get_type(node_id) == TaskGraph.NODE_TYPE_TASK:
+            return sorted(
+                self._index[child_id]
+                for child_id in node.children
+                if child_id in self._index
+            )
+
+        producers = [self._graph.get_node(parent_id).obj for parent_id in node.parents]
+        children = []
+        for child_id in node.children:
+            consumer = self._graph.get_node(child_id).obj
+            edge = self._graph.get_edge(node_id, child_id)
+            if any(
+                producer.pipeline_name == consumer.pipeline_name
+                or creates_external_sensor(
+                    edge, producer.pipeline.schedule, consumer.pipeline.schedule
+                )
+                for producer in producers
+            ):
+                children.append(self._index[child_id])
+        return sorted(children)
+
+    def _strongly_connected_components(self) -> List[List[int]]:
+        """Iterative Tarjan, the components are returned in reverse topological order"""
+        node_count = len(self._ids)
+        order = [-1] * node_count
+        low_link = [0] * node_count
+        on_stack = [False] * node_count
+        stack = []
+        components = []
+        counter = 0
+
+        for root in range(node_count):
+            if order[root] != -1:
+                continue
+
+            # Frames of the simulated recursion: the node and the position of the next
+            # child to visit
+            call_stack = [(root, 0)]
+            while call_stack:
+                index, child_position = call_stack.pop()
+                if child_position == 0:
+                    order[index] = low_link[index] = counter
+                    counter += 1
+                    stack.append(index)
+                    on_stack[index] = True
+                else:
+                    # Returning from the visit of the previous child
+                    previous_child = self._children[index][child_position - 1]
+                    low_link[index] = min(low_link[index], low_link[previous_child])
+
+                children = self._children[index]
+                while child_position < len(children):
+                    child = children[child_position]
+                    child_position += 1
+                    if order[child] == -1:
+                        call_stack.append((index, child_position))
+                        call_stack.append((child, 0))
+                        break
+                    if on_stack[child]:
+                        low_link[index] = min(low_link[index], order[child])
+                else:
+                    if low_link[index] == order[index]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == index:
+                                break
+                        components.append(sorted(component))
+
+        return components
+
+    def _find_cycle(self, component: List[int]) -> List[int]:
+        """A shortest cycle through the first node of a strongly connected component"""
+        members = set(component)
+        start = component[0]
+        previous = {}
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            for child in self._children[index]:
+                if child == start:
+                    cycle = [index]
+                    while cycle[-1] != start:
+                        cycle.append(previous[cycle[-1]])
+                    return cycle[::-1] + [start]
+                if child in members and child not in previous:
+                    previous[child] = index
+                    queue.append(child)
+        return [start, start]
+
+    @property
+    def cycles(self) -> List[List[str]]:
+        """One cycle per group of nodes depending on each other, starting and ending
+        with the same node id"""
+        if self._cycles is None:
+            self._cycles = []
+            for component in reversed(self._components):
+                if len(component) > 1 or component[0] in self._children[component[0]]:
+                    self._cycles.append(
+                        [self._ids[index] for index in self._find_cycle(component)]
+                    )
+        return self._cycles
+
+    @property
+    def task_levels(self) -> Dict[str, int]:
+        """Tasks without upstream tasks are on level 0, every other task is one level
+        below its deepest upstream task. The tasks of a cycle share the same level."""
+        if self._task_levels is None:
+            component_of = {}
+            for component_index, component in enumerate(self._components):
+                for index in component:
+                    component_of[index] = component_index
+
+            component_levels = [0] * len(self._components)
+            for component_index in range(len(self._components) - 1, -1, -1):
+                component = self._components[component_index]
+                next_level = component_levels[component_index] + any(
+                    self._is_task(index) for index in component
+                )
+                for index in component:
+                    for child in self._children[index]:
+                        child_component = component_of[child]
+                        if child_component != component_index:
+                            component_levels[child_component] = max(
+                                component_levels[child_component], next_level
+                            )
+
+            self._task_levels = {
+                self._ids[index]: component_levels[component_of[index]]
+                for index in range(len(self._ids))
+                if self._is_task(index)
+            }
+        return self._task_levels
+
+    def _get_location(self, node_id: str) -> Optional[str]:
+        task = self._graph.get_node(node_id).obj
+        directory = getattr(task.pipeline, "directory", None)
+        return join(directory, task.name + ".yaml") if directory else None
+
+    def describe_cycle(self, cycle: List[str]) -> str:
+        lines = []
+        for position, node_id in enumerate(cycle):
+            prefix = "    " if position == 0 else "    -> "
+            location = (
+                self._get_location(node_id)
+                if self._graph.get_type(node_id) == TaskGraph.NODE_TYPE_TASK
+                else None
+            )
+            lines.append(
+                f"{prefix}{node_id} ({location})" if location else f"{prefix}{node_id}"
+            )
+        return "\n".join(lines)
+
+    def describe_cycles(self) -> str:
+        return "\n\n".join(
+            f"Dependency cycle {number}:\n{self.describe_cycle(cycle)}"
+            for number, cycle in enumerate(self.cycles, start=1)
+        )
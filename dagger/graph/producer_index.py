@@ -0,0 +1,292 @@
+import json
+import logging
+import os
+import tempfile
+from os.path import relpath
+from typing import List, Optional
+
+from dagger import conf
+from dagger.config_finder.config_finder import ConfigFinder, PipelineConfig
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.graph.task_graph import TaskGraph
+from dagger.pipeline.pipeline import Pipeline
+from dagger.utilities.exceptions import InvalidProducerIndexException
+
+_logger = logging.getLogger("graph")
+
+INDEX_FORMAT_VERSION = 4
+
+
+class UpstreamPipeline:
+    def __init__(self, name: str, schedule: str):
+        self._name = name
+        self._schedule = schedule
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def schedule(self):
+        return self._schedule
+
+
+class UpstreamTask:
+    """Stand-in of a task of a pipeline which is not loaded, with the fields the cross
+    pipeline sensors need"""
+
+    def __init__(self, name: str, pipeline: UpstreamPipeline):
+        self._name = name
+        self._pipeline = pipeline
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def pipeline_name(self):
+        return self._pipeline.name
+
+    @property
+    def pipeline(self):
+        return self._pipeline
+
+    @property
+    def uniq_name(self) -> str:
+        return "{}:{}".format(self.name, self.pipeline_name)
+
+
+class DatasetProducerIndex:
+    """Index of dataset alias -> tasks producing it, together with the schedule of their
+    pipelines
+
+    It is built from the outputs of the Task objects of the pipelines, so the outputs
+    the task classes add next to the ones of the config are indexed too. The index is
+    kept per pipeline with its directory and the hash of the contents of its config
+    files, so only the changed pipelines are scanned again and the index stays valid on
+    other checkouts of the same files. It is written by dagger generate-dag-files only,
+    the generated dag files read it with read and find their own pipeline directory in
+    it.
+    """
+
+    def __init__(self, env: str):
+        self._env = env
+        self._pipelines = {}
+        self._producers = None
+        self._dirty = False
+
+    def _scan_pipeline(
+        self, pipeline_config: PipelineConfig, config_processor: ConfigProcessor
+    ) -> dict:
+        return self._index_pipeline(
+            config_processor.process_pipeline_config(pipeline_config)
+        )
+
+    @staticmethod
+    def _index_pipeline(pipeline: Optional[Pipeline]) -> dict:
+        if pipeline is None:
+            return {"schedule": None, "tasks": []}
+
+        # The outputs of the built tasks, which include the ones added by the task
+        # classes, e.g. the s3 output of athena_transform tasks
+        tasks = []
+        for task in pipeline.tasks:
+            aliases = [
+                task_output.alias()
+                for task_output in task.outputs
+                if task_output.has_dependency
+            ]
+            tasks.append([task.name, aliases])
+
+        return {"schedule": pipeline.schedule, "tasks": tasks}
+
+    def update(
+        self, pipeline_configs: List[PipelineConfig], config_processor: ConfigProcessor
+    ) -> None:
+        """Rescans the pipelines whose config files changed since the last update"""
+        pipeline_names = set()
+        for pipeline_config in pipeline_configs:
+            fingerprint = pipeline_config.content_fingerprint()
+            if fingerprint is None:
+                continue
+            pipeline_name = ConfigProcessor.get_pipeline_name(pipeline_config)
+            pipeline_names.add(pipeline_name)
+
+            indexed_pipeline = self._pipelines.get(pipeline_name)
+            if (
+                indexed_pipeline is not None
+                and indexed_pipeline["fingerprint"] == fingerprint
+            ):
+                continue
+
+            _logger.info("Indexing outputs of pipeline: %s", pipeline_name)
+            try:
+                indexed_pipeline = self._scan_pipeline(
+                    pipeline_config, config_processor
+                )
+            except Exception as e:
+                # A broken pipeline fails in its own dag, it mustn't break the dags
+                # depending on it
+                _logger.error(
+                    "Couldn't index outputs of pipeline %s: %s", pipeline_name, str(e)
+                )
+                indexed_pipeline = {"schedule": None, "tasks": []}
+            indexed_pipeline["directory"] = relpath(
+                pipeline_config.directory, conf.DAGS_DIR
+            )
+            indexed_pipeline["fingerprint"] = fingerprint
+            self._pipelines[pipeline_name] = indexed_pipeline
+            self._producers = None
+            self._dirty = True
+
+        for pipeline_name in set(self._pipelines.keys()) - pipeline_names:
+            del self._pipelines[pipeline_name]
+            self._producers = None
+            self._dirty = True
+
+    def get_producers(self, alias: str) -> List[UpstreamTask]:
+        if self._producers is None:
+            self._producers = {}
+            for pipeline_name, indexed_pipeline in sorted(self._pipelines.items()):
+                if indexed_pipeline["schedule"] is None:
+                    continue
+                pipeline = UpstreamPipeline(pipeline_name, indexed_pipeline["schedule"])
+                for task_name, aliases in indexed_pipeline["tasks"]:
+                    upstream_task = UpstreamTask(task_name, pipeline)
+                    for output_alias in aliases:
+                        self._producers.setdefault(output_alias, []).append(
+                            upstream_task
+                        )
+
+        return self._producers.get(alias, [])
+
+    def add_upstream_tasks(self, task_graph: TaskGraph) -> None:
+        """Adds the producers of the datasets in the task graph which are not part of
+        the graph yet"""
+        graph = task_graph._graph
+        for alias in list((graph.get_nodes(TaskGraph.NODE_TYPE_DATASET) or {}).keys()):
+            for upstream_task in self.get_producers(alias):
+                if graph.get_node(upstream_task.uniq_name) is None:
+                    graph.add_node(
+                        node_type=TaskGraph.NODE_TYPE_TASK,
+                        node_id=upstream_task.uniq_name,
+                        name_to_show=upstream_task.name,
+                        obj=upstream_task,
+                    )
+                if upstream_task.uniq_name not in graph.get_node(alias).parents:
+                    graph.add_edge(upstream_task.uniq_name, alias)
+
+    def get_pipeline_config(
+        self, pipeline_name: str, config_finder: ConfigFinder
+    ) -> PipelineConfig:
+        """The config of an indexed pipeline, read from its own directory only. If the
+        config files changed since the pipeline was indexed, the entry has to be
+        refreshed with refresh_pipeline once the pipeline is built"""
+        indexed_pipeline = self._pipelines.get(pipeline_name)
+        if indexed_pipeline is None:
+            raise InvalidProducerIndexException(
+                f"Pipeline {pipeline_name} is not in the dataset producer index, "
+                "run dagger generate-dag-files"
+            )
+
+        pipeline_config = config_finder.find_pipeline_config(
+            indexed_pipeline["directory"]
+        )
+        if pipeline_config is None:
+            raise InvalidProducerIndexException(
+                f"Pipeline {pipeline_name} isn't in "
+                f"{indexed_pipeline['directory']} anymore, "
+                "run dagger generate-dag-files"
+            )
+        if pipeline_config.content_fingerprint() != indexed_pipeline["fingerprint"]:
+            _logger.warning(
+                "Config files of pipeline %s changed since the dataset producer index "
+                "was built, "
+                "run dagger generate-dag-files",
+                pipeline_name,
+            )
+        return pipeline_config
+
+    def refresh_pipeline(
+        self, pipeline_name: str, pipeline: Optional[Pipeline]
+    ) -> None:
+        """Replaces the entry of a pipeline with the outputs of the built pipeline, so
+        its own stale entry doesn't add upstream tasks it doesn't have anymore. The
+        refreshed entry is only kept in memory, the fingerprint is cleared for the next
+        update to scan the pipeline again"""
+        indexed_pipeline = self._index_pipeline(pipeline)
+        indexed_pipeline["directory"] = self._pipelines[pipeline_name]["directory"]
+        indexed_pipeline["fingerprint"] = None
+        self._pipelines[pipeline_name] = indexed_pipeline
+        self._producers = None
+
+    @classmethod
+    def read(cls, index_path: str, env: str) -> "DatasetProducerIndex":
+        """Loads the index written by dagger generate-dag-files, raises an
+        InvalidProducerIndexException instead of starting from an empty index"""
+        try:
+            with open(index_path, "r") as stream:
+                persisted_index = json.load(stream)
+        except (OSError, ValueError) as e:
+            raise InvalidProducerIndexException(
+                f"Couldn't read dataset producer index {index_path}, "
+                f"run dagger generate-dag-files: {e}"
+            )
+        if (
+            persisted_index.get("format_version") != INDEX_FORMAT_VERSION
+            or persisted_index.get("env") != env
+        ):
+            raise InvalidProducerIndexException(
+                f"Dataset producer index {index_path} was built by another dagger "
+                "version or for another env, "
+                "run dagger generate-dag-files"
+            )
+
+        index = cls(env)
+        index._pipelines = persisted_index["pipelines"]
+        return index
+
+    @classmethod
+    def load(cls, index_path: str, env: str) -> "DatasetProducerIndex":
+        index = cls(env)
+        try:
+            with open(index_path, "r") as stream:
+                persisted_index = json.load(stream)
+            if (
+                persisted_index.get("format_version") == INDEX_FORMAT_VERSION
+                and persisted_index.get("env") == env
+            ):
+                index._pipelines = persisted_index["pipelines"]
+        except FileNotFoundError:
+            _logger.info("Dataset producer index doesn't exist yet: %s", index_path)
+        except Exception as e:
+            _logger.warning(
+                "Couldn't read dataset producer index %s: %s", index_path, str(e)
+            )
+
+        return index
+
+    def save(self, index_path: str) -> None:
+        if not self._dirty:
+            return
+
+        index_dir = os.path.dirname(os.path.abspath(index_path))
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=index_dir, prefix=".producer_index")
+            with os.fdopen(fd, "w") as stream:
+                json.dump(
+                    {
+                        "format_version": INDEX_FORMAT_VERSION,
+                        "env": self._env,
+                        "pipelines": self._pipelines,
+                    },
+                    stream,
+                )
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except OSError as e:
+            _logger.warning(
+                "Couldn't write dataset producer index %s: %s", index_path, str(e)
+            )
@@ -0,0 +1,101 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+
+import dagger
+from dagger import conf
+from dagger.graph.task_graph import TaskGraph
+from dagger.utilities.exceptions import InvalidSnapshotException
+
+_logger = logging.getLogger("graph")
+
+SNAPSHOT_FORMAT_VERSION = 3
+
+
+@lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """Hash of the source files of the dagger package. The snapshot pickles instances of
+    the dagger classes, their layout changes with the code even when the dagger version
+    stays the same."""
+    package_dir = os.path.dirname(os.path.abspath(dagger.__file__))
+    source_hash = hashlib.sha1()
+    for directory, dirs, files in os.walk(package_dir):
+        dirs.sort()
+        for file_name in sorted(files):
+            if file_name.endswith(".py"):
+                file_path = os.path.join(directory, file_name)
+                source_hash.update(
+                    os.path.relpath(file_path, package_dir).encode() + b"\0"
+                )
+                with open(file_path, "rb") as stream:
+                    source_hash.update(stream.read())
+    return source_hash.hexdigest()
+
+
+def write_snapshot(task_graph: TaskGraph, snapshot_path: str) -> None:
+    """Serializes the task graph with its pipelines, tasks, datasets and edges into a
+    versioned binary file"""
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "dagger_version": dagger.__version__,
+        "code_fingerprint": code_fingerprint(),
+        "env": conf.ENV,
+        "task_graph": task_graph,
+    }
+
+    snapshot_dir = os.path.dirname(os.path.abspath(snapshot_path))
+    os.makedirs(snapshot_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=snapshot_dir, prefix=".dagger_snapshot")
+    with os.fdopen(fd, "wb") as stream:
+        pickle.dump(snapshot, stream, protocol=pickle.HIGHEST_PROTOCOL)
+    # mkstemp creates the file readable only by the owner, the snapshot is usually read
+    # by another user
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, snapshot_path)
+    _logger.info("Snapshot written to: %s", snapshot_path)
+
+
+def read_snapshot(snapshot_path: str) -> TaskGraph:
+    with open(snapshot_path, "rb") as stream:
+        try:
+            snapshot = pickle.load(stream)
+        except Exception as e:
+            # Snapshots of other dagger versions may not match the current classes
+            raise InvalidSnapshotException(
+                f"Snapshot {snapshot_path} couldn't be read: {e}, "
+                "recompile it with dagger compile"
+            )
+
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("format_version") != SNAPSHOT_FORMAT_VERSION
+    ):
+        raise InvalidSnapshotException(
+            f"Snapshot {snapshot_path} was not created with format version "
+            f"{SNAPSHOT_FORMAT_VERSION}, "
+            f"recompile it with dagger compile"
+        )
+
+    if snapshot["dagger_version"] != dagger.__version__:
+        raise InvalidSnapshotException(
+            f"Snapshot {snapshot_path} was created with dagger "
+            f"{snapshot['dagger_version']}, "
+            f"recompile it with dagger {dagger.__version__}"
+        )
+
+    if snapshot["code_fingerprint"] != code_fingerprint():
+        raise InvalidSnapshotException(
+            f"Snapshot {snapshot_path} was created with other dagger sources, "
+            "recompile it with dagger compile"
+        )
+
+    if snapshot["env"] != conf.ENV:
+        raise InvalidSnapshotException(
+            f"Snapshot {snapshot_path} was created for environment {snapshot['env']} "
+            f"instead of {conf.ENV}"
+        )
+
+    return snapshot["task_graph"]
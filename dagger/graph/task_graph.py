@@ -1,6 +1,10 @@
+import json
 import logging
 import sys
 from abc import ABC
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Set
 
 import dagger.pipeline.pipeline
 from dagger.pipeline.io import IO
@@ -10,13 +14,30 @@ from dagger.conf import config
 
 _logger = logging.getLogger("graph")
 
+GRAPH_OUTPUT_FORMATS = ("text", "jsonl", "dot", "adjacency")
+GRAPH_OUTPUT_BUFFER_SIZE = 1 << 20
+
 
 class Node(ABC):
+    __slots__ = (
+        "_node_id",
+        "_name",
+        "_parents",
+        "_children",
+        "_obj",
+        "_adjacency",
+        "_index",
+    )
+
     def __init__(self, node_id: str, name_to_show: str, obj=None):
         self._node_id = node_id
         self._name = name_to_show if name_to_show else node_id
-        self._parents = set()
-        self._children = set()
+        # Dicts as insertion ordered sets, the neighbours are iterated in the order the
+        # edges were added
+        self._parents = {}
+        self._children = {}
+        self._adjacency = None
+        self._index = None
 
         self._obj = obj
 
@@ -27,8 +48,8 @@ class Node(ABC):
             \tchildren: {children}
         """.format(
             node_id=self._name,
-            parents=", ".join(list(self._parents)),
-            children=", ".join(list(self._children)),
+            parents=", ".join(list(self.parents)),
+            children=", ".join(list(self.children)),
         )
 
     @property
@@ -37,24 +58,58 @@ class Node(ABC):
 
     @property
     def parents(self):
+        if self._adjacency is not None:
+            return self._adjacency.parents(self._index)
         return self._parents
 
     @property
     def children(self):
+        if self._adjacency is not None:
+            return self._adjacency.children(self._index)
         return self._children
 
     @property
     def obj(self):
         return self._obj
 
+    def has_child(self, child_id, child_index=None):
+        if self._adjacency is not None and child_index is not None:
+            return self._adjacency.has_child(self._index, child_index)
+        return child_id in self.children
+
+    def _compact(self, adjacency, index):
+        self._adjacency = adjacency
+        self._index = index
+        self._parents = None
+        self._children = None
+
+    def _thaw(self):
+        if self._adjacency is not None:
+            self._parents = dict.fromkeys(self._adjacency.parents(self._index))
+            self._children = dict.fromkeys(self._adjacency.children(self._index))
+            self._adjacency = None
+            self._index = None
+
     def add_parent(self, parent_id):
-        self._parents.add(parent_id)
+        self._thaw()
+        self._parents[parent_id] = None
 
     def add_child(self, child_id):
-        self._children.add(child_id)
+        self._thaw()
+        self._children[child_id] = None
+
+    def remove_parent(self, parent_id):
+        self._thaw()
+        self._parents.pop(parent_id, None)
+
+    def remove_child(self, child_id):
+        self._thaw()
+        self._children.pop(child_id, None)
 
 
 class Edge:
+    __slots__ = ("_follow_external_dependency",)
+
     def __init__(self, follow_external_dependency=None):
         self._follow_external_dependency = follow_external_dependency
 
@@ -63,6 +118,78 @@ class Edge:
         return self._follow_external_dependency
 
 
+def creates_external_sensor(edge: Edge, from_schedule: str, to_schedule: str) -> bool:
+    """Whether the dependency of a task on a task of another pipeline through edge is
+    waited for with an external task sensor. The run to wait for can't be computed for
+    schedule presets like @daily or @once, no sensor is created when either pipeline is
+    scheduled with one."""
+    return (
+        edge.follow_external_dependency is not None
+        and not from_schedule.startswith("@")
+        and not to_schedule.startswith("@")
+    )
+
+
+# Edges without attributes share this instance and are not stored in Graph._edges
+_PLAIN_EDGE = Edge()
+
+
+class _CompactAdjacency:
+    """Parents and children of a fixed set of nodes as integer arrays in compressed
+    sparse row layout: the neighbours of node i are targets[offsets[i]:offsets[i + 1]],
+    sorted by node index"""
+
+    __slots__ = (
+        "_ids",
+        "_parent_offsets",
+        "_parent_targets",
+        "_child_offsets",
+        "_child_targets",
+    )
+
+    def __init__(self, nodes: List[Node]):
+        index = {node._node_id: i for i, node in enumerate(nodes)}
+        self._ids = [node._node_id for node in nodes]
+        self._parent_offsets, self._parent_targets = self._build(
+            index, [node.parents for node in nodes]
+        )
+        self._child_offsets, self._child_targets = self._build(
+            index, [node.children for node in nodes]
+        )
+
+    @staticmethod
+    def _build(index, neighbours_per_node):
+        offsets = array("i", [0])
+        targets = array("i")
+        for neighbours in neighbours_per_node:
+            targets.extend(sorted(index[neighbour_id] for neighbour_id in neighbours))
+            offsets.append(len(targets))
+        return offsets, targets
+
+    def parents(self, i):
+        ids = self._ids
+        return tuple(
+            ids[j]
+            for j in self._parent_targets[
+                self._parent_offsets[i] : self._parent_offsets[i + 1]
+            ]
+        )
+
+    def children(self, i):
+        ids = self._ids
+        return tuple(
+            ids[j]
+            for j in self._child_targets[
+                self._child_offsets[i] : self._child_offsets[i + 1]
+            ]
+        )
+
+    def has_child(self, i, j):
+        lo, hi = self._child_offsets[i], self._child_offsets[i + 1]
+        position = bisect_left(self._child_targets, j, lo, hi)
+        return position < hi and self._child_targets[position] == j
+
+
 class Graph(object):
     def __init__(self):
         self._nodes = {}
@@ -73,21 +200,24 @@ class Graph(object):
         return self._node2type.get(node_id, None) is not None
 
     def add_node(
-        self,
-        node_type: str,
-        node_id: str,
-        name_to_show: str = None,
-        obj: object = None
+        self, node_type: str, node_id: str, name_to_show: str = None, obj: object = None
     ):
+        # The same ids are repeated in the parents and children of the neighbours, keep
+        # a single copy of them
+        node_id = sys.intern(node_id)
         if self._nodes.get(node_type, None) is None:
             self._nodes[node_type] = {}
 
-        if self._nodes[node_type].get(node_id, None) is None and self._node2type.get(node_id, None):
+        if self._nodes[node_type].get(node_id, None) is None and self._node2type.get(
+            node_id, None
+        ):
             _logger.exception(
                 "A different type of node with the same id: %s already exists",
                 node_id,
             )
-            raise IdAlreadyExistsException(f"A different type of node with the same id: {node_id} already exists")
+            raise IdAlreadyExistsException(
+                f"A different type of node with the same id: {node_id} already exists"
+            )
 
         if self._nodes[node_type].get(node_id):
             _logger.debug("Node with name: %s already exists", node_id)
@@ -125,9 +255,38 @@ class Graph(object):
                 to_node_id,
             )
 
+        from_node_id = from_node._node_id
+        to_node_id = to_node._node_id
         from_node.add_child(to_node_id)
         to_node.add_parent(from_node_id)
-        self._edges[(from_node_id, to_node_id)] = Edge(**attributes)
+        if any(value is not None for value in attributes.values()):
+            self._edges[(from_node_id, to_node_id)] = Edge(**attributes)
+        else:
+            self._edges.pop((from_node_id, to_node_id), None)
+
+    def remove_edge(self, from_node_id, to_node_id):
+        from_node = self.get_node(from_node_id)
+        to_node = self.get_node(to_node_id)
+
+        if from_node is not None:
+            from_node.remove_child(to_node_id)
+        if to_node is not None:
+            to_node.remove_parent(from_node_id)
+        self._edges.pop((from_node_id, to_node_id), None)
+
+    def remove_node(self, node_id):
+        node = self.get_node(node_id)
+        if node is None:
+            _logger.debug("Node with name: %s doesn't exist", node_id)
+            return
+
+        for parent_id in list(node.parents):
+            self.remove_edge(parent_id, node_id)
+        for child_id in list(node.children):
+            self.remove_edge(node_id, child_id)
+
+        del self._nodes[self._node2type[node_id]][node_id]
+        del self._node2type[node_id]
 
     def get_type(self, node_id):
         if not self._node_exists(node_id):
@@ -136,7 +295,32 @@ class Graph(object):
         return self._node2type[node_id]
 
     def get_edge(self, from_node_id, to_node_id):
-        return self._edges.get((from_node_id, to_node_id))
+        edge = self._edges.get((from_node_id, to_node_id))
+        if edge is not None:
+            return edge
+
+        from_node = self.get_node(from_node_id)
+        to_node = self.get_node(to_node_id)
+        if (
+            from_node is None
+            or to_node is None
+            or not from_node.has_child(to_node_id, to_node._index)
+        ):
+            return None
+        return _PLAIN_EDGE
+
+    def compact(self):
+        """Moves the parents and children of all nodes into integer indexed arrays,
+        which take a fraction of the memory of the per node sets. The graph stays fully
+        usable, nodes which are modified afterwards switch back to sets on their own."""
+        nodes = [
+            node
+            for nodes_of_type in self._nodes.values()
+            for node in nodes_of_type.values()
+        ]
+        adjacency = _CompactAdjacency(nodes)
+        for index, node in enumerate(nodes):
+            node._compact(adjacency, index)
 
 
 class TaskGraph:
@@ -146,16 +330,85 @@ class TaskGraph:
 
     def __init__(self):
         self._graph = Graph()
+        self._fingerprints = {}
 
-    def add_pipeline(self, pipeline: dagger.pipeline.pipeline.Pipeline):
+    def add_pipeline(
+        self, pipeline: dagger.pipeline.pipeline.Pipeline, fingerprint=None
+    ):
         self._graph.add_node(
             node_type=self.NODE_TYPE_PIPELINE, node_id=pipeline.name, obj=pipeline
         )
+        self._fingerprints[pipeline.name] = fingerprint
 
         for task in pipeline.tasks:
             self.add_task(task)
             self._graph.add_edge(pipeline.name, task.uniq_name)
 
+    def compact(self):
+        self._graph.compact()
+
+    def add_pipelines(self, pipelines: Iterable[dagger.pipeline.pipeline.Pipeline]):
+        """Adds the pipelines as they are produced, e.g. by
+        ConfigProcessor.iter_pipelines"""
+        for pipeline in pipelines:
+            self.add_pipeline(pipeline)
+
+    def get_fingerprint(self, pipeline_name: str):
+        return self._fingerprints.get(pipeline_name)
+
+    def get_pipeline_names(self) -> List[str]:
+        return list((self._graph.get_nodes(self.NODE_TYPE_PIPELINE) or {}).keys())
+
+    def get_dependent_pipelines(self, pipeline_name: str) -> Set[str]:
+        """Names of the other pipelines consuming datasets produced by the pipeline"""
+        pipeline_node = self._graph.get_node(pipeline_name)
+        if pipeline_node is None:
+            return set()
+
+        dependent_pipelines = set()
+        for task_id in pipeline_node.children:
+            for dataset_id in self._graph.get_node(task_id).children:
+                for consumer_id in self._graph.get_node(dataset_id).children:
+                    dependent_pipelines.add(
+                        self._graph.get_node(consumer_id).obj.pipeline_name
+                    )
+
+        dependent_pipelines.discard(pipeline_name)
+        return dependent_pipelines
+
+    def remove_pipeline(self, pipeline_name: str):
+        """Removes the pipeline with all of its tasks and the datasets which are not
+        used by other tasks anymore"""
+        self._fingerprints.pop(pipeline_name, None)
+        pipeline_node = self._graph.get_node(pipeline_name)
+        if pipeline_node is None:
+            return
+
+        for task_id in list(pipeline_node.children):
+            self.remove_task(task_id)
+        self._graph.remove_node(pipeline_name)
+
+    def remove_task(self, task_id: str):
+        task_node = self._graph.get_node(task_id)
+        if task_node is None:
+            return
+
+        dataset_ids = [
+            node_id
+            for node_id in list(task_node.parents) + list(task_node.children)
+            if self._graph.get_type(node_id) == self.NODE_TYPE_DATASET
+        ]
+        self._graph.remove_node(task_id)
+
+        for dataset_id in dataset_ids:
+            dataset_node = self._graph.get_node(dataset_id)
+            if (
+                dataset_node is not None
+                and not dataset_node.parents
+                and not dataset_node.children
+            ):
+                self._graph.remove_node(dataset_id)
+
     def add_task(self, task: Task):
         self._graph.add_node(
             node_type=self.NODE_TYPE_TASK,
@@ -170,7 +423,7 @@ class TaskGraph:
                 self._graph.add_edge(
                     task_input.alias(),
                     task.uniq_name,
-                    follow_external_dependency=task_input.follow_external_dependency
+                    follow_external_dependency=task_input.follow_external_dependency,
                 )
 
         for task_output in task.outputs:
@@ -179,28 +432,145 @@ class TaskGraph:
                 self._graph.add_edge(task.uniq_name, task_output.alias())
 
     def add_dataset(self, io: IO):
-        self._graph.add_node(node_type=self.NODE_TYPE_DATASET, node_id=io.alias(), obj=io)
-
-    def print_graph(self, out_file=None):
-        fs = open(out_file, "w") if out_file else sys.stdout
-        for pipe_id, node in self._graph.get_nodes(self.NODE_TYPE_PIPELINE).items():
-            fs.write(f"Pipeline: {pipe_id}\n")
-            for node_id in list(node.children):
-                child_node = self._graph.get_node(node_id)
-                fs.write(f"\t task: {child_node.name}\n")
-                fs.write(f"\t inputs:\n")
-                for parent_id in list(child_node.parents):
-                    if self._graph.get_type(parent_id) == self.NODE_TYPE_DATASET:
-                        parent_node = self._graph.get_node(parent_id)
-                        fs.write(f"\t\t {parent_node.name}\n")
-                fs.write(f"\t outputs:\n")
-                for output_id in list(child_node.children):
-                    output_node = self._graph.get_node(output_id)
-                    fs.write(f"\t\t {output_node.name}\n")
-                    for output_task_id in list(output_node.children):
-                        task_node = self._graph.get_node(output_task_id)
-                        fs.write(f"\t\t\t dependency: {task_node.name}\n")
-
-                fs.write("\n")
-
-            fs.write("\n")
+        self._graph.add_node(
+            node_type=self.NODE_TYPE_DATASET, node_id=io.alias(), obj=io
+        )
+
+    def _iter_text_lines(self):
+        nodes = self._nodes_by_id()
+        node2type = self._graph._node2type
+        for pipe_id, node in (
+            self._graph.get_nodes(self.NODE_TYPE_PIPELINE) or {}
+        ).items():
+            yield f"Pipeline: {pipe_id}\n"
+            for node_id in node.children:
+                child_node = nodes[node_id]
+                yield f"\t task: {child_node.name}\n"
+                yield "\t inputs:\n"
+                for parent_id in child_node.parents:
+                    if node2type[parent_id] == self.NODE_TYPE_DATASET:
+                        yield f"\t\t {nodes[parent_id].name}\n"
+                yield "\t outputs:\n"
+                for output_id in child_node.children:
+                    output_node = nodes[output_id]
+                    yield f"\t\t {output_node.name}\n"
+                    for output_task_id in output_node.children:
+                        yield f"\t\t\t dependency: {nodes[output_task_id].name}\n"
+
+                yield "\n"
+
+            yield "\n"
+
+    def _iter_dependency_nodes(self):
+        """Tasks and datasets, pipelines only group the tasks"""
+        for node_type in (self.NODE_TYPE_TASK, self.NODE_TYPE_DATASET):
+            for node_id, node in (self._graph.get_nodes(node_type) or {}).items():
+                yield node_type, node_id, node
+
+    def _iter_jsonl_lines(self):
+        for pipe_id, node in (
+            self._graph.get_nodes(self.NODE_TYPE_PIPELINE) or {}
+        ).items():
+            yield json.dumps(
+                {
+                    "kind": "node",
+                    "type": self.NODE_TYPE_PIPELINE,
+                    "id": pipe_id,
+                    "name": node.name,
+                }
+            ) + "\n"
+
+        for node_type, node_id, node in self._iter_dependency_nodes():
+            record = {
+                "kind": "node",
+                "type": node_type,
+                "id": node_id,
+                "name": node.name,
+            }
+            if node_type == self.NODE_TYPE_TASK:
+                record["pipeline"] = node.obj.pipeline_name
+            yield json.dumps(record) + "\n"
+
+        # Only the edges with attributes are stored, the rest don't need a lookup
+        edges = self._graph._edges
+        for _, node_id, node in self._iter_dependency_nodes():
+            for child_id in node.children:
+                record = {"kind": "edge", "from": node_id, "to": child_id}
+                edge = edges.get((node_id, child_id))
+                if edge is not None and edge.follow_external_dependency is not None:
+                    record[
+                        "follow_external_dependency"
+                    ] = edge.follow_external_dependency
+                yield json.dumps(record, default=str) + "\n"
+
+    def _iter_dot_lines(self):
+        def quote(value):
+            return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+        yield "digraph dagger {\n"
+        yield "    rankdir=LR;\n"
+        for pipe_id, node in (
+            self._graph.get_nodes(self.NODE_TYPE_PIPELINE) or {}
+        ).items():
+            yield f"    subgraph {quote('cluster_' + pipe_id)} {{\n"
+            yield f"        label={quote(pipe_id)};\n"
+            for task_id in node.children:
+                label = quote(self._graph.get_node(task_id).name)
+                yield f"        {quote(task_id)} [label={label}, shape=box];\n"
+            yield "    }\n"
+
+        for node_id in (self._graph.get_nodes(self.NODE_TYPE_DATASET) or {}).keys():
+            yield f"    {quote(node_id)} [shape=ellipse];\n"
+
+        for _, node_id, node in self._iter_dependency_nodes():
+            for child_id in node.children:
+                yield f"    {quote(node_id)} -> {quote(child_id)};\n"
+        yield "}\n"
+
+    def _iter_adjacency_lines(self):
+        """<node id>\t<child id>\t<child id>... for every task and dataset"""
+        for _, node_id, node in self._iter_dependency_nodes():
+            yield "\t".join([node_id, *node.children]) + "\n"
+
+    def _nodes_by_id(self):
+        return {
+            node_id: node
+            for nodes_of_type in self._graph._nodes.values()
+            for node_id, node in nodes_of_type.items()
+        }
+
+    def print_graph(self, out_file=None, output_format: str = "text"):
+        """Writes the graph to out_file or to the standard output in one of
+        GRAPH_OUTPUT_FORMATS:
+        text: the tasks of every pipeline with their inputs and outputs
+        jsonl: one json object per node and per edge
+        dot: graphviz digraph with a cluster per pipeline
+        adjacency: one line per task and dataset with the ids of the nodes depending on
+            it
+        """
+        if output_format not in GRAPH_OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown graph format: {output_format}, "
+                f"use one of {', '.join(GRAPH_OUTPUT_FORMATS)}"
+            )
+        lines = getattr(self, f"_iter_{output_format}_lines")()
+
+        if out_file:
+            with open(out_file, "w", buffering=GRAPH_OUTPUT_BUFFER_SIZE) as fs:
+                self._write_lines(lines, fs)
+        else:
+            self._write_lines(lines, sys.stdout)
+
+    @staticmethod
+    def _write_lines(lines, fs):
+        # Joining the lines into large chunks saves a write call per line
+        chunk = []
+        chunk_size = 0
+        for line in lines:
+            chunk.append(line)
+            chunk_size += len(line)
+            if chunk_size >= GRAPH_OUTPUT_BUFFER_SIZE:
+                fs.write("".join(chunk))
+                chunk = []
+                chunk_size = 0
+        fs.write("".join(chunk))
@@ -3,41 +3,43 @@
 """Console script for dao."""
 
 import click
-from dagger.cli.init_alert import init_alert, list_alerts
-from dagger.cli.init_io import init_io, list_ios
-from dagger.cli.init_pipeline import init_pipeline
-from dagger.cli.init_task import init_task, list_tasks
-from dagger.cli.module import generate_tasks, module_config
-from dagger.cli.print_graph import print_graph
+from dagger.cli.lazy_group import LazyGroup
 from dagger.utils import setup_logging
 
-
-@click.group()
+# The module of a command is imported only when the command is used, see LazyGroup
+SUBCOMMANDS = {
+    "init-pipeline": "dagger.cli.init_pipeline.init_pipeline",
+    "init-task": "dagger.cli.init_task.init_task",
+    "list-tasks": "dagger.cli.init_task.list_tasks",
+    "init-io": "dagger.cli.init_io.init_io",
+    "list-ios": "dagger.cli.init_io.list_ios",
+    "generate-tasks": "dagger.cli.module.generate_tasks",
+    "module-config": "dagger.cli.module.module_config",
+    "init-alert": "dagger.cli.init_alert.init_alert",
+    "list-alerts": "dagger.cli.init_alert.list_alerts",
+    "print-graph": "dagger.cli.print_graph.print_graph",
+    "compile": "dagger.cli.compile.compile_graph",
+    "generate-dag-files": "dagger.cli.generate_dag_files.generate_dag_files",
+    "lineage": "dagger.cli.lineage.lineage",
+    "check-cycles": "dagger.cli.check_cycles.check_cycles",
+    "validate": "dagger.cli.validate.validate",
+    "schema": "dagger.cli.schema.schema",
+}
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
 @click.option(
     "-v", "--verbose", is_flag=True, default=False, help="Turn on debug logging"
 )
 @click.pass_context
 def cli(context, verbose):
     """dagger's CLI. With it, you can perform pretty much all operations you desire
-        Shown below are all the possible commands you can use.
+    Shown below are all the possible commands you can use.
 
-        Run ::
+    Run ::
 
-            $ dagger --help
+        $ dagger --help
 
-        To get an overview of the possibilities.
+    To get an overview of the possibilities.
     """
     setup_logging(verbose)
-
-
-cli.add_command(init_pipeline)
-cli.add_command(init_task)
-cli.add_command(list_tasks)
-cli.add_command(init_io)
-cli.add_command(list_ios)
-cli.add_command(init_io)
-cli.add_command(generate_tasks)
-cli.add_command(module_config)
-cli.add_command(init_alert)
-cli.add_command(list_alerts)
-cli.add_command(print_graph)
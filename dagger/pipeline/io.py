@@ -20,7 +20,9 @@ class IO(ConfigValidator, ABC):
                     attribute_name="follow_external_dependency",
                     required=False,
                     format_help="dictionary or boolean",
-                    comment="External Task Sensor parameters in key value format: https://airflow.apache.org/docs/apache-airflow/stable/_api/airflow/sensors/base/index.html"
+                    comment="External Task Sensor parameters in key value format, "
+                    "e.g. deferrable: false: "
+                    "https://airflow.apache.org/docs/apache-airflow/stable/_api/airflow/sensors/base/index.html",
                 ),
                 # Attribute(
                 #     attribute_name="follow_external_dependency",
@@ -32,10 +34,7 @@ class IO(ConfigValidator, ABC):
         )
 
     def __init__(self, io_config, config_location):
-        super().__init__(
-            config=io_config,
-            location=config_location
-        )
+        super().__init__(config=io_config, location=config_location)
         self._name = self.parse_attribute("name")
         self._has_dependency = self.parse_attribute("has_dependency")
         if self._has_dependency is None:
@@ -11,16 +11,24 @@ from dagger.pipeline.ios import (
     dynamo_io,
     sns_io,
 )
-from dagger.utilities.classes import get_deep_obj_subclasses
+from dagger.utilities.classes import PluginRegistry
 
 
 class IOFactory:
+    registry = PluginRegistry(IO, entry_point_group="dagger.ios")
+
     def __init__(self):
-        self.factory = dict()
+        self.factory = self.registry.plugins
 
-        for cls in get_deep_obj_subclasses(IO):
-            self.factory[cls.ref_name] = cls
+    @classmethod
+    def register(cls, io_cls=None, ref_name: str = None):
+        return cls.registry.register(io_cls, ref_name=ref_name)
 
     def create_io(self, ref_name, io_config, task):
         config_location = path.join(task.pipeline.directory, task.name + ".yaml")
-        return self.factory[ref_name](io_config=io_config, config_location=config_location)
+        return self.create_io_at_location(ref_name, io_config, config_location)
+
+    def create_io_at_location(self, ref_name, io_config, config_location):
+        return self.registry[ref_name](
+            io_config=io_config, config_location=config_location
+        )
@@ -1,10 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from os.path import join, relpath
 
 from dagger import conf
 from dagger.alerts.alert import AlertBase, AlertFactory
 from dagger.pipeline.task import Task
 from dagger.utilities.config_validator import Attribute, ConfigValidator
+from dagger.utilities.expressions import evaluate
 
 
 class Pipeline(ConfigValidator):
@@ -130,8 +131,11 @@ class Pipeline(ConfigValidator):
                         alert_type, join(self.directory, "pipeline.yaml"), alert_config
                     )
                 )
-    def process_dag_parameters(self, dag_parameters):#TODO: create long term fix for this
+
+    def process_dag_parameters(
+        self, dag_parameters
+    ):  # TODO: create long term fix for this
         if dag_parameters is not None:
             for key, value in dag_parameters.items():
-                if key == 'dagrun_timeout':
-                    self._parameters[key] = eval(value)
+                if key == "dagrun_timeout":
+                    self._parameters[key] = evaluate(value, namespace="pipeline")
@@ -1,18 +1,18 @@
 import logging
 import re
-import datetime
 from typing import List
 
 from os.path import join
 
 from dagger.pipeline.io import IO
 from dagger.pipeline.io_factory import IOFactory
-from dagger.utilities.config_validator import Attribute, ConfigValidator
+from dagger.utilities.config_validator import Attribute, ConfigValidator, field_prefix
+from dagger.utilities.expressions import evaluate
 
 _logger = logging.getLogger("configFinder")
 
 
-dagger_python_re = re.compile('^{{[ \t]*dagger.python[(](.*)[)][ \t]*}}$')
+dagger_python_re = re.compile("^{{[ \t]*dagger.python[(](.*)[)][ \t]*}}$")
 
 
 class Task(ConfigValidator):
@@ -46,7 +46,8 @@ class Task(ConfigValidator):
                     attribute_name="timeout_in_seconds",
                     required=False,
                     format_help="int",
-                    validator=int),
+                    validator=int,
+                ),
                 Attribute(
                     attribute_name="airflow_task_parameters",
                     nullable=True,
@@ -90,7 +91,7 @@ class Task(ConfigValidator):
 
         matched = dagger_python_re.match(parameter)
         if matched:
-            return eval(matched.group(1))
+            return evaluate(matched.group(1), namespace="task")
         else:
             return parameter
         return parameter
@@ -158,12 +159,16 @@ class Task(ConfigValidator):
 
     def process_inputs(self, inputs):
         if inputs:
-            for io_config in inputs:
+            for position, io_config in enumerate(inputs):
                 io_type = io_config["type"]
-                self.add_input(self._io_factory.create_io(io_type, io_config, self))
+                with field_prefix(f"inputs[{position}]"):
+                    self.add_input(self._io_factory.create_io(io_type, io_config, self))
 
     def process_outputs(self, outputs):
         if outputs:
-            for io_config in outputs:
+            for position, io_config in enumerate(outputs):
                 io_type = io_config["type"]
-                self.add_output(self._io_factory.create_io(io_type, io_config, self))
+                with field_prefix(f"outputs[{position}]"):
+                    self.add_output(
+                        self._io_factory.create_io(io_type, io_config, self)
+                    )
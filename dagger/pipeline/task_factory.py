@@ -15,15 +15,18 @@ from dagger.pipeline.tasks import (
     sqoop_task,
     soda_task,
 )
-from dagger.utilities.classes import get_deep_obj_subclasses
+from dagger.utilities.classes import PluginRegistry
 
 
 class TaskFactory:
+    registry = PluginRegistry(Task, entry_point_group="dagger.tasks")
+
     def __init__(self):
-        self.factory = dict()
+        self.factory = self.registry.plugins
 
-        for cls in get_deep_obj_subclasses(Task):
-            self.factory[cls.ref_name] = cls
+    @classmethod
+    def register(cls, task_cls=None, ref_name: str = None):
+        return cls.registry.register(task_cls, ref_name=ref_name)
 
     def create_task(self, ref_name, task_name, pipeline_name, pipeline, task_config):
-        return self.factory[ref_name](task_name, pipeline_name, pipeline, task_config)
+        return self.registry[ref_name](task_name, pipeline_name, pipeline, task_config)
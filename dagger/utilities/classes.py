@@ -1,5 +1,163 @@
+import importlib
+import logging
+from collections import deque
+from importlib.metadata import entry_points
+from typing import Callable, Dict, Optional
+
+_logger = logging.getLogger("plugins")
+
+
 def get_deep_obj_subclasses(obj) -> list:
-    obj_subclasses: list = obj.__subclasses__()
-    for subclass in obj_subclasses:
-        obj_subclasses.extend(get_deep_obj_subclasses(subclass))
+    """All subclasses of obj level by level, every class listed once even if it is
+    reachable through several parents"""
+    obj_subclasses = []
+    seen = set()
+    queue = deque(obj.__subclasses__())
+    while queue:
+        subclass = queue.popleft()
+        if subclass in seen:
+            continue
+        seen.add(subclass)
+        obj_subclasses.append(subclass)
+        queue.extend(subclass.__subclasses__())
     return obj_subclasses
+
+
+class PluginRegistry:
+    """ref_name -> class lookup of the subclasses of a base class, built once per
+    process
+
+    The classes are found among the imported subclasses of the base class, the modules
+    of lazy_modules and the entry points of the entry_point_group, so packages can ship
+    their own task types with e.g. `entry_points={"dagger.tasks": ["my_task =
+    my_package.my_task:MyTask"]}`. An entry point can refer to a class or to a module
+    defining the subclasses. Classes can also be added explicitly with register.
+
+    The modules of lazy_modules and the entry points are keyed by ref_name and are only
+    imported when their ref_name is looked up, or when all plugins are listed.
+    Subclasses defined after the first lookup are picked up the first time their
+    ref_name is looked up, unknown ref_names are remembered until the next refresh.
+    """
+
+    def __init__(
+        self,
+        base_cls,
+        entry_point_group: Optional[str] = None,
+        lazy_modules: Dict[str, str] = None,
+    ):
+        self._base_cls = base_cls
+        self._entry_point_group = entry_point_group
+        self._lazy_modules = dict(lazy_modules or {})
+        self._entry_points = None
+        self._plugins: Optional[Dict[str, type]] = None
+        self._registered: Dict[str, type] = {}
+        self._unknown_ref_names = set()
+
+    def _get_entry_points(self) -> dict:
+        if self._entry_points is None:
+            self._entry_points = {}
+            if self._entry_point_group is not None:
+                for entry_point in entry_points(group=self._entry_point_group):
+                    self._entry_points[entry_point.name] = entry_point
+        return self._entry_points
+
+    def _load_lazy(self, ref_name: str, raise_errors: bool = True) -> None:
+        """Imports the module and loads the entry point providing ref_name, each of them
+        only once"""
+        module_name = self._lazy_modules.pop(ref_name, None)
+        if module_name is not None:
+            try:
+                importlib.import_module(module_name)
+            except ImportError as e:
+                if raise_errors:
+                    raise
+                _logger.error(
+                    "Couldn't import %s for %s: %s", module_name, ref_name, str(e)
+                )
+
+        entry_point = self._get_entry_points().pop(ref_name, None)
+        if entry_point is not None:
+            try:
+                plugin = entry_point.load()
+            except Exception as e:
+                _logger.error(
+                    "Couldn't load %s plugin %s: %s",
+                    self._entry_point_group,
+                    entry_point.name,
+                    str(e),
+                )
+                return
+            if isinstance(plugin, type) and issubclass(plugin, self._base_cls):
+                self._registered.setdefault(plugin.ref_name, plugin)
+
+    def refresh(self) -> Dict[str, type]:
+        """Looks up the subclasses again, the dict returned by plugins is updated in
+        place"""
+        plugins = {}
+        for cls in get_deep_obj_subclasses(self._base_cls):
+            plugins[cls.ref_name] = cls
+        plugins.update(self._registered)
+        self._unknown_ref_names.clear()
+
+        if self._plugins is None:
+            self._plugins = plugins
+        else:
+            self._plugins.clear()
+            self._plugins.update(plugins)
+        return self._plugins
+
+    @property
+    def loaded(self) -> Dict[str, type]:
+        """The plugins imported so far, without importing the lazy modules and entry
+        points"""
+        if self._plugins is None:
+            return self.refresh()
+        return self._plugins
+
+    @property
+    def plugins(self) -> Dict[str, type]:
+        """Every plugin, the lazy modules and entry points are imported on the first
+        call"""
+        if self._lazy_modules or self._get_entry_points():
+            for ref_name in list(self._lazy_modules.keys()) + list(
+                self._get_entry_points().keys()
+            ):
+                self._load_lazy(ref_name, raise_errors=False)
+            return self.refresh()
+        return self.loaded
+
+    def get(self, ref_name: str, default=None):
+        plugins = self.loaded
+        if ref_name not in plugins and ref_name not in self._unknown_ref_names:
+            self._load_lazy(ref_name)
+            plugins = self.refresh()
+            if ref_name not in plugins:
+                self._unknown_ref_names.add(ref_name)
+        return plugins.get(ref_name, default)
+
+    def __getitem__(self, ref_name: str) -> type:
+        plugin = self.get(ref_name)
+        if plugin is None:
+            raise KeyError(ref_name)
+        return plugin
+
+    def register(self, cls: type = None, ref_name: str = None) -> Callable:
+        """Registers cls under ref_name, its own ref_name by default. Can be used as a
+        class decorator too"""
+
+        def register_class(plugin_cls: type) -> type:
+            if not issubclass(plugin_cls, self._base_cls):
+                raise TypeError(
+                    f"{plugin_cls.__name__} is not a subclass of "
+                    f"{self._base_cls.__name__}"
+                )
+            plugin_ref_name = ref_name or plugin_cls.ref_name
+            self._registered[plugin_ref_name] = plugin_cls
+            self._unknown_ref_names.discard(plugin_ref_name)
+            if self._plugins is not None:
+                self._plugins[plugin_ref_name] = plugin_cls
+            return plugin_cls
+
+        if cls is None:
+            return register_class
+        return register_class(cls)
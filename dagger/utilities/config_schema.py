@@ -0,0 +1,283 @@
+from typing import Dict, Iterator, List, Optional
+
+from dagger.pipeline.io_factory import IOFactory
+from dagger.pipeline.pipeline import Pipeline
+from dagger.pipeline.task import Task
+from dagger.pipeline.task_factory import TaskFactory
+from dagger.utilities.config_validator import Attribute, ConfigError
+
+JSON_SCHEMA_DRAFT = "http://json-schema.org/draft-07/schema#"
+
+# Only the validators which reject every value of another json type are turned into
+# types. The others convert anything, e.g. str, or accept strings too, e.g. int("3")
+_VALIDATOR_TYPES = {dict: "object", list: "array"}
+
+
+def _get_attributes(validator_cls) -> List[Attribute]:
+    if validator_cls.config_attributes.get(validator_cls.__name__, None) is None:
+        validator_cls.init_attributes_once(validator_cls)
+    return validator_cls.config_attributes[validator_cls.__name__]
+
+
+def _attribute_schema(attribute: Attribute, children: List[Attribute]) -> dict:
+    schema = {}
+    description = [
+        comment for comment in (attribute._format, attribute._comment) if comment
+    ]
+    if description:
+        schema["description"] = " | ".join(description)
+
+    # The required fields of the children can't be found in anything else than a
+    # dictionary
+    has_required_children = any(child.required for child in children)
+    json_type = (
+        "object" if has_required_children else _VALIDATOR_TYPES.get(attribute.validator)
+    )
+    if json_type:
+        schema["type"] = (
+            [json_type, "null"]
+            if attribute.nullable and not has_required_children
+            else json_type
+        )
+    elif not attribute.nullable:
+        schema["not"] = {"type": "null"}
+
+    if has_required_children:
+        schema["required"] = [child.name for child in children if child.required]
+
+    return schema
+
+
+def attributes_schema(validator_cls) -> dict:
+    """JSON schema of the config of a ConfigValidator class built from its Attribute
+    definitions. The inputs and outputs of tasks refer to the io definition of the task
+    schema."""
+    children = {}
+    for attribute in _get_attributes(validator_cls):
+        parent = attribute.parent_fields[-1] if attribute.parent_fields else None
+        children.setdefault(parent, []).append(attribute)
+
+    def properties_schema(parent: Optional[str]) -> Dict[str, dict]:
+        properties = {}
+        for attribute in children.get(parent, []):
+            properties[attribute.name] = _attribute_schema(
+                attribute, children.get(attribute.name, [])
+            )
+            if attribute.name in children:
+                properties[attribute.name]["properties"] = properties_schema(
+                    attribute.name
+                )
+        return properties
+
+    schema = {
+        "type": "object",
+        "properties": properties_schema(None),
+        "required": [
+            attribute.name for attribute in children.get(None, []) if attribute.required
+        ],
+    }
+
+    ref_name = getattr(validator_cls, "ref_name", None)
+    if ref_name and "type" in schema["properties"]:
+        schema["properties"]["type"]["const"] = ref_name
+    if issubclass(validator_cls, Task):
+        for io_field in ("inputs", "outputs"):
+            # Tasks without inputs or outputs can leave the list empty
+            schema["properties"][io_field].pop("not", None)
+            schema["properties"][io_field]["type"] = ["array", "null"]
+            schema["properties"][io_field]["items"] = {"$ref": "#/definitions/io"}
+
+    return schema
+
+
+def _discriminated_schema(
+    title: str, schemas: Dict[str, dict], definition_prefix: str
+) -> dict:
+    """Schema of a config whose type field selects one of the schemas"""
+    return {
+        "title": title,
+        "type": "object",
+        "required": ["type"],
+        "properties": {"type": {"enum": sorted(schemas.keys())}},
+        "allOf": [
+            {
+                "if": {
+                    "required": ["type"],
+                    "properties": {"type": {"const": ref_name}},
+                },
+                "then": {"$ref": f"#/definitions/{definition_prefix}_{ref_name}"},
+            }
+            for ref_name in sorted(schemas.keys())
+        ],
+    }
+
+
+def _io_definitions() -> Dict[str, dict]:
+    io_schemas = {
+        ref_name: attributes_schema(io_cls)
+        for ref_name, io_cls in IOFactory().factory.items()
+    }
+    definitions = {f"io_{ref_name}": schema for ref_name, schema in io_schemas.items()}
+    definitions["io"] = _discriminated_schema("dagger io", io_schemas, "io")
+    return definitions
+
+
+def io_schema() -> dict:
+    definitions = _io_definitions()
+    schema = definitions.pop("io")
+    return {"$schema": JSON_SCHEMA_DRAFT, **schema, "definitions": definitions}
+
+
+def task_schema() -> dict:
+    """Schema of the task yaml files, the type of the task selects the attributes to
+    check"""
+    task_schemas = {
+        ref_name: attributes_schema(task_cls)
+        for ref_name, task_cls in TaskFactory().factory.items()
+    }
+    definitions = {
+        f"task_{ref_name}": schema for ref_name, schema in task_schemas.items()
+    }
+    definitions.update(_io_definitions())
+    return {
+        "$schema": JSON_SCHEMA_DRAFT,
+        **_discriminated_schema("dagger task", task_schemas, "task"),
+        "definitions": definitions,
+    }
+
+
+def pipeline_schema() -> dict:
+    return {
+        "$schema": JSON_SCHEMA_DRAFT,
+        "title": "dagger pipeline",
+        **attributes_schema(Pipeline),
+    }
+
+
+SCHEMA_KINDS = {"pipeline": pipeline_schema, "task": task_schema, "io": io_schema}
+
+
+class SchemaValidator:
+    """Checks config dicts against the schemas generated by this module without building
+    any object
+
+    Only the keywords the generated schemas use are supported: type, not, const, enum,
+    required, properties, items, local $ref and allOf of if/then blocks selecting a
+    definition by a const property. The error messages and field paths are the same as
+    the ones of ConfigValidator in collect_errors mode.
+    """
+
+    _JSON_TYPES = {
+        "object": dict,
+        "array": list,
+        "null": type(None),
+    }
+
+    def __init__(self, schema: dict):
+        self._schema = schema
+        self._definitions = schema.get("definitions", {})
+
+    def _resolve(self, schema: dict) -> dict:
+        ref = schema.get("$ref")
+        if ref is None:
+            return schema
+        return self._definitions[ref.rsplit("/", 1)[-1]]
+
+    def _has_type(self, value, json_type) -> bool:
+        json_types = json_type if isinstance(json_type, list) else [json_type]
+        return any(isinstance(value, self._JSON_TYPES[name]) for name in json_types)
+
+    @staticmethod
+    def _matches_condition(condition: dict, value) -> bool:
+        if not isinstance(value, dict):
+            return False
+        for name in condition.get("required", []):
+            if name not in value:
+                return False
+        for name, property_schema in condition.get("properties", {}).items():
+            if name in value and value[name] != property_schema.get("const"):
+                return False
+        return True
+
+    def iter_errors(self, config, location: str) -> Iterator[ConfigError]:
+        return self._iter_errors(self._schema, config, location, [])
+
+    def _iter_errors(
+        self, schema: dict, value, location: str, path: List[str]
+    ) -> Iterator[ConfigError]:
+        schema = self._resolve(schema)
+        field = path[-1].split("[")[0] if path else None
+        field_path = ".".join(path) or None
+
+        if "not" in schema and value is None:
+            yield ConfigError(
+                location,
+                field_path,
+                "Field {} cannot be empty in {}".format(field, location),
+            )
+            return
+        if "type" in schema and not self._has_type(value, schema["type"]):
+            if value is None:
+                message = "Field {} cannot be empty in {}".format(field, location)
+            else:
+                message = (
+                    "Wrong format for field: {} in {} with error: expected {}, got {}"
+                ).format(field, location, schema["type"], type(value).__name__)
+            yield ConfigError(location, field_path, message)
+            return
+        if "const" in schema and value != schema["const"]:
+            yield ConfigError(
+                location,
+                field_path,
+                "Wrong format for field: {} in {} with error: expected {}".format(
+                    field, location, schema["const"]
+                ),
+            )
+            return
+        if "enum" in schema and value not in schema["enum"]:
+            yield ConfigError(
+                location,
+                field_path,
+                "Wrong format for field: {} in {} with error: unknown value {}".format(
+                    field, location, value
+                ),
+            )
+            return
+
+        if isinstance(value, dict):
+            for name in schema.get("required", []):
+                if name not in value:
+                    yield ConfigError(
+                        location,
+                        ".".join(path + [name]),
+                        "Required field: {} is missing in {}".format(name, location),
+                    )
+            for name, property_schema in schema.get("properties", {}).items():
+                if name in value:
+                    yield from self._iter_errors(
+                        property_schema, value[name], location, path + [name]
+                    )
+            for block in schema.get("allOf", []):
+                if self._matches_condition(block["if"], value):
+                    yield from self._iter_errors(block["then"], value, location, path)
+
+        if isinstance(value, list) and "items" in schema:
+            for position, item in enumerate(value):
+                item_path = (
+                    path[:-1] + [f"{path[-1]}[{position}]"]
+                    if path
+                    else [f"[{position}]"]
+                )
+                yield from self._iter_errors(schema["items"], item, location, item_path)
+
+
+_validators = {}
+
+
+def get_schema_validator(kind: str) -> SchemaValidator:
+    """The validators are built once per process, generating the task schema loads every
+    task class"""
+    validator = _validators.get(kind)
+    if validator is None:
+        validator = _validators[kind] = SchemaValidator(SCHEMA_KINDS[kind]())
+    return validator
@@ -1,5 +1,6 @@
 import logging
-from typing import List
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from dagger.utilities.exceptions import (
     DaggerFieldFormatException,
@@ -10,9 +11,7 @@ _logger = logging.getLogger("configFinder")
 
 
 class Attribute:
-    """
-
-    """
+    """ """
 
     def __init__(
         self,
@@ -84,12 +83,113 @@ class Attribute:
         self._is_parent = value
 
 
+class _ParsePlan:
+    """Attributes of a validator class compiled for parsing: the attributes are grouped
+    by their parent fields, so parse_all resolves every nested dict once"""
+
+    __slots__ = ("attributes", "groups")
+
+    def __init__(self, attributes: List[Attribute]):
+        self.attributes: Dict[str, Tuple[Attribute, Tuple[str, ...]]] = {
+            attribute.name: (attribute, tuple(attribute.parent_fields))
+            for attribute in attributes
+        }
+
+        groups = {}
+        for attribute in attributes:
+            groups.setdefault(tuple(attribute.parent_fields), []).append(attribute)
+        self.groups: List[Tuple[Tuple[str, ...], List[Attribute]]] = list(
+            groups.items()
+        )
+
+
+_MISSING = object()
+
+
+class _ParseError:
+    """The error of an invalid attribute, reported when the attribute is parsed"""
+
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+class ConfigError:
+    """A missing or invalid field found while collecting the errors of the configs, see
+    collect_errors"""
+
+    def __init__(self, location: str, field_path: Optional[str], message: str):
+        self.location = location
+        self.field_path = field_path
+        self.message = message
+
+    def __repr__(self):
+        return "{}: {}: {}".format(self.location, self.field_path or "-", self.message)
+
+    def __eq__(self, other):
+        return isinstance(other, ConfigError) and (
+            self.location,
+            self.field_path,
+            self.message,
+        ) == (
+            other.location,
+            other.field_path,
+            other.message,
+        )
+
+
+class _ErrorCollector:
+    def __init__(self):
+        self.errors: List[ConfigError] = []
+        self.field_prefixes: List[str] = []
+
+
+_error_collectors: List[_ErrorCollector] = []
+
+
+@contextmanager
+def collect_errors() -> Iterator[List[ConfigError]]:
+    """Instead of raising the first DaggerMissingFieldException or
+    DaggerFieldFormatException, the validators created in this context record the error,
+    treat the field as missing and go on parsing. Yields the list the errors are
+    appended to."""
+    collector = _ErrorCollector()
+    _error_collectors.append(collector)
+    try:
+        yield collector.errors
+    finally:
+        _error_collectors.remove(collector)
+
+
+@contextmanager
+def field_prefix(prefix: str) -> Iterator[None]:
+    """Prefixes the field paths of the errors collected in this context, e.g. with the
+    position of an io in the inputs of a task. Does nothing outside of
+    collect_errors."""
+    if not _error_collectors:
+        yield
+        return
+
+    collector = _error_collectors[-1]
+    collector.field_prefixes.append(prefix)
+    try:
+        yield
+    finally:
+        collector.field_prefixes.pop()
+
+
 class ConfigValidator:
     config_attributes = {}
+    parse_plans = {}
 
     @classmethod
     def init_attributes_once(cls, orig_cls: str) -> None:
         if cls.config_attributes.get(cls.__name__, None):
+            if cls.__name__ not in cls.parse_plans:
+                cls.parse_plans[cls.__name__] = _ParsePlan(
+                    cls.config_attributes[cls.__name__]
+                )
             return
 
         parent_class = cls.__mro__[1]
@@ -118,6 +218,8 @@ class ConfigValidator:
                     attributes_lookup[parent_attribute]
                 ].is_parent = True
 
+        cls.parse_plans[cls.__name__] = _ParsePlan(cls.config_attributes[cls.__name__])
+
     @classmethod
     def add_config_attributes(cls, attributes: list):
         cls.config_attributes[cls.__name__] = attributes
@@ -126,28 +228,34 @@ class ConfigValidator:
         self._location = location
         self._config = config
 
-        self.init_attributes_once(self.__class__)
+        if self.__class__.__name__ not in self.parse_plans:
+            self.init_attributes_once(self.__class__)
+        self._parsed_values = self._parse_plan()
 
-        self._attributes = {}
-        for i, attr in enumerate(self.config_attributes[self.__class__.__name__]):
-            self._attributes[attr.name] = i
+    def _report_error(self, attr: Attribute, exception: Exception):
+        """Raises the exception, or records it when the errors are collected"""
+        _logger.error(str(exception))
+        if not _error_collectors:
+            raise exception
 
-    def parse_attribute(self, attribute_name):
-        attr = self.config_attributes[self.__class__.__name__][
-            self._attributes[attribute_name]
-        ]
-        parsed_value = self._config
-        try:
-            for i in range(len(attr.parent_fields)):
-                parsed_value = parsed_value[attr.parent_fields[i]]
-            parsed_value = parsed_value[attribute_name]
-        except (TypeError, KeyError):
+        collector = _error_collectors[-1]
+        field_path = ".".join(
+            collector.field_prefixes + attr.parent_fields + [attr.name]
+        )
+        collector.errors.append(ConfigError(self._location, field_path, str(exception)))
+        return None
+
+    def _parse_value(self, attr: Attribute, parsed_value):
+        """Checks and converts the value of an attribute, _MISSING stands for a missing
+        field. Returns a _ParseError instead of raising, the error is reported when the
+        attribute is parsed."""
+        attribute_name = attr.name
+        if parsed_value is _MISSING:
             if attr.required:
                 msg = "Required field: {} is missing in {}".format(
                     attribute_name, self._location
                 )
-                _logger.error(msg)
-                raise DaggerMissingFieldException(msg)
+                return _ParseError(DaggerMissingFieldException(msg))
             else:
                 return None
 
@@ -155,8 +263,7 @@ class ConfigValidator:
             msg = "Field {} cannot be empty in {}".format(
                 attribute_name, self._location
             )
-            _logger.error(msg)
-            raise DaggerFieldFormatException(msg)
+            return _ParseError(DaggerFieldFormatException(msg))
 
         try:
             if attr.validator and parsed_value:
@@ -165,11 +272,65 @@ class ConfigValidator:
             msg = "Wrong format for field: {} in {} with error: {}".format(
                 attribute_name, self._location, str(e)
             )
-            _logger.error(msg)
-            raise DaggerFieldFormatException(msg)
+            return _ParseError(DaggerFieldFormatException(msg))
 
         return parsed_value
 
+    def _get_parent(self, parent_fields: Tuple[str, ...]):
+        parent = self._config
+        try:
+            for parent_field in parent_fields:
+                parent = parent[parent_field]
+        except (TypeError, KeyError):
+            return _MISSING
+        return parent
+
+    @staticmethod
+    def _get_child(parent, attribute_name: str):
+        try:
+            return parent[attribute_name]
+        except (TypeError, KeyError):
+            return _MISSING
+
+    def _parse_plan(self) -> Dict[str, Any]:
+        """Parses every attribute of the class in one pass over the config, resolving
+        every nested dict once"""
+        parsed_values = {}
+        for parent_fields, attributes in self.parse_plans[
+            self.__class__.__name__
+        ].groups:
+            parent = self._get_parent(parent_fields) if parent_fields else self._config
+            for attr in attributes:
+                parsed_value = (
+                    _MISSING
+                    if parent is _MISSING
+                    else self._get_child(parent, attr.name)
+                )
+                parsed_values[attr.name] = self._parse_value(attr, parsed_value)
+        return parsed_values
+
+    def parse_attribute(self, attribute_name):
+        """The value of the attribute parsed with the config. The error of an invalid
+        attribute is raised, or recorded when the errors are collected, every time the
+        attribute is parsed."""
+        parsed_value = self._parsed_values[attribute_name]
+        if isinstance(parsed_value, _ParseError):
+            attr, _ = self.parse_plans[self.__class__.__name__].attributes[
+                attribute_name
+            ]
+            return self._report_error(attr, parsed_value.exception)
+        return parsed_value
+
+    def parse_all(self) -> Dict[str, Any]:
+        """Parses every attribute of the class. Errors are the same as the ones of
+        parse_attribute, raised for the first invalid attribute in the order of the
+        attribute groups."""
+        return {
+            attr.name: self.parse_attribute(attr.name)
+            for _, attributes in self.parse_plans[self.__class__.__name__].groups
+            for attr in attributes
+        }
+
     @classmethod
     def sample(cls):
         if cls.config_attributes.get(cls.__name__, None) is None:
@@ -1,5 +1,4 @@
 import json
-import yaml
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from os import path
@@ -7,6 +6,8 @@ from os.path import join
 from typing import Tuple, List, Dict
 import logging
 
+from dagger.utilities import yaml_loader
+
 # Task base configurations
 ATHENA_TASK_BASE = {"type": "athena"}
 DATABRICKS_TASK_BASE = {"type": "databricks"}
@@ -68,7 +69,7 @@ class DBTConfigParser(ABC):
                 if file_type == "json":
                     return json.load(file)
                 elif file_type == "yaml":
-                    return yaml.safe_load(file)
+                    return yaml_loader.safe_load(file)
         except FileNotFoundError:
             _logger.error(f"File not found: {file_path}")
             exit(1)
@@ -164,7 +165,9 @@ class DBTConfigParser(ABC):
         materialized_type = node.get("config", {}).get("materialized")
 
         follow_external_dependency = True
-        if resource_type == "seed" or (self._is_node_preparation_model(node) and materialized_type != "table"):
+        if resource_type == "seed" or (
+            self._is_node_preparation_model(node) and materialized_type != "table"
+        ):
             follow_external_dependency = False
 
         if resource_type == "source":
@@ -180,7 +183,9 @@ class DBTConfigParser(ABC):
                 dagger_tasks += self._generate_dagger_tasks(node_name)
 
         else:
-            table_task = self._get_table_task(node, follow_external_dependency=follow_external_dependency)
+            table_task = self._get_table_task(
+                node, follow_external_dependency=follow_external_dependency
+            )
             dagger_tasks.append(table_task)
 
             if materialized_type in ("table", "incremental"):
@@ -16,3 +16,23 @@ class InvalidConfigException(Exception):
 class IdAlreadyExistsException(Exception):
     def __init__(self, message):
         super().__init__(message)
+
+
+class InvalidSnapshotException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class DependencyCycleException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class InvalidExpressionException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
+class InvalidProducerIndexException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
@@ -0,0 +1,250 @@
+import ast
+import copy
+import datetime
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from dagger.utilities.exceptions import InvalidExpressionException
+
+# Names an expression can refer to. Task parameters were evaluated next to `import
+# datetime` and the dag parameters of pipelines next to `from datetime import datetime,
+# timedelta`, hence the two namespaces.
+_BUILTINS = {
+    "abs": abs,
+    "bool": bool,
+    "float": float,
+    "int": int,
+    "max": max,
+    "min": min,
+    "round": round,
+    "str": str,
+}
+NAMESPACES = {
+    "task": {**_BUILTINS, "datetime": datetime, "timedelta": datetime.timedelta},
+    "pipeline": {
+        **_BUILTINS,
+        "datetime": datetime.datetime,
+        "timedelta": datetime.timedelta,
+    },
+}
+
+# Attributes an expression can read, by object. The object has to be one of the names
+# above, so no attribute of an arbitrary value, like __class__, is reachable.
+_ALLOWED_ATTRIBUTES = {
+    id(datetime): {"date", "datetime", "time", "timedelta", "timezone"},
+    id(datetime.timezone): {"utc"},
+}
+_CALLABLES = set(map(id, _BUILTINS.values())) | set(
+    map(
+        id,
+        [
+            datetime.date,
+            datetime.datetime,
+            datetime.time,
+            datetime.timedelta,
+            datetime.timezone,
+        ],
+    )
+)
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Not: operator.not_,
+}
+_MAX_EXPONENT = 64
+_MAX_INT_BITS = 4096
+_MAX_SEQUENCE_LENGTH = 10000
+# Results of these types can't be changed by the callers, everything else is copied out
+# of the cache
+_IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    datetime.tzinfo,
+)
+
+Evaluator = Callable[[], Any]
+
+
+class _Compiler:
+    """Turns the syntax tree of an expression into nested closures, rejecting everything
+    but literals, arithmetic, the names of the namespace and calls of the allowed
+    callables"""
+
+    def __init__(self, expression: str, namespace: Dict[str, Any]):
+        self._expression = expression
+        self._namespace = namespace
+
+    def _error(self, reason: str) -> InvalidExpressionException:
+        return InvalidExpressionException(f"{reason} in expression: {self._expression}")
+
+    def compile(self, node: ast.AST) -> Evaluator:
+        method = getattr(self, "_compile_" + type(node).__name__, None)
+        if method is None:
+            raise self._error(f"Unsupported syntax {type(node).__name__}")
+        return method(node)
+
+    def _compile_Expression(self, node: ast.Expression) -> Evaluator:
+        return self.compile(node.body)
+
+    def _compile_Constant(self, node: ast.Constant) -> Evaluator:
+        value = node.value
+        return lambda: value
+
+    def _compile_Name(self, node: ast.Name) -> Evaluator:
+        if node.id not in self._namespace:
+            raise self._error(f"Unknown name {node.id}")
+        value = self._namespace[node.id]
+        return lambda: value
+
+    def _compile_Attribute(self, node: ast.Attribute) -> Evaluator:
+        # Attributes are resolved at compile time, so only attributes of the namespace
+        # objects are reachable
+        value = self._resolve_static(node.value)
+        if node.attr not in _ALLOWED_ATTRIBUTES.get(id(value), ()):
+            raise self._error(f"Attribute {node.attr} is not allowed")
+        attribute = getattr(value, node.attr)
+        return lambda: attribute
+
+    def _resolve_static(self, node: ast.AST):
+        if isinstance(node, ast.Name):
+            return self._compile_Name(node)()
+        if isinstance(node, ast.Attribute):
+            return self._compile_Attribute(node)()
+        raise self._error("Attributes can only be read from names")
+
+    def _compile_Tuple(self, node: ast.Tuple) -> Evaluator:
+        elements = [self.compile(element) for element in node.elts]
+        return lambda: tuple(element() for element in elements)
+
+    def _compile_List(self, node: ast.List) -> Evaluator:
+        elements = [self.compile(element) for element in node.elts]
+        return lambda: [element() for element in elements]
+
+    def _compile_Dict(self, node: ast.Dict) -> Evaluator:
+        if any(key is None for key in node.keys):
+            raise self._error("Dictionary unpacking is not allowed")
+        items = [
+            (self.compile(key), self.compile(value))
+            for key, value in zip(node.keys, node.values)
+        ]
+        return lambda: {key(): value() for key, value in items}
+
+    def _compile_UnaryOp(self, node: ast.UnaryOp) -> Evaluator:
+        unary_operator = _UNARY_OPERATORS.get(type(node.op))
+        if unary_operator is None:
+            raise self._error(f"Unsupported operator {type(node.op).__name__}")
+        operand = self.compile(node.operand)
+        return lambda: unary_operator(operand())
+
+    def _compile_BinOp(self, node: ast.BinOp) -> Evaluator:
+        binary_operator = _BINARY_OPERATORS.get(type(node.op))
+        if binary_operator is None:
+            raise self._error(f"Unsupported operator {type(node.op).__name__}")
+        left = self.compile(node.left)
+        right = self.compile(node.right)
+
+        if binary_operator is operator.pow:
+
+            def power():
+                base, exponent = left(), right()
+                if isinstance(exponent, (int, float)) and abs(exponent) > _MAX_EXPONENT:
+                    raise self._error(f"Exponent above {_MAX_EXPONENT}")
+                # Chained powers like (10 ** 64) ** 64 stay below the exponent limit, so
+                # the result size is bounded
+                if (
+                    isinstance(base, int)
+                    and isinstance(exponent, int)
+                    and base.bit_length() * exponent > _MAX_INT_BITS
+                ):
+                    raise self._error(f"Integer above {_MAX_INT_BITS} bits")
+                return base**exponent
+
+            return power
+
+        if binary_operator is operator.mul:
+
+            def multiply():
+                left_value, right_value = left(), right()
+                for sequence, times in (
+                    (left_value, right_value),
+                    (right_value, left_value),
+                ):
+                    if isinstance(sequence, (str, bytes, tuple, list)) and isinstance(
+                        times, int
+                    ):
+                        if len(sequence) * times > _MAX_SEQUENCE_LENGTH:
+                            raise self._error(
+                                f"Sequence longer than {_MAX_SEQUENCE_LENGTH}"
+                            )
+                if isinstance(left_value, int) and isinstance(right_value, int):
+                    if (
+                        left_value.bit_length() + right_value.bit_length()
+                        > _MAX_INT_BITS
+                    ):
+                        raise self._error(f"Integer above {_MAX_INT_BITS} bits")
+                return left_value * right_value
+
+            return multiply
+        return lambda: binary_operator(left(), right())
+
+    def _compile_Call(self, node: ast.Call) -> Evaluator:
+        function = self._resolve_static(node.func)
+        if id(function) not in _CALLABLES:
+            raise self._error(f"Calling {ast.unparse(node.func)} is not allowed")
+        if any(isinstance(arg, ast.Starred) for arg in node.args) or any(
+            kw.arg is None for kw in node.keywords
+        ):
+            raise self._error("Argument unpacking is not allowed")
+
+        args = [self.compile(arg) for arg in node.args]
+        kwargs = [
+            (keyword.arg, self.compile(keyword.value)) for keyword in node.keywords
+        ]
+        return lambda: function(
+            *[arg() for arg in args], **{name: value() for name, value in kwargs}
+        )
+
+
+def _compile_expression(expression: str, namespace: str) -> Evaluator:
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise InvalidExpressionException(
+            f"Invalid expression: {expression} with error: {e.msg}"
+        )
+    return _Compiler(expression, NAMESPACES[namespace]).compile(tree)
+
+
+@lru_cache(maxsize=None)
+def _evaluate_cached(expression: str, namespace: str):
+    return _compile_expression(expression, namespace)()
+
+
+def evaluate(expression: str, namespace: str = "task"):
+    """Evaluates a python expression restricted to literals, arithmetic and the datetime
+    helpers of the namespace, without eval. Expressions can't reach anything impure, so
+    each distinct expression is compiled and evaluated once per process. Results which
+    aren't immutable, including tuples of lists, are copied, the callers can change
+    them."""
+    value = _evaluate_cached(expression, namespace)
+    if not isinstance(value, _IMMUTABLE_TYPES):
+        return copy.deepcopy(value)
+    return value
@@ -6,9 +6,9 @@ import pkgutil
 from os import path, environ
 
 import jinja2
-import yaml
 
 from dagger import conf
+from dagger.utilities import yaml_loader
 from mergedeep import merge
 
 _logger = logging.getLogger("root")
@@ -35,8 +35,8 @@ class Module:
     @staticmethod
     def read_yaml(yaml_str):
         try:
-            yaml_obj = yaml.safe_load(yaml_str)
-        except yaml.YAMLError as exc:
+            yaml_obj = yaml_loader.safe_load(yaml_str)
+        except yaml_loader.YAMLError as exc:
             _logger.error(f"Couldn't read config file {yaml_str}")
             exit(1)
         return yaml_obj
@@ -100,7 +100,7 @@ class Module:
     @staticmethod
     def dump_yaml(yaml_str, yaml_path):
         with open(yaml_path, "w") as stream:
-            yaml.safe_dump(
+            yaml_loader.safe_dump(
                 yaml_str, stream=stream, default_flow_style=False, sort_keys=False
             )
 
@@ -120,7 +120,7 @@ class Module:
                 task_str = self.replace_template_parameters(
                     task_yaml, template_parameters
                 )
-                task_dict = yaml.safe_load(task_str)
+                task_dict = yaml_loader.safe_load(task_str)
 
                 task_dict["autogenerated_by_dagger"] = self._path_to_config
                 override_parameters = self._override_parameters or {}
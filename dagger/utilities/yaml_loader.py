@@ -0,0 +1,221 @@
+# The environment variable substitution below (RE_COMMENTS, RE_DOT_ENV, RE_PATTERN,
+# read_env_file and substitute_env_vars) is adapted from EnvYAML,
+# https://github.com/thesimj/envyaml
+#
+# MIT License
+#
+# Copyright (c) 2019-2021 Mykola Bubelich
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Yaml loading and dumping used across dagger
+
+The libyaml based CSafeLoader/CSafeDumper are used when PyYAML was built with libyaml,
+otherwise the pure python implementations. Environment variable substitution follows the
+semantics of EnvYAML:
+    - $VAR and ${VAR} are replaced with the value of the variable
+    - $VAR|default and ${VAR|default} fall back to default when VAR is not set
+    - $$ is an escaped $
+    - lines starting with # are removed before the substitution
+    - variables can also be defined in the file pointed by ENV_FILE or in .env of the
+      working directory
+    - in strict mode undefined variables raise ValueError, unless ENVYAML_STRICT_DISABLE
+      is set
+"""
+
+import io
+import os
+import re
+from typing import Dict, List, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+YAMLError = yaml.YAMLError
+
+ENVYAML_STRICT_DISABLE = "ENVYAML_STRICT_DISABLE"
+DEFAULT_ENV_FILE = ".env"
+
+RE_COMMENTS = re.compile(r"(^#.*\n)", re.MULTILINE | re.UNICODE | re.IGNORECASE)
+RE_DOT_ENV = re.compile(
+    r"^(?!\d+)(?P<name>[\w\-\.]+)\=[\"\']?(?P<value>(.*?))[\"\']?$",
+    re.MULTILINE | re.UNICODE | re.IGNORECASE,
+)
+RE_PATTERN = re.compile(
+    r"(?P<pref>[\"\'])?"
+    r"(\$(?:(?P<escaped>(\$|\d+))|"
+    r"{(?P<braced>(.*?))(\|(?P<braced_default>.*?))?}|"
+    r"(?P<named>[\w\-\.]+)(\|(?P<named_default>.*))?))"
+    r"(?P<post>[\"\'])?",
+    re.MULTILINE | re.UNICODE | re.IGNORECASE | re.VERBOSE,
+)
+
+
+def safe_load(stream):
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data, stream=None, **kwargs):
+    return yaml.dump(data, stream=stream, Dumper=SafeDumper, **kwargs)
+
+
+def referenced_env_vars(content: str) -> List[str]:
+    env_vars = set()
+    for entry in RE_PATTERN.finditer(content):
+        variable = entry.group("named") or entry.group("braced")
+        if variable:
+            env_vars.add(variable)
+    return sorted(env_vars)
+
+
+def read_env_file(file_path: str, strict: bool = False) -> Dict[str, str]:
+    """The variables defined in an env file"""
+    variables = {}
+    defined = set()
+
+    with io.open(file_path, encoding="utf8") as stream:
+        content = stream.read()
+
+    for entry in RE_DOT_ENV.finditer(content):
+        name = entry.group("name")
+        value = entry.group("value")
+        if name in variables:
+            defined.add(name)
+        variables[name] = os.path.expandvars(value) if "$" in value else value
+
+    if strict and defined:
+        raise ValueError(
+            "Strict mode enabled, variables "
+            + ", ".join(["$" + v for v in defined])
+            + " defined several times!"
+        )
+
+    return variables
+
+
+def get_env_file() -> Optional[str]:
+    """The env file whose variables are substituted too, they take precedence over the
+    environment"""
+    return os.environ.get("ENV_FILE") or (
+        DEFAULT_ENV_FILE if os.path.exists(DEFAULT_ENV_FILE) else None
+    )
+
+
+def get_environment(strict: bool = True) -> Dict[str, str]:
+    environment = dict(os.environ)
+
+    env_file = get_env_file()
+    if env_file:
+        environment.update(
+            read_env_file(
+                env_file, strict and ENVYAML_STRICT_DISABLE not in environment
+            )
+        )
+
+    return environment
+
+
+def substitute_env_vars(
+    content: str, environment: Dict[str, str] = None, strict: bool = True
+) -> str:
+    environment = get_environment(strict) if environment is None else environment
+    strict = strict and ENVYAML_STRICT_DISABLE not in environment
+
+    content = RE_COMMENTS.sub("", content)
+
+    not_found_variables = set()
+    replaces = {}
+    shifting = 0
+
+    for entry in RE_PATTERN.finditer(content):
+        groups = entry.groupdict()
+
+        variable = None
+        default = None
+        replace = None
+
+        if groups["named"]:
+            variable = groups["named"]
+            default = groups["named_default"]
+        elif groups["braced"]:
+            variable = groups["braced"]
+            default = groups["braced_default"]
+        elif groups["escaped"] and "$" in groups["escaped"]:
+            span = entry.span()
+            content = (
+                content[: span[0] + shifting]
+                + groups["escaped"]
+                + content[span[1] + shifting :]
+            )
+            # Every update of the content moves the spans of the following matches
+            shifting += len(groups["escaped"]) - (span[1] - span[0])
+
+        if variable is not None:
+            if variable in environment:
+                replace = environment[variable]
+            elif default is not None:
+                replace = default
+            else:
+                not_found_variables.add(variable)
+
+        if replace is not None:
+            search = "${" if groups["braced"] else "$"
+            search += variable
+            search += "|" + default if default is not None else ""
+            search += "}" if groups["braced"] else ""
+            replaces[search] = replace
+
+    if strict and not_found_variables:
+        raise ValueError(
+            "Strict mode enabled, variables "
+            + ", ".join(["$" + v for v in not_found_variables])
+            + " are not defined!"
+        )
+
+    for search in sorted(replaces, reverse=True):
+        content = content.replace(search, replaces[search])
+
+    return content
+
+
+def load_env_yaml_content(
+    content: str, strict: bool = True, environment: Dict[str, str] = None
+) -> dict:
+    config = safe_load(
+        substitute_env_vars(content, environment=environment, strict=strict)
+    )
+
+    if isinstance(config, list):
+        return {index: value for index, value in enumerate(config)}
+    if isinstance(config, dict):
+        return config
+    return {}
+
+
+def load_env_yaml(yaml_path: str, strict: bool = True) -> dict:
+    """Parses a yaml file after substituting the environment variables in it"""
+    with io.open(yaml_path, encoding="utf8") as stream:
+        content = stream.read()
+
+    return load_env_yaml_content(content, strict=strict)
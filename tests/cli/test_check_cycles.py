@@ -0,0 +1,23 @@
+import unittest
+
+from click.testing import CliRunner
+
+from dagger import conf
+from dagger.main import cli
+
+
+class TestCheckCycles(unittest.TestCase):
+    def test_check_cycles(self):
+        result = CliRunner().invoke(
+            cli, ["check-cycles", "--root", conf.DAGS_DIR, "--levels"]
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(
+            "2\tdummy_second:test_external_sensor", result.output.splitlines()
+        )
+        self.assertIn("No dependency cycles found", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
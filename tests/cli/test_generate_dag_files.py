@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dagger import conf
+from dagger.cli.generate_dag_files import DAG_FILE_HEADER, _generate_dag_files
+
+
+class TestGenerateDagFiles(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._target_dir = os.path.join(self._tmp_dir.name, "dags")
+        os.makedirs(self._target_dir)
+        self._index_path = os.path.join(self._tmp_dir.name, "producer_index.json")
+
+        patcher = patch("dagger.conf.PRODUCER_INDEX_PATH", self._index_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_generate_dag_files(self):
+        pipeline_names, removed_files = _generate_dag_files(
+            conf.DAGS_DIR, self._target_dir
+        )
+
+        self.assertListEqual(
+            pipeline_names, ["test_batch", "test_external_sensor", "test_spark"]
+        )
+        self.assertListEqual(removed_files, [])
+        self.assertListEqual(
+            sorted(os.listdir(self._target_dir)),
+            [
+                "dagger_test_batch.py",
+                "dagger_test_external_sensor.py",
+                "dagger_test_spark.py",
+            ],
+        )
+
+        with open(
+            os.path.join(self._target_dir, "dagger_test_batch.py"), "r"
+        ) as stream:
+            content = stream.read()
+        self.assertTrue(content.startswith(DAG_FILE_HEADER))
+        self.assertIn("collect_dags(only_pipelines=['test_batch'])", content)
+        self.assertTrue(os.path.exists(self._index_path))
+
+    def test_stale_files_are_removed(self):
+        stale_file = os.path.join(self._target_dir, "dagger_removed_pipeline.py")
+        with open(stale_file, "w") as stream:
+            stream.write(DAG_FILE_HEADER + "\n")
+        user_file = os.path.join(self._target_dir, "dagger_custom.py")
+        with open(user_file, "w") as stream:
+            stream.write("# Not generated\n")
+
+        _, removed_files = _generate_dag_files(conf.DAGS_DIR, self._target_dir)
+
+        self.assertListEqual(removed_files, [stale_file])
+        self.assertTrue(os.path.isfile(user_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from click.testing import CliRunner
+
+from dagger import conf
+from dagger.main import cli
+
+
+class TestLineage(unittest.TestCase):
+    def test_downstream_tasks(self):
+        result = CliRunner().invoke(
+            cli, ["lineage", "--root", conf.DAGS_DIR, "-t", "task", "batch:test_batch"]
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertListEqual(
+            result.output.splitlines(),
+            ["dummy_first:test_external_sensor", "dummy_second:test_external_sensor"],
+        )
+
+    def test_path_to(self):
+        result = CliRunner().invoke(
+            cli,
+            [
+                "lineage",
+                "--root",
+                conf.DAGS_DIR,
+                "--path_to",
+                "dummy_first:test_external_sensor",
+                "batch:test_batch",
+            ],
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertListEqual(
+            result.output.splitlines(),
+            [
+                "batch:test_batch",
+                "redshift://dwh/batch_table",
+                "dummy_first:test_external_sensor",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
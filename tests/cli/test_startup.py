@@ -0,0 +1,71 @@
+import json
+import re
+import subprocess
+import sys
+import unittest
+
+from click.testing import CliRunner
+
+from dagger.main import SUBCOMMANDS, cli
+
+# Generous compared to the ~0.1s it takes, the import time of the same modules varies a
+# lot between machines
+IMPORT_TIME_BUDGET_SECONDS = 1.0
+HEAVY_PACKAGES = ["airflow", "boto3", "slack", "jinja2"]
+# Cumulative time of the modules imported at the top level, nested imports are indented
+TOP_LEVEL_IMPORT_RE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| \S")
+
+RUN_COMMAND = """
+import json, sys
+from dagger.main import cli
+try:
+    cli([{command!r}], standalone_mode=False)
+finally:
+    imported = [package for package in {packages!r} if package in sys.modules]
+    print(json.dumps(imported), file=sys.stderr)
+"""
+
+
+class TestStartup(unittest.TestCase):
+    @staticmethod
+    def _run(command: str):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                RUN_COMMAND.format(command=command, packages=HEAVY_PACKAGES),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        stderr_lines = result.stderr.splitlines()
+        import_time_us = 0
+        for line in stderr_lines:
+            matched = TOP_LEVEL_IMPORT_RE.match(line)
+            if matched:
+                import_time_us += int(matched.group(1))
+        return import_time_us / 1e6, json.loads(stderr_lines[-1])
+
+    def test_simple_commands_stay_light(self):
+        for command in ["list-tasks", "list-ios", "list-alerts"]:
+            import_time, imported_packages = self._run(command)
+
+            self.assertListEqual(imported_packages, [], command)
+            self.assertLess(import_time, IMPORT_TIME_BUDGET_SECONDS, command)
+
+    def test_every_subcommand_loads(self):
+        for command_name in SUBCOMMANDS:
+            command = cli.get_command(None, command_name)
+            self.assertEqual(command.name, command_name)
+
+        result = CliRunner().invoke(cli, ["--help"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        for command_name in SUBCOMMANDS:
+            self.assertIn(command_name, result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
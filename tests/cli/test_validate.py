@@ -0,0 +1,26 @@
+import unittest
+
+from click.testing import CliRunner
+
+from dagger import conf
+from dagger.main import cli
+
+
+class TestValidate(unittest.TestCase):
+    def test_validate(self):
+        result = CliRunner().invoke(cli, ["validate", "--root", conf.DAGS_DIR])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("All configs are valid", result.output)
+
+    def test_validate_fast(self):
+        result = CliRunner().invoke(
+            cli, ["validate", "--root", conf.DAGS_DIR, "--fast"]
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("All configs are valid", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dagger import conf
+from dagger.config_finder.config_cache import ConfigCache
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._cache_path = os.path.join(
+            self._tmp_dir.name, "cache", "config_cache.pickle"
+        )
+        self._yaml_path = os.path.join(self._tmp_dir.name, "task.yaml")
+        with open(self._yaml_path, "w") as stream:
+            stream.write("bucket: ${DAGGER_TEST_BUCKET}\n")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _put(self, cache):
+        cache.put(
+            self._yaml_path,
+            "bucket: ${DAGGER_TEST_BUCKET}\n",
+            {"bucket": "bucket1"},
+            os.stat(self._yaml_path),
+        )
+
+    @patch.dict(os.environ, {"DAGGER_TEST_BUCKET": "bucket1"})
+    def test_roundtrip(self):
+        cache = ConfigCache(self._cache_path, "local")
+        self.assertIsNone(cache.get(self._yaml_path))
+
+        self._put(cache)
+        cache.save()
+
+        reloaded_cache = ConfigCache(self._cache_path, "local")
+        config = reloaded_cache.get(self._yaml_path)
+        self.assertDictEqual(config, {"bucket": "bucket1"})
+
+        # Every lookup returns a new copy
+        config["bucket"] = "changed"
+        self.assertDictEqual(reloaded_cache.get(self._yaml_path), {"bucket": "bucket1"})
+
+    def test_invalidation(self):
+        with patch.dict(os.environ, {"DAGGER_TEST_BUCKET": "bucket1"}):
+            cache = ConfigCache(self._cache_path, "local")
+            self._put(cache)
+            self.assertIsNotNone(cache.get(self._yaml_path))
+
+            self.assertIsNone(
+                ConfigCache(self._cache_path, "datatst").get(self._yaml_path)
+            )
+
+        with patch.dict(os.environ, {"DAGGER_TEST_BUCKET": "bucket2"}):
+            self.assertIsNone(cache.get(self._yaml_path))
+
+        with patch.dict(os.environ, {"DAGGER_TEST_BUCKET": "bucket1"}):
+            with open(self._yaml_path, "a") as stream:
+                stream.write("path: other\n")
+            self.assertIsNone(cache.get(self._yaml_path))
+
+    @patch.dict(os.environ, {"DAGGER_TEST_BUCKET": "bucket1"})
+    def test_file_changed_while_loading(self):
+        file_stat = os.stat(self._yaml_path)
+        with open(self._yaml_path, "a") as stream:
+            stream.write("path: other\n")
+
+        cache = ConfigCache(self._cache_path, "local")
+        cache.put(
+            self._yaml_path,
+            "bucket: ${DAGGER_TEST_BUCKET}\n",
+            {"bucket": "bucket1"},
+            file_stat,
+        )
+        self.assertIsNone(cache.get(self._yaml_path))
+
+    def test_env_file_invalidation(self):
+        env_file_path = os.path.join(self._tmp_dir.name, ".env")
+        with open(env_file_path, "w") as stream:
+            stream.write("DAGGER_TEST_BUCKET=bucket1\n")
+
+        with patch.dict(os.environ, {"ENV_FILE": env_file_path}):
+            cache = ConfigCache(self._cache_path, "local")
+            self._put(cache)
+            self.assertIsNotNone(cache.get(self._yaml_path))
+
+            with open(env_file_path, "w") as stream:
+                stream.write("DAGGER_TEST_BUCKET=bucket2\n")
+            self.assertIsNone(cache.get(self._yaml_path))
+
+    @patch.dict(os.environ, {"DAGGER_TEST_BUCKET": "bucket1"})
+    def test_save_merges_and_prunes(self):
+        other_yaml_path = os.path.join(self._tmp_dir.name, "other.yaml")
+        with open(other_yaml_path, "w") as stream:
+            stream.write("name: other\n")
+
+        first_cache = ConfigCache(self._cache_path, "local")
+        second_cache = ConfigCache(self._cache_path, "local")
+        self._put(first_cache)
+        second_cache.put(
+            other_yaml_path,
+            "name: other\n",
+            {"name": "other"},
+            os.stat(other_yaml_path),
+        )
+        first_cache.save()
+        second_cache.save()
+
+        reloaded_cache = ConfigCache(self._cache_path, "local")
+        self.assertDictEqual(reloaded_cache.get(self._yaml_path), {"bucket": "bucket1"})
+        self.assertDictEqual(reloaded_cache.get(other_yaml_path), {"name": "other"})
+
+        os.remove(other_yaml_path)
+        self._put(reloaded_cache)
+        reloaded_cache.save()
+        self.assertListEqual(
+            list(ConfigCache(self._cache_path, "local")._load().keys()),
+            [self._yaml_path],
+        )
+
+    def test_config_processor_with_cache(self):
+        cache = ConfigCache(self._cache_path, conf.ENV)
+        pipelines = ConfigProcessor(
+            ConfigFinder(conf.DAGS_DIR), config_cache=cache
+        ).process_pipeline_configs()
+        self.assertTrue(os.path.isfile(self._cache_path))
+
+        cached_cache = ConfigCache(self._cache_path, conf.ENV)
+        with patch(
+            "dagger.config_finder.config_processor.yaml_loader"
+        ) as yaml_loader_mock:
+            cached_pipelines = ConfigProcessor(
+                ConfigFinder(conf.DAGS_DIR), config_cache=cached_cache
+            ).process_pipeline_configs()
+            yaml_loader_mock.load_env_yaml.assert_not_called()
+            yaml_loader_mock.load_env_yaml_content.assert_not_called()
+
+        self.assertListEqual(
+            [[task.uniq_name for task in pipeline.tasks] for pipeline in pipelines],
+            [
+                [task.uniq_name for task in pipeline.tasks]
+                for pipeline in cached_pipelines
+            ],
+        )
+        self.assertListEqual(
+            [pipeline.schedule for pipeline in pipelines],
+            [pipeline.schedule for pipeline in cached_pipelines],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+from dagger.config_finder.config_finder import DAGGER_IGNORE_FILENAME, ConfigFinder
+
+
+class TestConfigFinder(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._root = self._tmp_dir.name
+
+        for path in [
+            "pipe_b/pipeline.yaml",
+            "pipe_b/task_2.yaml",
+            "pipe_b/task_1.yaml",
+            "pipe_b/batch_job/pipeline.yaml",
+            "pipe_b/batch_job/job.yaml",
+            "pipe_a/pipeline.yaml",
+            "pipe_a/task.yaml",
+            "pipe_a/task_draft.yaml",
+            "pipe_a/sub_pipe/pipeline.yaml",
+            "pipe_a/sub_pipe/task.yaml",
+            "pipe_a/__pycache__/pipeline.yaml",
+            "pipe_a/__pycache__/task.yaml",
+            ".git/pipeline.yaml",
+            ".git/task.yaml",
+            "no_tasks/pipeline.yaml",
+            "no_pipeline/task.yaml",
+            "no_pipeline/other_task.yaml",
+        ]:
+            file_path = os.path.join(self._root, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            open(file_path, "w").close()
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _find(self, ignore_patterns=None, nested_pipelines=True):
+        config_finder = ConfigFinder(
+            self._root,
+            ignore_patterns=ignore_patterns or [],
+            nested_pipelines=nested_pipelines,
+        )
+        return [
+            (
+                os.path.relpath(pipeline_config.directory, self._root),
+                [task.config for task in pipeline_config.job_configs],
+            )
+            for pipeline_config in config_finder.iter_configs()
+        ]
+
+    def test_find_configs(self):
+        self.assertListEqual(
+            self._find(),
+            [
+                ("pipe_a", ["task.yaml", "task_draft.yaml"]),
+                ("pipe_a/sub_pipe", ["task.yaml"]),
+                ("pipe_b", ["task_1.yaml", "task_2.yaml"]),
+                ("pipe_b/batch_job", ["job.yaml"]),
+            ],
+        )
+
+    def test_without_nested_pipelines(self):
+        with unittest.mock.patch("os.scandir", side_effect=os.scandir) as scandir_mock:
+            pipelines = self._find(nested_pipelines=False)
+
+        self.assertListEqual(
+            pipelines,
+            [
+                ("pipe_a", ["task.yaml", "task_draft.yaml"]),
+                ("pipe_b", ["task_1.yaml", "task_2.yaml"]),
+            ],
+        )
+        scanned_directories = {
+            os.path.relpath(call.args[0], self._root)
+            for call in scandir_mock.call_args_list
+        }
+        self.assertNotIn("pipe_b/batch_job", scanned_directories)
+        self.assertIn("no_pipeline", scanned_directories)
+
+    def test_ignore_patterns(self):
+        self.assertListEqual(
+            self._find(["batch_job/", "*_draft.yaml", "pipe_a/sub_pipe"]),
+            [("pipe_a", ["task.yaml"]), ("pipe_b", ["task_1.yaml", "task_2.yaml"])],
+        )
+
+    def test_ignore_file(self):
+        with open(os.path.join(self._root, DAGGER_IGNORE_FILENAME), "w") as stream:
+            stream.write("# Job code\nbatch_job\n\npipe_a/\n")
+
+        self.assertListEqual(self._find(), [("pipe_b", ["task_1.yaml", "task_2.yaml"])])
+
+    def test_find_configs_is_iter_configs(self):
+        config_finder = ConfigFinder(self._root, ignore_patterns=[])
+        self.assertListEqual(
+            [
+                pipeline_config.directory
+                for pipeline_config in config_finder.find_configs()
+            ],
+            [
+                pipeline_config.directory
+                for pipeline_config in config_finder.iter_configs()
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
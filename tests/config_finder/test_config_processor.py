@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from dagger import conf
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+
+
+class TestParallelConfigProcessor(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._dags_dir = os.path.join(self._tmp_dir.name, "dags")
+        shutil.copytree(conf.DAGS_DIR, self._dags_dir)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    @staticmethod
+    def _describe(pipelines):
+        return [
+            (
+                pipeline.name,
+                pipeline.schedule,
+                [
+                    (task.uniq_name, [io.alias() for io in task.inputs + task.outputs])
+                    for task in pipeline.tasks
+                ],
+            )
+            for pipeline in pipelines
+        ]
+
+    def test_parallel_loading_matches_serial(self):
+        serial_pipelines = ConfigProcessor(
+            ConfigFinder(conf.DAGS_DIR)
+        ).process_pipeline_configs()
+        parallel_pipelines = ConfigProcessor(
+            ConfigFinder(conf.DAGS_DIR), workers=2
+        ).process_pipeline_configs()
+
+        self.assertListEqual(
+            self._describe(parallel_pipelines), self._describe(serial_pipelines)
+        )
+
+    def test_first_failing_file_is_reported(self):
+        for pipeline_dir in ["test_batch", "test_spark"]:
+            with open(
+                os.path.join(self._dags_dir, pipeline_dir, "broken.yaml"), "w"
+            ) as stream:
+                stream.write("type: [batch\n")
+
+        config_finder = ConfigFinder(self._dags_dir)
+        first_broken_dir = [
+            pipeline_config.directory
+            for pipeline_config in config_finder.find_configs()
+            if os.path.basename(pipeline_config.directory)
+            in ("test_batch", "test_spark")
+        ][0]
+
+        with patch("dagger.config_finder.config_processor._logger") as logger_mock:
+            with self.assertRaises(yaml.YAMLError):
+                ConfigProcessor(config_finder, workers=2).process_pipeline_configs()
+
+        logger_mock.error.assert_called_once_with(
+            "Couldn't load config file: %s",
+            os.path.join(first_broken_dir, "broken.yaml"),
+        )
+
+    def test_parallel_streaming_in_batches(self):
+        serial_pipelines = ConfigProcessor(
+            ConfigFinder(conf.DAGS_DIR)
+        ).process_pipeline_configs()
+        with patch(
+            "dagger.config_finder.config_processor.PARALLEL_LOADING_BATCH_SIZE", 2
+        ):
+            config_processor = ConfigProcessor(ConfigFinder(conf.DAGS_DIR), workers=2)
+            parallel_pipelines = list(config_processor.iter_pipelines())
+
+        self.assertListEqual(
+            self._describe(parallel_pipelines), self._describe(serial_pipelines)
+        )
+        self.assertIsNone(config_processor._executor)
+
+
+class TestIterPipelines(unittest.TestCase):
+    def test_pipelines_are_built_lazily(self):
+        config_processor = ConfigProcessor(ConfigFinder(conf.DAGS_DIR))
+        with patch.object(
+            config_processor,
+            "process_pipeline_config",
+            wraps=config_processor.process_pipeline_config,
+        ) as process_mock:
+            pipelines = config_processor.iter_pipelines()
+            process_mock.assert_not_called()
+
+            first_pipeline = next(pipelines)
+            self.assertEqual(first_pipeline.name, "test_batch")
+            self.assertEqual(process_mock.call_count, 1)
+
+            pipelines.close()
+            self.assertEqual(process_mock.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
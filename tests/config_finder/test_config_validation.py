@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from dagger import conf
+from dagger.config_finder.config_validation import validate_directory
+
+
+class TestConfigValidation(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._dags_dir = os.path.join(self._tmp_dir.name, "dags")
+        shutil.copytree(conf.DAGS_DIR, self._dags_dir)
+
+        self._patchers = [
+            patch("dagger.conf.DAGS_DIR", self._dags_dir),
+            patch("dagger.config_finder.config_processor.DAG_DIR", self._dags_dir),
+        ]
+        for patcher in self._patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self._patchers:
+            patcher.stop()
+        self._tmp_dir.cleanup()
+
+    def _update_config(self, *path, update):
+        config_path = os.path.join(self._dags_dir, *path)
+        with open(config_path, "r") as stream:
+            config = yaml.safe_load(stream)
+        update(config)
+        with open(config_path, "w") as stream:
+            yaml.safe_dump(config, stream)
+
+    def _break_configs(self):
+        def break_pipeline(config):
+            config["start_date"] = "yesterday"
+            del config["owner"]
+
+        def break_batch_task(config):
+            del config["description"]
+            del config["inputs"][0]["name"]
+            config["outputs"][1]["name"] = None
+
+        self._update_config("test_batch", "pipeline.yaml", update=break_pipeline)
+        self._update_config("test_batch", "batch.yaml", update=break_batch_task)
+        self._update_config(
+            "test_spark",
+            "spark.yaml",
+            update=lambda config: config.update(type="unknown"),
+        )
+
+    def test_valid_configs(self):
+        self.assertListEqual(validate_directory(self._dags_dir), [])
+
+    def test_all_errors_are_reported(self):
+        self._break_configs()
+
+        errors = validate_directory(self._dags_dir)
+
+        batch_dir = os.path.join(self._dags_dir, "test_batch")
+        self.assertListEqual(
+            [(error.location, error.field_path) for error in errors],
+            [
+                (os.path.join(batch_dir, "pipeline.yaml"), "owner"),
+                (os.path.join(batch_dir, "pipeline.yaml"), "start_date"),
+                (os.path.join(batch_dir, "batch.yaml"), "description"),
+                (os.path.join(batch_dir, "batch.yaml"), "inputs[0].name"),
+                (os.path.join(batch_dir, "batch.yaml"), "outputs[1].name"),
+                (os.path.join(self._dags_dir, "test_spark", "spark.yaml"), "type"),
+            ],
+        )
+        self.assertIn("Wrong format for field: start_date", errors[1].message)
+
+    def test_schema_only(self):
+        self._break_configs()
+
+        errors = validate_directory(self._dags_dir, schema_only=True)
+
+        batch_dir = os.path.join(self._dags_dir, "test_batch")
+        # The format of the start date is only checked by its attribute validator
+        self.assertListEqual(
+            [(error.location, error.field_path) for error in errors],
+            [
+                (os.path.join(batch_dir, "pipeline.yaml"), "owner"),
+                (os.path.join(batch_dir, "batch.yaml"), "description"),
+                (os.path.join(batch_dir, "batch.yaml"), "inputs[0].name"),
+                (os.path.join(batch_dir, "batch.yaml"), "outputs[1].name"),
+                (os.path.join(self._dags_dir, "test_spark", "spark.yaml"), "type"),
+            ],
+        )
+
+    def test_parallel_validation_matches_serial(self):
+        self._break_configs()
+
+        self.assertListEqual(
+            validate_directory(self._dags_dir, workers=2),
+            validate_directory(self._dags_dir, workers=1),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
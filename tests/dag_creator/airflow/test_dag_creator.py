@@ -1,14 +1,56 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
 import unittest
 from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
 
 from dagger import conf
 from dagger.config_finder.config_finder import ConfigFinder
 from dagger.config_finder.config_processor import ConfigProcessor
-from dagger.dag_creator.airflow.dag_creator import DagCreator
+from dagger.dag_creator.airflow.dag_creator import (
+    SENSOR_PER_DAG,
+    SENSOR_PER_DAG_RUN,
+    DagCreator,
+)
+from dagger.graph.producer_index import UpstreamPipeline, UpstreamTask
 from dagger.graph.task_graph import TaskGraph
+from dagger.utilities.exceptions import InvalidConfigException
 
+from airflow.serialization.serialized_objects import SerializedDAG
 from airflow.utils.dot_renderer import render_dag
 
+SERIALIZED_DAG_HASHES = """
+import json
+from tests.dag_creator.airflow.test_dag_creator import (
+    TestDagCreator,
+    serialized_dag_hashes,
+)
+from dagger.dag_creator.airflow.dag_creator import DagCreator
+
+task_graph = TestDagCreator._fetch_task_graph()
+print(json.dumps([
+    serialized_dag_hashes(
+        DagCreator(task_graph._graph, with_data_nodes=with_data_nodes).traverse_graph()
+    )
+    for with_data_nodes in (False, True)
+]))
+"""
+
+
+def serialized_dag_hashes(dags):
+    """Hashes of the serialized dags, computed like the ones Airflow compares before
+    updating serialized_dag"""
+    return {
+        dag_id: hashlib.md5(
+            json.dumps(SerializedDAG.to_dict(dag), sort_keys=True).encode()
+        ).hexdigest()
+        for dag_id, dag in dags.items()
+    }
+
 
 class TestDagCreator(unittest.TestCase):
     @staticmethod
@@ -23,7 +65,8 @@ class TestDagCreator(unittest.TestCase):
             task_graph.add_pipeline(pipeline)
 
         return task_graph
-#
+
+    #
     @staticmethod
     def _read_file(filename):
         with open(filename, "r") as stream:
@@ -34,24 +77,28 @@ class TestDagCreator(unittest.TestCase):
 
         self.task_graph = self._fetch_task_graph()
 
-        self.dot_test_batch_graph_without_dataset =\
-            self._read_file("tests/fixtures/dag_creator/airflow/dag_test_batch_without_dataset.dot")
+        self.dot_test_batch_graph_without_dataset = self._read_file(
+            "tests/fixtures/dag_creator/airflow/dag_test_batch_without_dataset.dot"
+        )
 
-        self.dot_test_batch_graph_with_dataset =\
-            self._read_file("tests/fixtures/dag_creator/airflow/dag_test_batch_with_dataset.dot")
+        self.dot_test_batch_graph_with_dataset = self._read_file(
+            "tests/fixtures/dag_creator/airflow/dag_test_batch_with_dataset.dot"
+        )
 
-        self.dot_test_spark_deactivate = \
-            self._read_file("tests/fixtures/dag_creator/airflow/dag_test_spark_deactivate.dot")
+        self.dot_test_spark_deactivate = self._read_file(
+            "tests/fixtures/dag_creator/airflow/dag_test_spark_deactivate.dot"
+        )
 
-        self.dot_test_external_sensor =\
-            self._read_file("tests/fixtures/dag_creator/airflow/dag_test_external_sensor.dot")
+        self.dot_test_external_sensor = self._read_file(
+            "tests/fixtures/dag_creator/airflow/dag_test_external_sensor.dot"
+        )
 
     def test_dag_creator_without_dataset(self):
         dag_creator = DagCreator(self.task_graph._graph)
         dags = dag_creator.traverse_graph()
 
         self.assertEqual(len(dags), 3)
-        test_batch_dag = dags['test_batch']
+        test_batch_dag = dags["test_batch"]
 
         dot = render_dag(test_batch_dag)
         self.assertEqual(dot.source, self.dot_test_batch_graph_without_dataset)
@@ -62,7 +109,7 @@ class TestDagCreator(unittest.TestCase):
 
         self.assertEqual(len(dags), 3)
 
-        test_batch_dag = dags['test_batch']
+        test_batch_dag = dags["test_batch"]
         dot = render_dag(test_batch_dag)
         self.assertEqual(dot.source, self.dot_test_batch_graph_with_dataset)
 
@@ -71,11 +118,193 @@ class TestDagCreator(unittest.TestCase):
         dags = dag_creator.traverse_graph()
 
         self.assertEqual(len(dags), 3)
-        test_external_sensor_dag = dags['test_external_sensor']
+        test_external_sensor_dag = dags["test_external_sensor"]
 
         dot = render_dag(test_external_sensor_dag)
         self.assertEqual(dot.source, self.dot_test_external_sensor)
 
+    def test_dag_creator_selected_pipelines(self):
+        dag_creator = DagCreator(self.task_graph._graph, with_data_nodes=True)
+        dags = dag_creator.traverse_graph(pipeline_ids=["test_batch"])
+
+        self.assertListEqual(list(dags.keys()), ["test_batch"])
+        dot = render_dag(dags["test_batch"])
+        self.assertEqual(dot.source, self.dot_test_batch_graph_with_dataset)
+
+    def test_serialized_dags_do_not_depend_on_graph_order(self):
+        reversed_task_graph = TaskGraph()
+        for pipeline in reversed(
+            ConfigProcessor(ConfigFinder(conf.DAGS_DIR)).process_pipeline_configs()
+        ):
+            reversed_task_graph.add_pipeline(pipeline)
+
+        for with_data_nodes in (False, True):
+            hashes = [
+                serialized_dag_hashes(
+                    DagCreator(
+                        task_graph._graph, with_data_nodes=with_data_nodes
+                    ).traverse_graph()
+                )
+                for task_graph in (self.task_graph, reversed_task_graph)
+            ]
+            self.assertDictEqual(hashes[0], hashes[1])
+
+    def test_serialized_dags_do_not_depend_on_hash_seed(self):
+        hashes = []
+        for hash_seed in ("1", "2"):
+            result = subprocess.run(
+                [sys.executable, "-c", SERIALIZED_DAG_HASHES],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": hash_seed},
+            )
+            hashes.append(json.loads(result.stdout.splitlines()[-1]))
+
+        self.assertListEqual(hashes[0], hashes[1])
+
+    def _add_upstream_task(self, task_name):
+        """Another task of test_batch writing the table dummy_first of
+        test_external_sensor depends on"""
+        upstream_task = UpstreamTask(
+            task_name, UpstreamPipeline("test_batch", "0 3 * * *")
+        )
+        graph = self.task_graph._graph
+        graph.add_node(
+            TaskGraph.NODE_TYPE_TASK,
+            upstream_task.uniq_name,
+            upstream_task.name,
+            upstream_task,
+        )
+        graph.add_edge(upstream_task.uniq_name, "redshift://dwh/batch_table")
+
+    def test_sensor_per_task(self):
+        self._add_upstream_task("other_batch")
+        dags = DagCreator(self.task_graph._graph).traverse_graph(
+            pipeline_ids=["test_external_sensor"]
+        )
+
+        dag = dags["test_external_sensor"]
+        self.assertSetEqual(
+            {task_id for task_id in dag.task_ids if task_id.endswith("-sensor")},
+            {"test_batch-batch-sensor", "test_batch-other_batch-sensor"},
+        )
+
+    def test_sensor_per_dag(self):
+        self._add_upstream_task("other_batch")
+        dag_creator = DagCreator(
+            self.task_graph._graph, sensor_consolidation=SENSOR_PER_DAG
+        )
+        dags = dag_creator.traverse_graph(pipeline_ids=["test_external_sensor"])
+
+        dag = dags["test_external_sensor"]
+        self.assertListEqual(
+            [task_id for task_id in dag.task_ids if task_id.endswith("-sensor")],
+            ["test_batch-sensor"],
+        )
+        sensor = dag.get_task("test_batch-sensor")
+        self.assertEqual(sensor.external_dag_id, "test_batch")
+        self.assertListEqual(sensor.external_task_ids, ["batch", "other_batch"])
+        self.assertEqual(sensor.poke_interval, 60)
+        self.assertSetEqual(sensor.upstream_task_ids, {"dummy-control-flow"})
+        self.assertSetEqual(sensor.downstream_task_ids, {"dummy_first"})
+
+    def test_sensor_per_dag_with_different_sensor_args(self):
+        """dummy_first also reads a table written by other_batch, waited for with
+        another poke interval"""
+        self._add_upstream_task("other_batch")
+        graph = self.task_graph._graph
+        graph.remove_edge("other_batch:test_batch", "redshift://dwh/batch_table")
+        dataset_id = "redshift://dwh/other_table"
+        graph.add_node(
+            TaskGraph.NODE_TYPE_DATASET,
+            dataset_id,
+            obj=SimpleNamespace(alias=lambda: dataset_id),
+        )
+        graph.add_edge("other_batch:test_batch", dataset_id)
+        graph.add_edge(
+            dataset_id,
+            "dummy_first:test_external_sensor",
+            follow_external_dependency={"poke_interval": 300},
+        )
+
+        dag_creator = DagCreator(graph, sensor_consolidation=SENSOR_PER_DAG)
+        dag = dag_creator.traverse_graph(pipeline_ids=["test_external_sensor"])[
+            "test_external_sensor"
+        ]
+
+        sensors = {
+            task_id: dag.get_task(task_id)
+            for task_id in dag.task_ids
+            if "-sensor" in task_id
+        }
+        self.assertListEqual(
+            sorted(sensors), ["test_batch-sensor", "test_batch-sensor-2"]
+        )
+        self.assertListEqual(
+            sorted(
+                (sensor.external_task_ids, sensor.poke_interval)
+                for sensor in sensors.values()
+            ),
+            [(["batch"], 60), (["other_batch"], 300)],
+        )
+
+    def test_sensor_per_dag_run(self):
+        dag_creator = DagCreator(
+            self.task_graph._graph, sensor_consolidation=SENSOR_PER_DAG_RUN
+        )
+        dags = dag_creator.traverse_graph()
+
+        sensor = dags["test_external_sensor"].get_task("test_batch-sensor")
+        self.assertEqual(sensor.external_dag_id, "test_batch")
+        self.assertIsNone(sensor.external_task_id)
+        self.assertFalse(sensor.external_task_ids)
+        self.assertSetEqual(sensor.downstream_task_ids, {"dummy_first"})
+
+    def test_no_sensor_for_schedule_presets(self):
+        self.task_graph._graph.get_node("test_batch").obj._schedule = "@daily"
+        dags = DagCreator(self.task_graph._graph).traverse_graph()
+
+        dag = dags["test_external_sensor"]
+        self.assertFalse(
+            [task_id for task_id in dag.task_ids if task_id.endswith("-sensor")]
+        )
+        self.assertSetEqual(dag.get_task("dummy_first").upstream_task_ids, set())
+
+    def test_unknown_sensor_consolidation(self):
+        with self.assertRaises(InvalidConfigException):
+            DagCreator(self.task_graph._graph, sensor_consolidation="pipeline")
+
+    def test_sensor_is_deferrable_by_default(self):
+        dags = DagCreator(self.task_graph._graph).traverse_graph()
+
+        sensor = dags["test_external_sensor"].get_task("test_batch-batch-sensor")
+        self.assertTrue(sensor.deferrable)
+        self.assertEqual(sensor.poke_interval, 60)
+
+    def test_sensor_falls_back_to_reschedule_mode(self):
+        with mock.patch.object(conf, "EXTERNAL_SENSOR_DEFERRABLE", False):
+            dags = DagCreator(self.task_graph._graph).traverse_graph()
+
+        sensor = dags["test_external_sensor"].get_task("test_batch-batch-sensor")
+        self.assertFalse(sensor.deferrable)
+        self.assertEqual(sensor.mode, "reschedule")
+
+    def test_sensor_args_override_deferrable(self):
+        with mock.patch.object(conf, "EXTERNAL_SENSOR_DEFAULT_ARGS", {"mode": "poke"}):
+            self.assertDictEqual(
+                DagCreator._get_external_sensor_args({"deferrable": False}),
+                {"deferrable": False, "mode": "poke"},
+            )
+            self.assertDictEqual(
+                DagCreator._get_external_sensor_args({"mode": "reschedule"}),
+                {"deferrable": True, "mode": "reschedule"},
+            )
+        self.assertDictEqual(
+            DagCreator._get_external_sensor_args({"deferrable": False}),
+            {"deferrable": False, "mode": "reschedule"},
+        )
+
     def test_get_execution_delta_fn(self):
         execution_date = datetime(2021, 12, 28, 18, 30)
         test_cases = [
@@ -83,19 +312,49 @@ class TestDagCreator(unittest.TestCase):
             # Airflow 3 CronTriggerTimetable: the target is the most recent upstream
             # tick at or before the downstream run's logical_date (= the upstream run's
             # own logical_date).
-            ("0 * * * *", "30 * * * *", datetime(2021, 12, 28, 18, 0)),  # both hourly with different minutes
-            ("30 * * * *", "30 * * * *", datetime(2021, 12, 28, 18, 30)),  # both hourly with same minutes
-            ("0 * * * *", "30 18 * * *", datetime(2021, 12, 28, 18, 0)),  # from hourly to daily with different minutes
-            ("30 * * * *", "30 18 * * *", datetime(2021, 12, 28, 18, 30)),  # from hourly to daily with same minutes
-            ("0 19 * * *", "30 * * * *", datetime(2021, 12, 27, 19, 0)),  # from daily to hourly with different minutes
-            ("0 20 * * *", "30 * * * *", datetime(2021, 12, 27, 20, 0)),  # from daily to hourly with different minutes
-            ("30 19 * * *", "30 * * * *", datetime(2021, 12, 27, 19, 30)),  # from daily to hourly with same minutes
+            (
+                "0 * * * *",
+                "30 * * * *",
+                datetime(2021, 12, 28, 18, 0),
+            ),  # both hourly with different minutes
+            (
+                "30 * * * *",
+                "30 * * * *",
+                datetime(2021, 12, 28, 18, 30),
+            ),  # both hourly with same minutes
+            (
+                "0 * * * *",
+                "30 18 * * *",
+                datetime(2021, 12, 28, 18, 0),
+            ),  # from hourly to daily with different minutes
+            (
+                "30 * * * *",
+                "30 18 * * *",
+                datetime(2021, 12, 28, 18, 30),
+            ),  # from hourly to daily with same minutes
+            (
+                "0 19 * * *",
+                "30 * * * *",
+                datetime(2021, 12, 27, 19, 0),
+            ),  # from daily to hourly with different minutes
+            (
+                "0 20 * * *",
+                "30 * * * *",
+                datetime(2021, 12, 27, 20, 0),
+            ),  # from daily to hourly with different minutes
+            (
+                "30 19 * * *",
+                "30 * * * *",
+                datetime(2021, 12, 27, 19, 30),
+            ),  # from daily to hourly with same minutes
         ]
 
         for test_case in test_cases:
             from_dag_schedule, to_dag_schedule, expected_result = test_case
 
-            execution_delta_fn = DagCreator._get_execution_date_fn(from_dag_schedule, to_dag_schedule)
+            execution_delta_fn = DagCreator._get_execution_date_fn(
+                from_dag_schedule, to_dag_schedule
+            )
             self.assertEqual(execution_delta_fn(execution_date), expected_result)
 
     def test_get_execution_delta_fn_daily_waiting_on_hourly_airflow3(self):
@@ -103,7 +362,9 @@ class TestDagCreator(unittest.TestCase):
         # an hourly upstream must target the hourly run whose logical_date is the most
         # recent tick at or before the daily run's logical_date. Pre-fix this resolved to
         # a future/nonexistent hourly tick, so the deferred sensor polled forever.
-        execution_delta_fn = DagCreator._get_execution_date_fn("0 * * * *", "45 0 * * *")
+        execution_delta_fn = DagCreator._get_execution_date_fn(
+            "0 * * * *", "45 0 * * *"
+        )
         self.assertEqual(
             execution_delta_fn(datetime(2026, 5, 27, 0, 45)),
             datetime(2026, 5, 27, 0, 0),
@@ -114,7 +375,7 @@ class TestDagCreator(unittest.TestCase):
         dags = dag_creator.traverse_graph()
 
         self.assertEqual(len(dags), 3)
-        test_spark_dag = dags['test_spark']
+        test_spark_dag = dags["test_spark"]
 
         dot = render_dag(test_spark_dag)
         self.assertEqual(dot.source, self.dot_test_spark_deactivate)
@@ -123,6 +384,6 @@ class TestDagCreator(unittest.TestCase):
         dag_creator = DagCreator(self.task_graph._graph, with_data_nodes=True)
         dags = dag_creator.traverse_graph()
 
-        test_spark_dag = dags['test_spark']
+        test_spark_dag = dags["test_spark"]
 
         self.assertEqual(test_spark_dag.schedule_interval, "30 1 * * *")
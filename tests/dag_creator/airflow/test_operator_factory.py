@@ -0,0 +1,89 @@
+import glob
+import json
+import os
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from dagger.dag_creator.airflow import operator_creators
+from dagger.dag_creator.airflow.operator_creator import OperatorCreator
+from dagger.dag_creator.airflow.operator_factory import (
+    OPERATOR_CREATOR_MODULES,
+    OperatorFactory,
+)
+
+CHECK_IMPORTS = """
+import json, sys
+import dagger.collect_dags
+from dagger.dag_creator.airflow.operator_factory import OperatorFactory
+
+imported_at_start = [module for module in {modules} if module in sys.modules]
+OperatorFactory.registry["batch"]
+imported_after_lookup = [module for module in {modules} if module in sys.modules]
+print(json.dumps([imported_at_start, imported_after_lookup]))
+"""
+
+
+class TestOperatorFactory(unittest.TestCase):
+    def test_creators_are_imported_on_first_use(self):
+        modules = [
+            "boto3",
+            "airflow.providers.amazon",
+            "dagger.dag_creator.airflow.operator_creators.batch_creator",
+            "dagger.dag_creator.airflow.operator_creators.sqoop_creator",
+        ]
+        result = subprocess.run(
+            [sys.executable, "-c", CHECK_IMPORTS.format(modules=modules)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        imported_at_start, imported_after_lookup = json.loads(
+            result.stdout.splitlines()[-1]
+        )
+
+        self.assertListEqual(imported_at_start, [])
+        self.assertIn(
+            "dagger.dag_creator.airflow.operator_creators.batch_creator",
+            imported_after_lookup,
+        )
+        self.assertNotIn(
+            "dagger.dag_creator.airflow.operator_creators.sqoop_creator",
+            imported_after_lookup,
+        )
+
+    def test_every_creator_module_is_registered(self):
+        plugins = OperatorFactory.registry.plugins
+
+        for ref_name in OPERATOR_CREATOR_MODULES:
+            self.assertTrue(issubclass(plugins[ref_name], OperatorCreator), ref_name)
+            self.assertEqual(plugins[ref_name].ref_name, ref_name)
+
+    def test_every_creator_module_is_listed(self):
+        creators_dir = os.path.dirname(operator_creators.__file__)
+        creator_modules = {
+            operator_creators.__name__
+            + "."
+            + os.path.splitext(os.path.basename(file_path))[0]
+            for file_path in glob.glob(os.path.join(creators_dir, "*_creator.py"))
+        }
+
+        self.assertSetEqual(
+            creator_modules - set(OPERATOR_CREATOR_MODULES.values()), set()
+        )
+
+    def test_unknown_task_type(self):
+        task = SimpleNamespace(ref_name="unknown_type", name="unknown_task")
+        with self.assertLogs("plugins", level="WARNING") as logs, mock.patch(
+            "dagger.dag_creator.airflow.operator_factory.dummy_creator.DummyCreator"
+        ) as dummy_creator_mock:
+            OperatorFactory().create_operator(task, dag=None)
+
+        dummy_creator_mock.assert_called_once_with(task, None)
+        self.assertIn("No operator creator for task type unknown_type", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from types import SimpleNamespace
+
+from dagger.dag_creator.graph_traverser_base import GraphTraverserBase
+from dagger.graph.task_graph import Graph, TaskGraph
+
+
+class RecordingTraverser(GraphTraverserBase):
+    def __init__(self, task_graph, with_data_nodes=False):
+        super().__init__(task_graph, with_data_nodes=with_data_nodes)
+        self.edges = []
+
+    def _create_dag(self, pipe_id, node):
+        return pipe_id
+
+    def _create_job_task(self, node):
+        return node.obj.name
+
+    def _create_data_task(self, pipe_id, node):
+        self._data_tasks.setdefault(pipe_id, set()).add(node.obj.airflow_name)
+
+    def _create_edge_without_data(self, from_task_id, to_task_ids, node):
+        self.edges.append((from_task_id, list(to_task_ids)))
+
+    def _create_edge_with_data(self, from_task_id, to_task_ids, node):
+        self.edges.append((from_task_id, list(to_task_ids)))
+
+
+def build_graph(producer_ids):
+    graph = Graph()
+    for pipeline_name in ("pipeline_a", "pipeline_b"):
+        graph.add_node(
+            TaskGraph.NODE_TYPE_PIPELINE,
+            pipeline_name,
+            obj=SimpleNamespace(name=pipeline_name),
+        )
+
+    def add_task(task_id):
+        name, pipeline_name = task_id.split(":")
+        pipeline = SimpleNamespace(name=pipeline_name, schedule="0 3 * * *")
+        graph.add_node(
+            TaskGraph.NODE_TYPE_TASK,
+            task_id,
+            name,
+            SimpleNamespace(name=name, pipeline_name=pipeline_name, pipeline=pipeline),
+        )
+
+    graph.add_node(
+        TaskGraph.NODE_TYPE_DATASET,
+        "dataset",
+        obj=SimpleNamespace(airflow_name="dataset"),
+    )
+    for producer_id in producer_ids:
+        add_task(producer_id)
+        graph.add_edge(producer_id, "dataset")
+    add_task("consumer:pipeline_b")
+    graph.add_edge("dataset", "consumer:pipeline_b")
+    return graph
+
+
+class TestGraphTraverserBase(unittest.TestCase):
+    PRODUCERS = ["writer_2:pipeline_a", "writer_1:pipeline_b", "writer_3:pipeline_a"]
+
+    def test_edges_from_every_producer(self):
+        traverser = RecordingTraverser(build_graph(self.PRODUCERS))
+        traverser.traverse_graph()
+
+        self.assertEqual(
+            traverser.edges,
+            [
+                (producer_id, ["consumer:pipeline_b"])
+                for producer_id in sorted(self.PRODUCERS)
+            ],
+        )
+
+    def test_edges_do_not_depend_on_insertion_order(self):
+        edges = []
+        for producer_ids in (self.PRODUCERS, list(reversed(self.PRODUCERS))):
+            traverser = RecordingTraverser(build_graph(producer_ids))
+            traverser.traverse_graph()
+            edges.append(traverser.edges)
+
+        self.assertEqual(edges[0], edges[1])
+
+    def test_edges_with_data(self):
+        traverser = RecordingTraverser(
+            build_graph(self.PRODUCERS), with_data_nodes=True
+        )
+        traverser.traverse_graph()
+
+        self.assertEqual(
+            traverser.edges,
+            [
+                ("writer_1:pipeline_b", ["consumer:pipeline_b"]),
+                ("writer_2:pipeline_a", []),
+                ("writer_3:pipeline_a", []),
+            ],
+        )
+        self.assertEqual(
+            traverser._data_tasks,
+            {"pipeline_a": {"dataset"}, "pipeline_b": {"dataset"}},
+        )
+
+    def test_dataset_without_producer(self):
+        traverser = RecordingTraverser(build_graph([]))
+        traverser.traverse_graph()
+
+        self.assertEqual(traverser.edges, [(None, ["consumer:pipeline_b"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
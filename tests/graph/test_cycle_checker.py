@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from dagger import conf
+from dagger.collect_dags import collect_dags
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.graph.cycle_checker import CycleChecker
+from dagger.graph.task_graph import TaskGraph
+from dagger.utilities.exceptions import DependencyCycleException
+
+
+class TestCycleChecker(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._dags_dir = os.path.join(self._tmp_dir.name, "dags")
+        shutil.copytree(conf.DAGS_DIR, self._dags_dir)
+
+        patchers = [
+            patch("dagger.conf.DAGS_DIR", self._dags_dir),
+            patch("dagger.config_finder.config_processor.DAG_DIR", self._dags_dir),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _add_batch_input(self, follow_external_dependency):
+        batch_config_path = os.path.join(self._dags_dir, "test_batch", "batch.yaml")
+        with open(batch_config_path, "r") as stream:
+            batch_config = yaml.safe_load(stream)
+        batch_config["inputs"].append(
+            {
+                "type": "dummy",
+                "name": "second_dummy_output",
+                "follow_external_dependency": follow_external_dependency,
+            }
+        )
+        with open(batch_config_path, "w") as stream:
+            yaml.safe_dump(batch_config, stream)
+
+    def _set_schedule(self, pipeline_name, schedule):
+        pipeline_config_path = os.path.join(
+            self._dags_dir, pipeline_name, "pipeline.yaml"
+        )
+        with open(pipeline_config_path, "r") as stream:
+            pipeline_config = yaml.safe_load(stream)
+        pipeline_config["schedule"] = schedule
+        with open(pipeline_config_path, "w") as stream:
+            yaml.safe_dump(pipeline_config, stream)
+
+    def _cycle_checker(self):
+        task_graph = TaskGraph()
+        task_graph.add_pipelines(
+            ConfigProcessor(ConfigFinder(self._dags_dir)).iter_pipelines()
+        )
+        return CycleChecker(task_graph)
+
+    def test_no_cycles(self):
+        cycle_checker = self._cycle_checker()
+
+        self.assertListEqual(cycle_checker.cycles, [])
+        self.assertEqual(cycle_checker.task_levels["batch:test_batch"], 0)
+        self.assertEqual(
+            cycle_checker.task_levels["dummy_first:test_external_sensor"], 1
+        )
+        self.assertEqual(
+            cycle_checker.task_levels["dummy_second:test_external_sensor"], 2
+        )
+        self.assertEqual(cycle_checker.task_levels["spark:test_spark"], 0)
+
+    def test_cycle_across_pipelines(self):
+        self._add_batch_input(follow_external_dependency=True)
+        cycle_checker = self._cycle_checker()
+
+        self.assertListEqual(
+            cycle_checker.cycles,
+            [
+                [
+                    "batch:test_batch",
+                    "redshift://dwh/batch_table",
+                    "dummy_first:test_external_sensor",
+                    "dummy://first_dummy_output",
+                    "dummy_second:test_external_sensor",
+                    "dummy://second_dummy_output",
+                    "batch:test_batch",
+                ]
+            ],
+        )
+        self.assertIn(
+            os.path.join(self._dags_dir, "test_external_sensor", "dummy_first.yaml"),
+            cycle_checker.describe_cycles(),
+        )
+        task_levels = cycle_checker.task_levels
+        self.assertEqual(
+            task_levels["batch:test_batch"],
+            task_levels["dummy_second:test_external_sensor"],
+        )
+
+    def test_unfollowed_external_dependency_is_not_a_cycle(self):
+        self._add_batch_input(follow_external_dependency=False)
+
+        self.assertListEqual(self._cycle_checker().cycles, [])
+
+    def test_schedule_preset_is_not_a_cycle(self):
+        self._add_batch_input(follow_external_dependency=True)
+        for schedule in ("@once", "@daily"):
+            self._set_schedule("test_external_sensor", schedule)
+            cycle_checker = self._cycle_checker()
+
+            self.assertListEqual(cycle_checker.cycles, [])
+            # The tasks of the same pipeline still depend on each other
+            self.assertEqual(
+                cycle_checker.task_levels["dummy_first:test_external_sensor"], 0
+            )
+            self.assertEqual(
+                cycle_checker.task_levels["dummy_second:test_external_sensor"], 1
+            )
+
+    def test_collect_dags_fails_on_cycles(self):
+        self._add_batch_input(follow_external_dependency=True)
+
+        with patch("dagger.conf.GRAPH_CHECK_CYCLES", "fail"):
+            self.assertRaises(DependencyCycleException, collect_dags)
+        with patch("dagger.conf.GRAPH_CHECK_CYCLES", "warn"), patch(
+            "dagger.collect_dags._logger"
+        ) as logger_mock:
+            collect_dags()
+            logger_mock.error.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
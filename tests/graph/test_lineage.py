@@ -0,0 +1,118 @@
+import unittest
+from datetime import datetime
+
+from dagger import conf
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.graph.lineage import GraphLineage
+from dagger.graph.task_graph import TaskGraph
+
+
+class TestGraphLineage(unittest.TestCase):
+    def setUp(self):
+        task_graph = TaskGraph()
+        task_graph.add_pipelines(
+            ConfigProcessor(ConfigFinder(conf.DAGS_DIR)).iter_pipelines()
+        )
+        self.lineage = GraphLineage(task_graph)
+
+    def test_descendants(self):
+        self.assertListEqual(
+            self.lineage.descendants(
+                "batch:test_batch", node_type=TaskGraph.NODE_TYPE_TASK
+            ),
+            ["dummy_first:test_external_sensor", "dummy_second:test_external_sensor"],
+        )
+        self.assertIn(
+            "redshift://dwh/batch_table", self.lineage.descendants("batch:test_batch")
+        )
+        self.assertListEqual(
+            self.lineage.descendants(
+                "dummy_second:test_external_sensor", node_type=TaskGraph.NODE_TYPE_TASK
+            ),
+            [],
+        )
+
+    def test_ancestors(self):
+        ancestors = self.lineage.ancestors("dummy_second:test_external_sensor")
+        self.assertIn("batch:test_batch", ancestors)
+        self.assertIn("dummy_first:test_external_sensor", ancestors)
+        self.assertNotIn("test_batch", ancestors)
+
+        self.assertTrue(
+            self.lineage.depends_on(
+                "dummy_second:test_external_sensor", "batch:test_batch"
+            )
+        )
+        self.assertFalse(
+            self.lineage.depends_on(
+                "batch:test_batch", "dummy_second:test_external_sensor"
+            )
+        )
+        self.assertRaises(KeyError, self.lineage.ancestors, "unknown:pipeline")
+
+    def test_memoized_closures(self):
+        first_result = self.lineage.descendants("redshift://dwh/batch_table")
+        self.assertIn(
+            self.lineage._index["redshift://dwh/batch_table"], self.lineage._descendants
+        )
+        self.assertListEqual(
+            self.lineage.descendants("redshift://dwh/batch_table"), first_result
+        )
+
+    def test_bounded_closure_cache(self):
+        task_graph = TaskGraph()
+        task_graph.add_pipelines(
+            ConfigProcessor(ConfigFinder(conf.DAGS_DIR)).iter_pipelines()
+        )
+        lineage = GraphLineage(task_graph, max_cached_closures=2)
+
+        for node_id in lineage._ids:
+            self.assertListEqual(
+                lineage.descendants(node_id), self.lineage.descendants(node_id)
+            )
+            self.assertListEqual(
+                lineage.ancestors(node_id), self.lineage.ancestors(node_id)
+            )
+            self.assertLessEqual(len(lineage._descendants), 2)
+            self.assertLessEqual(len(lineage._ancestors), 2)
+
+        lineage.descendants(lineage._ids[0])
+        self.assertEqual(next(reversed(lineage._descendants)), 0)
+
+    def test_shortest_path(self):
+        self.assertListEqual(
+            self.lineage.shortest_path(
+                "batch:test_batch", "dummy_first:test_external_sensor"
+            ),
+            [
+                "batch:test_batch",
+                "redshift://dwh/batch_table",
+                "dummy_first:test_external_sensor",
+            ],
+        )
+        self.assertIsNone(
+            self.lineage.shortest_path(
+                "dummy_first:test_external_sensor", "batch:test_batch"
+            )
+        )
+
+    def test_critical_path(self):
+        path = self.lineage.critical_path(
+            "dummy_second:test_external_sensor", logical_date=datetime(2024, 1, 2, 5)
+        )
+        task_ids = [task_id for task_id, _ in path]
+
+        self.assertListEqual(
+            task_ids,
+            [
+                "dummy_second:test_external_sensor",
+                "dummy_first:test_external_sensor",
+                "batch:test_batch",
+            ],
+        )
+        self.assertEqual(path[-1][1], datetime(2024, 1, 2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
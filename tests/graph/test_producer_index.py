@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dagger import conf
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.graph.producer_index import DatasetProducerIndex
+from dagger.graph.task_graph import TaskGraph
+
+
+class TestDatasetProducerIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._index_path = os.path.join(self._tmp_dir.name, "producer_index.json")
+        self._config_finder = ConfigFinder(conf.DAGS_DIR)
+        self._config_processor = ConfigProcessor(self._config_finder)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _build_index(self):
+        index = DatasetProducerIndex.load(self._index_path, conf.ENV)
+        index.update(self._config_finder.find_configs(), self._config_processor)
+        return index
+
+    def test_get_producers(self):
+        producers = self._build_index().get_producers("redshift://dwh/batch_table")
+
+        self.assertEqual(len(producers), 1)
+        self.assertEqual(producers[0].uniq_name, "batch:test_batch")
+        self.assertEqual(producers[0].pipeline.schedule, "0 3 * * *")
+        self.assertListEqual(
+            self._build_index().get_producers("redshift://dwh/unknown"), []
+        )
+
+    def test_only_changed_pipelines_are_rescanned(self):
+        self._build_index().save(self._index_path)
+
+        with patch.object(DatasetProducerIndex, "_scan_pipeline") as scan_mock:
+            index = self._build_index()
+            scan_mock.assert_not_called()
+        self.assertEqual(len(index.get_producers("redshift://dwh/batch_table")), 1)
+
+    def test_index_of_other_env_is_ignored(self):
+        self._build_index().save(self._index_path)
+
+        index = DatasetProducerIndex.load(self._index_path, "other_env")
+        self.assertListEqual(index.get_producers("redshift://dwh/batch_table"), [])
+
+    def test_add_upstream_tasks(self):
+        pipeline_config = next(
+            pipeline_config
+            for pipeline_config in self._config_finder.find_configs()
+            if ConfigProcessor.get_pipeline_name(pipeline_config)
+            == "test_external_sensor"
+        )
+        task_graph = TaskGraph()
+        task_graph.add_pipeline(
+            self._config_processor.process_pipeline_config(pipeline_config)
+        )
+
+        self._build_index().add_upstream_tasks(task_graph)
+
+        upstream_node = task_graph._graph.get_node("batch:test_batch")
+        self.assertIsNotNone(upstream_node)
+        self.assertEqual(upstream_node.obj.pipeline_name, "test_batch")
+        self.assertIn("redshift://dwh/batch_table", upstream_node.children)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from airflow.utils.dot_renderer import render_dag
+
+from dagger import conf
+from dagger.cli.compile import _compile
+from dagger.collect_dags import collect_dags
+from dagger.graph.snapshot import SNAPSHOT_FORMAT_VERSION, read_snapshot
+from dagger.utilities.exceptions import InvalidSnapshotException
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._snapshot_path = os.path.join(self._tmp_dir.name, "dagger.snapshot")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_roundtrip(self):
+        task_graph = _compile(conf.DAGS_DIR, self._snapshot_path)
+        loaded_graph = read_snapshot(self._snapshot_path)
+
+        for node_type in [
+            task_graph.NODE_TYPE_PIPELINE,
+            task_graph.NODE_TYPE_TASK,
+            task_graph.NODE_TYPE_DATASET,
+        ]:
+            self.assertListEqual(
+                sorted(loaded_graph._graph.get_nodes(node_type).keys()),
+                sorted(task_graph._graph.get_nodes(node_type).keys()),
+            )
+        edge = loaded_graph._graph.get_edge(
+            "redshift://dwh/batch_table", "dummy_first:test_external_sensor"
+        )
+        self.assertDictEqual(edge.follow_external_dependency, {"poke_interval": 60})
+
+    def test_collect_dags_from_snapshot(self):
+        _compile(conf.DAGS_DIR, self._snapshot_path)
+
+        with patch("dagger.collect_dags.ConfigProcessor") as config_processor_mock:
+            dags = collect_dags(snapshot=self._snapshot_path)
+            config_processor_mock.assert_not_called()
+
+        with open(
+            "tests/fixtures/dag_creator/airflow/dag_test_external_sensor.dot", "r"
+        ) as stream:
+            expected_dot = stream.read()
+        self.assertEqual(len(dags), 3)
+        self.assertEqual(render_dag(dags["test_external_sensor"]).source, expected_dot)
+
+    def test_invalid_snapshots(self):
+        _compile(conf.DAGS_DIR, self._snapshot_path)
+        with patch("dagger.conf.ENV", "other_env"):
+            self.assertRaises(
+                InvalidSnapshotException, read_snapshot, self._snapshot_path
+            )
+
+        with patch(
+            "dagger.graph.snapshot.code_fingerprint", return_value="changed classes"
+        ):
+            self.assertRaisesRegex(
+                InvalidSnapshotException,
+                "other dagger sources",
+                read_snapshot,
+                self._snapshot_path,
+            )
+
+        with open(self._snapshot_path, "wb") as stream:
+            pickle.dump({"format_version": SNAPSHOT_FORMAT_VERSION + 1}, stream)
+        self.assertRaises(InvalidSnapshotException, read_snapshot, self._snapshot_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,17 @@
 import unittest
+import json
 import os
+import pickle
+import tempfile
 import yaml
 from io import StringIO
 from contextlib import redirect_stdout
 
 from dagger.graph import task_graph
 from dagger.utilities.exceptions import IdAlreadyExistsException
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.dag_creator.airflow.dag_creator import DagCreator
 from dagger.pipeline.ios.dummy_io import DummyIO
 from dagger.pipeline.tasks.dummy_task import DummyTask
 from dagger.pipeline.pipeline import Pipeline
@@ -14,7 +20,9 @@ from dagger import conf
 
 class TestGraph(unittest.TestCase):
     def setUp(self):
-        os.environ["AIRFLOW_HOME"] = '/Users/david/mygit/dagger/tests/fixtures/config_finder/root/'
+        os.environ[
+            "AIRFLOW_HOME"
+        ] = "/Users/david/mygit/dagger/tests/fixtures/config_finder/root/"
 
     def test_add_node(self):
         graph = task_graph.Graph()
@@ -57,28 +65,28 @@ class TestGraph(unittest.TestCase):
 
 class TestTaskGraph(unittest.TestCase):
     def setUp(self):
-        with open('tests/fixtures/graph/dummy_input.yaml', "r") as stream:
+        with open("tests/fixtures/graph/dummy_input.yaml", "r") as stream:
             config = yaml.safe_load(stream)
 
         self.dummy_input = DummyIO(config, conf.DAGS_DIR)
 
-        with open('tests/fixtures/graph/dummy_output.yaml', "r") as stream:
+        with open("tests/fixtures/graph/dummy_output.yaml", "r") as stream:
             config = yaml.safe_load(stream)
 
         self.dummy_output = DummyIO(config, conf.DAGS_DIR)
 
-        with open('tests/fixtures/graph/pipeline.yaml', "r") as stream:
+        with open("tests/fixtures/graph/pipeline.yaml", "r") as stream:
             config = yaml.safe_load(stream)
 
         self.pipeline = Pipeline(os.path.join(conf.DAGS_DIR, "test_pipeline"), config)
 
-        with open('tests/fixtures/graph/dummy_task.yaml', "r") as stream:
+        with open("tests/fixtures/graph/dummy_task.yaml", "r") as stream:
             config = yaml.safe_load(stream)
 
         self.dummy_task = DummyTask("dummy_task", "pipeline", self.pipeline, config)
         self.pipeline.add_task(self.dummy_task)
 
-        with open('tests/fixtures/graph/graph.txt', "r") as stream:
+        with open("tests/fixtures/graph/graph.txt", "r") as stream:
             self.graph_str = stream.read()
 
     def test_add_dataset(self):
@@ -86,13 +94,20 @@ class TestTaskGraph(unittest.TestCase):
 
         graph.add_dataset(self.dummy_input)
         self.assertEqual(len(graph._graph._nodes), 1)
-        self.assertEqual(graph._graph.get_node("dummy://test_dummy_input")._node_id, "dummy://test_dummy_input")
         self.assertEqual(
-            graph._graph.get_nodes(graph.NODE_TYPE_DATASET).get("dummy://test_dummy_input")._node_id,
-            "dummy://test_dummy_input"
+            graph._graph.get_node("dummy://test_dummy_input")._node_id,
+            "dummy://test_dummy_input",
+        )
+        self.assertEqual(
+            graph._graph.get_nodes(graph.NODE_TYPE_DATASET)
+            .get("dummy://test_dummy_input")
+            ._node_id,
+            "dummy://test_dummy_input",
         )
         self.assertEqual(graph._graph.get_nodes(graph.NODE_TYPE_TASK), None)
-        self.assertEqual(graph._graph.get_type("dummy://test_dummy_input"), graph.NODE_TYPE_DATASET)
+        self.assertEqual(
+            graph._graph.get_type("dummy://test_dummy_input"), graph.NODE_TYPE_DATASET
+        )
         self.assertEqual(graph._graph.get_type("dummy://test_dummy_output"), None)
 
         graph.add_dataset(self.dummy_output)
@@ -100,18 +115,32 @@ class TestTaskGraph(unittest.TestCase):
         self.assertEqual(graph._graph.get_nodes(graph.NODE_TYPE_PIPELINE), None)
         self.assertEqual(graph._graph.get_nodes(graph.NODE_TYPE_TASK), None)
         self.assertEqual(len(graph._graph.get_nodes(graph.NODE_TYPE_DATASET)), 2)
-        self.assertEqual(graph._graph.get_node("dummy://test_dummy_output")._node_id, "dummy://test_dummy_output")
-        self.assertEqual(graph._graph.get_node("dummy://test_dummy_input")._node_id, "dummy://test_dummy_input")
         self.assertEqual(
-            graph._graph.get_nodes(graph.NODE_TYPE_DATASET).get("dummy://test_dummy_input")._node_id,
-            "dummy://test_dummy_input"
+            graph._graph.get_node("dummy://test_dummy_output")._node_id,
+            "dummy://test_dummy_output",
         )
         self.assertEqual(
-            graph._graph.get_nodes(graph.NODE_TYPE_DATASET).get("dummy://test_dummy_output")._node_id,
-            "dummy://test_dummy_output"
+            graph._graph.get_node("dummy://test_dummy_input")._node_id,
+            "dummy://test_dummy_input",
+        )
+        self.assertEqual(
+            graph._graph.get_nodes(graph.NODE_TYPE_DATASET)
+            .get("dummy://test_dummy_input")
+            ._node_id,
+            "dummy://test_dummy_input",
+        )
+        self.assertEqual(
+            graph._graph.get_nodes(graph.NODE_TYPE_DATASET)
+            .get("dummy://test_dummy_output")
+            ._node_id,
+            "dummy://test_dummy_output",
+        )
+        self.assertEqual(
+            graph._graph.get_type("dummy://test_dummy_input"), graph.NODE_TYPE_DATASET
+        )
+        self.assertEqual(
+            graph._graph.get_type("dummy://test_dummy_output"), graph.NODE_TYPE_DATASET
         )
-        self.assertEqual(graph._graph.get_type("dummy://test_dummy_input"), graph.NODE_TYPE_DATASET)
-        self.assertEqual(graph._graph.get_type("dummy://test_dummy_output"), graph.NODE_TYPE_DATASET)
 
     def test_add_task(self):
         graph = task_graph.TaskGraph()
@@ -120,18 +149,42 @@ class TestTaskGraph(unittest.TestCase):
         self.assertEqual(graph._graph.get_nodes(graph.NODE_TYPE_PIPELINE), None)
         self.assertEqual(len(graph._graph.get_nodes(graph.NODE_TYPE_DATASET)), 2)
         self.assertEqual(len(graph._graph.get_nodes(graph.NODE_TYPE_TASK)), 1)
-        self.assertEqual(graph._graph.get_node("dummy://dummy_input")._node_id, "dummy://dummy_input")
-        self.assertEqual(graph._graph.get_node("dummy://dummy_output")._node_id, "dummy://dummy_output")
-        self.assertEqual(graph._graph.get_node("dummy_task:pipeline")._node_id, "dummy_task:pipeline")
+        self.assertEqual(
+            graph._graph.get_node("dummy://dummy_input")._node_id, "dummy://dummy_input"
+        )
+        self.assertEqual(
+            graph._graph.get_node("dummy://dummy_output")._node_id,
+            "dummy://dummy_output",
+        )
+        self.assertEqual(
+            graph._graph.get_node("dummy_task:pipeline")._node_id, "dummy_task:pipeline"
+        )
 
-        self.assertIn("dummy://dummy_output", graph._graph.get_node("dummy_task:pipeline")._children)
-        self.assertIn("dummy_task:pipeline", graph._graph.get_node("dummy://dummy_output")._parents)
+        self.assertIn(
+            "dummy://dummy_output",
+            graph._graph.get_node("dummy_task:pipeline")._children,
+        )
+        self.assertIn(
+            "dummy_task:pipeline",
+            graph._graph.get_node("dummy://dummy_output")._parents,
+        )
 
-        self.assertIn("dummy://dummy_input", graph._graph.get_node("dummy_task:pipeline")._parents)
-        self.assertIn("dummy_task:pipeline", graph._graph.get_node("dummy://dummy_input")._children)
+        self.assertIn(
+            "dummy://dummy_input", graph._graph.get_node("dummy_task:pipeline")._parents
+        )
+        self.assertIn(
+            "dummy_task:pipeline",
+            graph._graph.get_node("dummy://dummy_input")._children,
+        )
 
-        self.assertNotIn("dummy://dummy_input", graph._graph.get_node("dummy_task:pipeline")._children)
-        self.assertNotIn("dummy://dummy_output", graph._graph.get_node("dummy_task:pipeline")._parents)
+        self.assertNotIn(
+            "dummy://dummy_input",
+            graph._graph.get_node("dummy_task:pipeline")._children,
+        )
+        self.assertNotIn(
+            "dummy://dummy_output",
+            graph._graph.get_node("dummy_task:pipeline")._parents,
+        )
 
     def test_add_pipeline(self):
         graph = task_graph.TaskGraph()
@@ -140,21 +193,49 @@ class TestTaskGraph(unittest.TestCase):
         self.assertEqual(len(graph._graph.get_nodes(graph.NODE_TYPE_PIPELINE)), 1)
         self.assertEqual(len(graph._graph.get_nodes(graph.NODE_TYPE_DATASET)), 2)
         self.assertEqual(len(graph._graph.get_nodes(graph.NODE_TYPE_TASK)), 1)
-        self.assertEqual(graph._graph.get_node("test_pipeline")._node_id, "test_pipeline")
-        self.assertEqual(graph._graph.get_node("dummy://dummy_input")._node_id, "dummy://dummy_input")
-        self.assertEqual(graph._graph.get_node("dummy://dummy_output")._node_id, "dummy://dummy_output")
+        self.assertEqual(
+            graph._graph.get_node("test_pipeline")._node_id, "test_pipeline"
+        )
+        self.assertEqual(
+            graph._graph.get_node("dummy://dummy_input")._node_id, "dummy://dummy_input"
+        )
+        self.assertEqual(
+            graph._graph.get_node("dummy://dummy_output")._node_id,
+            "dummy://dummy_output",
+        )
 
-        self.assertIn("dummy://dummy_output", graph._graph.get_node("dummy_task:pipeline")._children)
-        self.assertIn("dummy_task:pipeline", graph._graph.get_node("dummy://dummy_output")._parents)
+        self.assertIn(
+            "dummy://dummy_output",
+            graph._graph.get_node("dummy_task:pipeline")._children,
+        )
+        self.assertIn(
+            "dummy_task:pipeline",
+            graph._graph.get_node("dummy://dummy_output")._parents,
+        )
 
-        self.assertIn("dummy://dummy_input", graph._graph.get_node("dummy_task:pipeline")._parents)
-        self.assertIn("dummy_task:pipeline", graph._graph.get_node("dummy://dummy_input")._children)
+        self.assertIn(
+            "dummy://dummy_input", graph._graph.get_node("dummy_task:pipeline")._parents
+        )
+        self.assertIn(
+            "dummy_task:pipeline",
+            graph._graph.get_node("dummy://dummy_input")._children,
+        )
 
-        self.assertNotIn("dummy://dummy_input", graph._graph.get_node("dummy_task:pipeline")._children)
-        self.assertNotIn("dummy://dummy_output", graph._graph.get_node("dummy_task:pipeline")._parents)
+        self.assertNotIn(
+            "dummy://dummy_input",
+            graph._graph.get_node("dummy_task:pipeline")._children,
+        )
+        self.assertNotIn(
+            "dummy://dummy_output",
+            graph._graph.get_node("dummy_task:pipeline")._parents,
+        )
 
-        self.assertIn("test_pipeline", graph._graph.get_node("dummy_task:pipeline")._parents)
-        self.assertIn("dummy_task:pipeline", graph._graph.get_node("test_pipeline")._children)
+        self.assertIn(
+            "test_pipeline", graph._graph.get_node("dummy_task:pipeline")._parents
+        )
+        self.assertIn(
+            "dummy_task:pipeline", graph._graph.get_node("test_pipeline")._children
+        )
 
     def test_print_graph(self):
         graph = task_graph.TaskGraph()
@@ -168,3 +249,122 @@ class TestTaskGraph(unittest.TestCase):
             result = stdout_buffer.getvalue()
 
         self.assertEqual(result, self.graph_str)
+
+    def test_print_graph_formats(self):
+        graph = task_graph.TaskGraph()
+        graph.add_pipeline(self.pipeline)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            outputs = {}
+            for output_format in task_graph.GRAPH_OUTPUT_FORMATS:
+                out_file = os.path.join(tmp_dir, f"graph.{output_format}")
+                graph.print_graph(out_file=out_file, output_format=output_format)
+                with open(out_file, "r") as stream:
+                    outputs[output_format] = stream.read()
+
+        self.assertEqual(outputs["text"], self.graph_str)
+
+        records = [json.loads(line) for line in outputs["jsonl"].splitlines()]
+        self.assertIn(
+            {
+                "kind": "node",
+                "type": "task",
+                "id": "dummy_task:pipeline",
+                "name": "dummy_task",
+                "pipeline": "pipeline",
+            },
+            records,
+        )
+        self.assertIn(
+            {
+                "kind": "edge",
+                "from": "dummy://dummy_input",
+                "to": "dummy_task:pipeline",
+            },
+            records,
+        )
+
+        self.assertTrue(outputs["dot"].startswith("digraph dagger {"))
+        self.assertIn(
+            '    "dummy_task:pipeline" -> "dummy://dummy_output";', outputs["dot"]
+        )
+
+        self.assertIn(
+            "dummy_task:pipeline\tdummy://dummy_output",
+            outputs["adjacency"].splitlines(),
+        )
+
+        self.assertRaises(ValueError, graph.print_graph, output_format="yaml")
+
+
+class TestCompactGraph(unittest.TestCase):
+    def setUp(self):
+        self.task_graph = task_graph.TaskGraph()
+        self.task_graph.add_pipelines(
+            ConfigProcessor(ConfigFinder(conf.DAGS_DIR)).iter_pipelines()
+        )
+        self.graph = self.task_graph._graph
+
+    def _adjacency(self):
+        return {
+            node_id: (set(node.parents), set(node.children))
+            for nodes in self.graph._nodes.values()
+            for node_id, node in nodes.items()
+        }
+
+    def test_compact_keeps_adjacency(self):
+        adjacency = self._adjacency()
+        self.task_graph.compact()
+
+        self.assertDictEqual(self._adjacency(), adjacency)
+        self.assertIsNone(self.graph.get_node("batch:test_batch")._children)
+
+        edge = self.graph.get_edge(
+            "redshift://dwh/batch_table", "dummy_first:test_external_sensor"
+        )
+        self.assertEqual(edge.follow_external_dependency, {"poke_interval": 60})
+        plain_edge = self.graph.get_edge(
+            "batch:test_batch", "redshift://dwh/batch_table"
+        )
+        self.assertIsNone(plain_edge.follow_external_dependency)
+        self.assertIsNone(
+            self.graph.get_edge("redshift://dwh/batch_table", "batch:test_batch")
+        )
+
+    def test_modifying_compact_graph(self):
+        self.task_graph.compact()
+        self.graph.add_node(self.task_graph.NODE_TYPE_DATASET, "dummy://new_output")
+        self.graph.add_edge("batch:test_batch", "dummy://new_output")
+        self.task_graph.remove_pipeline("test_spark")
+
+        self.assertIn(
+            "dummy://new_output", self.graph.get_node("batch:test_batch").children
+        )
+        self.assertIn(
+            "redshift://dwh/batch_table",
+            self.graph.get_node("batch:test_batch").children,
+        )
+        self.assertIsNone(self.graph.get_node("test_spark"))
+        self.assertIsNotNone(
+            self.graph.get_edge("batch:test_batch", "dummy://new_output")
+        )
+
+    def test_dags_of_compact_graph(self):
+        dags = DagCreator(self.graph).traverse_graph()
+        self.task_graph.compact()
+        compact_dags = DagCreator(
+            pickle.loads(pickle.dumps(self.graph))
+        ).traverse_graph()
+
+        self.assertListEqual(sorted(compact_dags.keys()), sorted(dags.keys()))
+        for dag_id, dag in dags.items():
+            self.assertDictEqual(
+                {
+                    task_id: task.downstream_task_ids
+                    for task_id, task in compact_dags[dag_id].task_dict.items()
+                },
+                {
+                    task_id: task.downstream_task_ids
+                    for task_id, task in dag.task_dict.items()
+                },
+            )
@@ -1,8 +1,11 @@
 import unittest
+from datetime import timedelta
 
 from dagger import conf
 from dagger.config_finder.config_finder import ConfigFinder
 from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.pipeline.task import Task
+from dagger.utilities.exceptions import InvalidExpressionException
 
 
 class TestConfigProcessor(unittest.TestCase):
@@ -32,3 +35,22 @@ class TestConfigProcessor(unittest.TestCase):
                     batch_task = task
 
         self.assertEqual(batch_task.outputs[2].bucket, "cholocal-test")
+
+    def test_render_parameters(self):
+        params = {
+            "execution_timeout": "{{ dagger.python(datetime.timedelta(hours=1)) }}",
+            "retries": "{{dagger.python(2 * 3)}}",
+            "pool": "default",
+        }
+        Task._render_parameters(params)
+
+        self.assertDictEqual(
+            params,
+            {"execution_timeout": timedelta(hours=1), "retries": 6, "pool": "default"},
+        )
+        with self.assertRaises(InvalidExpressionException):
+            Task._render_parameter("{{ dagger.python(__import__('os').getcwd()) }}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from dagger import conf
+from dagger.collect_dags import IncrementalDagCollector, collect_dags
+from dagger.config_finder.config_finder import ConfigFinder
+from dagger.config_finder.config_processor import ConfigProcessor
+from dagger.graph.producer_index import DatasetProducerIndex
+from dagger.utilities.exceptions import InvalidProducerIndexException
+
+
+class TestIncrementalDagCollector(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._dags_dir = os.path.join(self._tmp_dir.name, "dags")
+        shutil.copytree(conf.DAGS_DIR, self._dags_dir)
+
+        patchers = [
+            patch("dagger.conf.DAGS_DIR", self._dags_dir),
+            patch("dagger.config_finder.config_processor.DAG_DIR", self._dags_dir),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _touch(self, *path):
+        file_path = os.path.join(self._dags_dir, *path)
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_unchanged_pipelines_are_reused(self):
+        collector = IncrementalDagCollector(self._dags_dir)
+        dags = collector.collect()
+        self.assertSetEqual(
+            set(dags.keys()), {"test_batch", "test_external_sensor", "test_spark"}
+        )
+
+        with patch("dagger.collect_dags.DagCreator") as dag_creator_mock:
+            next_dags = collector.collect()
+            dag_creator_mock.assert_not_called()
+
+        for pipeline_name, dag in dags.items():
+            self.assertIs(next_dags[pipeline_name], dag)
+
+    def test_changed_pipeline_and_dependents_are_rebuilt(self):
+        collector = IncrementalDagCollector(self._dags_dir)
+        dags = collector.collect()
+
+        self._touch("test_batch", "batch.yaml")
+        next_dags = collector.collect()
+
+        self.assertIsNot(next_dags["test_batch"], dags["test_batch"])
+        self.assertIsNot(
+            next_dags["test_external_sensor"], dags["test_external_sensor"]
+        )
+        self.assertIs(next_dags["test_spark"], dags["test_spark"])
+        self.assertIn(
+            "test_batch-batch-sensor", next_dags["test_external_sensor"].task_ids
+        )
+
+    def test_removed_pipeline(self):
+        collector = IncrementalDagCollector(self._dags_dir)
+        collector.collect()
+
+        shutil.rmtree(os.path.join(self._dags_dir, "test_batch"))
+        dags = collector.collect()
+
+        self.assertSetEqual(set(dags.keys()), {"test_external_sensor", "test_spark"})
+        self.assertNotIn(
+            "test_batch-batch-sensor", dags["test_external_sensor"].task_ids
+        )
+        self.assertIsNone(collector.task_graph._graph.get_node("batch:test_batch"))
+        self.assertIsNotNone(
+            collector.task_graph._graph.get_node("redshift://dwh/batch_table")
+        )
+        self.assertIsNone(
+            collector.task_graph._graph.get_node("s3:///datalake/path/{{ds}}")
+        )
+
+    def test_file_removed_after_discovery(self):
+        collector = IncrementalDagCollector(self._dags_dir)
+        collector.collect()
+
+        find_configs = collector._config_finder.find_configs
+
+        def find_configs_then_remove_file():
+            pipeline_configs = find_configs()
+            os.remove(os.path.join(self._dags_dir, "test_batch", "batch.yaml"))
+            return pipeline_configs
+
+        with patch.object(
+            collector._config_finder,
+            "find_configs",
+            side_effect=find_configs_then_remove_file,
+        ):
+            dags = collector.collect()
+
+        self.assertSetEqual(set(dags.keys()), {"test_external_sensor", "test_spark"})
+        self.assertNotIn(
+            "test_batch-batch-sensor", dags["test_external_sensor"].task_ids
+        )
+
+    def test_config_failing_to_parse(self):
+        collector = IncrementalDagCollector(self._dags_dir)
+        dags = collector.collect()
+
+        spark_config_path = os.path.join(self._dags_dir, "test_spark", "spark.yaml")
+        with open(spark_config_path, "r") as stream:
+            spark_config = stream.read()
+        self._touch("test_batch", "batch.yaml")
+        with open(spark_config_path, "a") as stream:
+            stream.write("\n: [unclosed\n")
+        self.assertRaises(yaml.YAMLError, collector.collect)
+
+        self.assertIsNotNone(collector.task_graph._graph.get_node("batch:test_batch"))
+        with open(spark_config_path, "w") as stream:
+            stream.write(spark_config)
+        self._touch("test_spark", "spark.yaml")
+        next_dags = collector.collect()
+
+        self.assertSetEqual(
+            set(next_dags.keys()), {"test_batch", "test_external_sensor", "test_spark"}
+        )
+        self.assertIsNot(next_dags["test_batch"], dags["test_batch"])
+        self.assertIn(
+            "test_batch-batch-sensor", next_dags["test_external_sensor"].task_ids
+        )
+
+
+class TestCollectDags(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._index_path = os.path.join(self._tmp_dir.name, "producer_index.json")
+        patcher = patch("dagger.conf.PRODUCER_INDEX_PATH", self._index_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_producer_index(self):
+        config_finder = ConfigFinder(conf.DAGS_DIR)
+        producer_index = DatasetProducerIndex.load(self._index_path, conf.ENV)
+        producer_index.update(
+            config_finder.find_configs(), ConfigProcessor(config_finder)
+        )
+        producer_index.save(self._index_path)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_only_pipelines(self):
+        self._write_producer_index()
+        index_mtime = os.stat(self._index_path).st_mtime_ns
+
+        with patch.object(ConfigFinder, "iter_configs") as iter_configs_mock, patch(
+            "dagger.collect_dags.ConfigProcessor.process_pipeline_config",
+            autospec=True,
+            side_effect=ConfigProcessor.process_pipeline_config,
+        ) as process_mock:
+            dags = collect_dags(only_pipelines=["test_external_sensor"])
+
+        processed_pipelines = [
+            ConfigProcessor.get_pipeline_name(call.args[1])
+            for call in process_mock.call_args_list
+        ]
+        self.assertListEqual(processed_pipelines, ["test_external_sensor"])
+        iter_configs_mock.assert_not_called()
+        self.assertEqual(os.stat(self._index_path).st_mtime_ns, index_mtime)
+
+        self.assertListEqual(list(dags.keys()), ["test_external_sensor"])
+        sensor = dags["test_external_sensor"].get_task("test_batch-batch-sensor")
+        self.assertEqual(sensor.external_dag_id, "test_batch")
+        self.assertEqual(sensor.external_task_id, "batch")
+
+    def test_only_pipelines_without_producer_index(self):
+        with self.assertRaises(InvalidProducerIndexException):
+            collect_dags(only_pipelines=["test_external_sensor"])
+        self.assertFalse(os.path.exists(self._index_path))
+
+    def test_only_pipelines_with_stale_producer_index(self):
+        dags_dir = os.path.join(self._tmp_dir.name, "dags")
+        shutil.copytree(conf.DAGS_DIR, dags_dir)
+        with patch("dagger.conf.DAGS_DIR", dags_dir), patch(
+            "dagger.config_finder.config_processor.DAG_DIR", dags_dir
+        ):
+            self._write_producer_index()
+            dummy_first_path = os.path.join(
+                dags_dir, "test_external_sensor", "dummy_first.yaml"
+            )
+            stat = os.stat(dummy_first_path)
+            os.utime(
+                dummy_first_path,
+                ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+            )
+            with self.assertNoLogs("graph", level="WARNING"):
+                collect_dags(only_pipelines=["test_external_sensor"])
+
+            os.remove(
+                os.path.join(dags_dir, "test_external_sensor", "dummy_second.yaml")
+            )
+            with self.assertLogs("graph", level="WARNING") as logs:
+                dags = collect_dags(only_pipelines=["test_external_sensor"])
+
+        self.assertIn(
+            "Config files of pipeline test_external_sensor changed",
+            "\n".join(logs.output),
+        )
+        self.assertListEqual(
+            sorted(dags["test_external_sensor"].task_ids),
+            sorted(["dummy-control-flow", "dummy_first", "test_batch-batch-sensor"]),
+        )
+
+    def test_only_pipelines_sensors_match_full_collection(self):
+        dags_dir = os.path.join(
+            os.path.dirname(__file__), "fixtures", "graph", "producer_index", "dags"
+        )
+        with patch("dagger.conf.DAGS_DIR", dags_dir), patch(
+            "dagger.config_finder.config_processor.DAG_DIR", dags_dir
+        ):
+            self._write_producer_index()
+            dags = collect_dags()
+            consumer_dag = collect_dags(only_pipelines=["test_consumer"])[
+                "test_consumer"
+            ]
+
+        def sensors(dag):
+            return {task_id for task_id in dag.task_ids if task_id.endswith("-sensor")}
+
+        # The s3 output of the athena transform is added by the task class, it isn't
+        # part of the config
+        self.assertSetEqual(
+            sensors(dags["test_consumer"]), {"test_athena-transform-sensor"}
+        )
+        self.assertSetEqual(sensors(consumer_dag), sensors(dags["test_consumer"]))
+
+    def test_incremental_snapshot(self):
+        with self.assertRaises(ValueError):
+            collect_dags(incremental=True, snapshot="snapshot.json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+from unittest.mock import MagicMock, patch
 
-from dagger.utilities.classes import get_deep_obj_subclasses
+from dagger.pipeline.task import Task
+from dagger.pipeline.task_factory import TaskFactory
+from dagger.utilities.classes import PluginRegistry, get_deep_obj_subclasses
 
 
 class TestSubclasses(unittest.TestCase):
@@ -55,6 +58,122 @@ class TestSubclasses(unittest.TestCase):
         # Assert
         self.assertListEqual(subclasses, [B, C, X, Y, Z])
 
+    def test_get_obj_deep_subclasses_no_duplicates(self):
+        class A:
+            pass
+
+        class B(A):
+            pass
+
+        class C(A):
+            pass
+
+        class X(B):
+            pass
+
+        class Y(X, C):
+            pass
+
+        class Z(Y):
+            pass
+
+        self.assertListEqual(get_deep_obj_subclasses(A), [B, C, X, Y, Z])
+
+
+class TestPluginRegistry(unittest.TestCase):
+    def setUp(self):
+        class Base:
+            ref_name = None
+
+        class First(Base):
+            ref_name = "first"
+
+        self.Base = Base
+        self.First = First
+        self.registry = PluginRegistry(Base)
+
+    def test_plugins_are_cached(self):
+        plugins = self.registry.plugins
+
+        self.assertDictEqual(plugins, {"first": self.First})
+        with patch(
+            "dagger.utilities.classes.get_deep_obj_subclasses"
+        ) as subclasses_mock:
+            self.assertIs(self.registry.plugins, plugins)
+            self.assertIs(self.registry["first"], self.First)
+        subclasses_mock.assert_not_called()
+
+    def test_late_subclass_is_found(self):
+        plugins = self.registry.plugins
+
+        class Second(self.Base):
+            ref_name = "second"
+
+        self.assertIs(self.registry["second"], Second)
+        self.assertIs(plugins["second"], Second)
+        with self.assertRaises(KeyError):
+            self.registry["third"]
+
+    def test_register(self):
+        class Other(self.Base):
+            ref_name = "first"
+
+        self.registry.register(self.First)
+        self.assertIs(self.registry["first"], self.First)
+
+        @self.registry.register(ref_name="other")
+        class Renamed(self.Base):
+            ref_name = "renamed"
+
+        self.assertIs(self.registry["other"], Renamed)
+        with self.assertRaises(TypeError):
+            self.registry.register(int)
+
+    def test_entry_points(self):
+        class External(self.Base):
+            ref_name = "external"
+
+        entry_point = MagicMock()
+        entry_point.name = "external"
+        entry_point.load.return_value = External
+        broken_entry_point = MagicMock()
+        broken_entry_point.name = "broken"
+        broken_entry_point.load.side_effect = ImportError("missing module")
+
+        registry = PluginRegistry(self.Base, entry_point_group="dagger.test")
+        with patch(
+            "dagger.utilities.classes.entry_points",
+            return_value=[broken_entry_point, entry_point],
+        ) as entry_points_mock:
+            self.assertIs(registry["external"], External)
+            broken_entry_point.load.assert_not_called()
+
+            self.assertDictEqual(
+                registry.plugins, {"first": self.First, "external": External}
+            )
+            broken_entry_point.load.assert_called_once()
+
+        entry_points_mock.assert_called_once_with(group="dagger.test")
+
+    def test_lazy_modules(self):
+        registry = PluginRegistry(
+            self.Base, lazy_modules={"lazy": "json", "missing": "dagger.no_such_module"}
+        )
+
+        with patch("dagger.utilities.classes.importlib.import_module") as import_mock:
+            self.assertIs(registry["first"], self.First)
+            import_mock.assert_not_called()
+            self.assertIsNone(registry.get("lazy"))
+            import_mock.assert_called_once_with("json")
+
+        with self.assertRaises(ImportError):
+            registry.get("missing")
+
+    def test_factories_share_the_registry(self):
+        self.assertIs(TaskFactory().factory, TaskFactory().factory)
+        self.assertIs(TaskFactory().factory, TaskFactory.registry.plugins)
+        self.assertTrue(issubclass(TaskFactory().factory["batch"], Task))
+
 
 if __name__ == "__main__":
     unittest.main()
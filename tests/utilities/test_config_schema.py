@@ -0,0 +1,121 @@
+import os
+import unittest
+
+from dagger import conf
+from dagger.utilities import yaml_loader
+from dagger.utilities.config_schema import (
+    SchemaValidator,
+    get_schema_validator,
+    pipeline_schema,
+    task_schema,
+)
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+
+class TestConfigSchema(unittest.TestCase):
+    def setUp(self):
+        self._batch_config_path = os.path.join(
+            conf.DAGS_DIR, "test_batch", "batch.yaml"
+        )
+        self._batch_config = yaml_loader.load_env_yaml(self._batch_config_path)
+
+    def test_pipeline_schema(self):
+        schema = pipeline_schema()
+
+        self.assertListEqual(
+            schema["required"],
+            [
+                "owner",
+                "description",
+                "schedule",
+                "start_date",
+                "airflow_parameters",
+                "alerts",
+            ],
+        )
+        self.assertDictEqual(
+            schema["properties"]["airflow_parameters"]["properties"]["default_args"],
+            {"description": "dictionary", "type": ["object", "null"]},
+        )
+        self.assertEqual(schema["properties"]["airflow_parameters"]["type"], "object")
+
+    def test_task_schema(self):
+        schema = task_schema()
+        batch_schema = schema["definitions"]["task_batch"]
+
+        self.assertIn("batch", schema["properties"]["type"]["enum"])
+        self.assertEqual(batch_schema["properties"]["type"]["const"], "batch")
+        self.assertIn(
+            "executable", batch_schema["properties"]["task_parameters"]["required"]
+        )
+        self.assertDictEqual(
+            batch_schema["properties"]["inputs"]["items"], {"$ref": "#/definitions/io"}
+        )
+        self.assertIn("name", schema["definitions"]["io_s3"]["required"])
+
+    def test_valid_config(self):
+        errors = list(
+            get_schema_validator("task").iter_errors(
+                self._batch_config, self._batch_config_path
+            )
+        )
+
+        self.assertListEqual(errors, [])
+
+    def test_errors(self):
+        del self._batch_config["description"]
+        del self._batch_config["task_parameters"]["executable"]
+        self._batch_config["inputs"][0]["type"] = "unknown"
+        self._batch_config["outputs"][1]["name"] = None
+
+        errors = list(
+            get_schema_validator("task").iter_errors(self._batch_config, "batch.yaml")
+        )
+
+        self.assertListEqual(
+            [(error.field_path, error.message) for error in errors],
+            [
+                ("description", "Required field: description is missing in batch.yaml"),
+                (
+                    "inputs[0].type",
+                    "Wrong format for field: type in batch.yaml "
+                    "with error: unknown value unknown",
+                ),
+                ("outputs[1].name", "Field name cannot be empty in batch.yaml"),
+                (
+                    "task_parameters.executable",
+                    "Required field: executable is missing in batch.yaml",
+                ),
+            ],
+        )
+
+    def test_unknown_task_type(self):
+        errors = list(
+            get_schema_validator("task").iter_errors({"type": "unknown"}, "task.yaml")
+        )
+
+        self.assertListEqual([error.field_path for error in errors], ["type"])
+
+    @unittest.skipIf(jsonschema is None, "jsonschema is not installed")
+    def test_schema_is_valid_json_schema(self):
+        schema = task_schema()
+        jsonschema.Draft7Validator.check_schema(schema)
+
+        del self._batch_config["description"]
+        self._batch_config["outputs"][1]["name"] = None
+        expected_errors = list(
+            SchemaValidator(schema).iter_errors(self._batch_config, "batch.yaml")
+        )
+        json_schema_errors = list(
+            jsonschema.Draft7Validator(schema).iter_errors(self._batch_config)
+        )
+
+        self.assertEqual(len(json_schema_errors), len(expected_errors))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import unittest
+
+from dagger.utilities.config_validator import (
+    Attribute,
+    ConfigError,
+    ConfigValidator,
+    collect_errors,
+    field_prefix,
+)
+from dagger.utilities.exceptions import (
+    DaggerFieldFormatException,
+    DaggerMissingFieldException,
+)
+
+
+class SampleValidator(ConfigValidator):
+    @classmethod
+    def init_attributes(cls, orig_cls):
+        cls.add_config_attributes(
+            [
+                Attribute(attribute_name="name"),
+                Attribute(attribute_name="parameters", nullable=True),
+                Attribute(
+                    attribute_name="retries",
+                    parent_fields=["parameters"],
+                    validator=int,
+                ),
+                Attribute(
+                    attribute_name="owner", parent_fields=["parameters"], required=False
+                ),
+                Attribute(attribute_name="description", required=False),
+            ]
+        )
+
+
+class SampleChildValidator(SampleValidator):
+    @classmethod
+    def init_attributes(cls, orig_cls):
+        cls.add_config_attributes(
+            [
+                Attribute(attribute_name="owner", parent_fields=["parameters"]),
+                Attribute(attribute_name="target", parent_fields=["parameters"]),
+                Attribute(
+                    attribute_name="table", parent_fields=["parameters", "target"]
+                ),
+            ]
+        )
+
+
+class CountingDict(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = 0
+
+    def __getitem__(self, key):
+        self.lookups += 1
+        return super().__getitem__(key)
+
+
+class TestConfigValidator(unittest.TestCase):
+    def test_parse_attribute(self):
+        validator = SampleValidator(
+            "sample.yaml", {"name": "sample", "parameters": {"retries": "3"}}
+        )
+
+        self.assertEqual(validator.parse_attribute("name"), "sample")
+        self.assertEqual(validator.parse_attribute("retries"), 3)
+        self.assertIsNone(validator.parse_attribute("owner"))
+        self.assertIsNone(validator.parse_attribute("description"))
+
+    def test_parse_all(self):
+        validator = SampleChildValidator(
+            "sample.yaml",
+            {
+                "name": "sample",
+                "parameters": {
+                    "retries": "3",
+                    "owner": "me",
+                    "target": {"table": "tbl"},
+                },
+            },
+        )
+
+        self.assertDictEqual(
+            validator.parse_all(),
+            {
+                "name": "sample",
+                "parameters": {
+                    "retries": "3",
+                    "owner": "me",
+                    "target": {"table": "tbl"},
+                },
+                "retries": 3,
+                "owner": "me",
+                "description": None,
+                "target": {"table": "tbl"},
+                "table": "tbl",
+            },
+        )
+        self.assertEqual(validator.parse_attribute("retries"), 3)
+
+    def test_config_parsed_once(self):
+        parameters = CountingDict(
+            {"retries": "3", "owner": "me", "target": {"table": "tbl"}}
+        )
+        config = CountingDict({"name": "sample", "parameters": parameters})
+        validator = SampleChildValidator("sample.yaml", config)
+        lookups = (config.lookups, parameters.lookups)
+
+        for attribute_name in (
+            "name",
+            "retries",
+            "owner",
+            "target",
+            "table",
+            "retries",
+        ):
+            validator.parse_attribute(attribute_name)
+        validator.parse_all()
+
+        self.assertTupleEqual((config.lookups, parameters.lookups), lookups)
+
+    def test_error_messages(self):
+        missing_validator = SampleChildValidator(
+            "sample.yaml", {"name": "sample", "parameters": None}
+        )
+        with self.assertRaisesRegex(
+            DaggerMissingFieldException,
+            "^Required field: retries is missing in sample.yaml$",
+        ):
+            missing_validator.parse_attribute("retries")
+        with self.assertRaisesRegex(
+            DaggerMissingFieldException,
+            "^Required field: retries is missing in sample.yaml$",
+        ):
+            missing_validator.parse_all()
+
+        empty_validator = SampleValidator("sample.yaml", {"name": None})
+        with self.assertRaisesRegex(
+            DaggerFieldFormatException, "^Field name cannot be empty in sample.yaml$"
+        ):
+            empty_validator.parse_attribute("name")
+
+        wrong_validator = SampleValidator(
+            "sample.yaml", {"name": "sample", "parameters": {"retries": "many"}}
+        )
+        with self.assertRaisesRegex(
+            DaggerFieldFormatException,
+            "^Wrong format for field: retries in sample.yaml "
+            "with error: invalid literal",
+        ):
+            wrong_validator.parse_all()
+
+    def test_collect_errors(self):
+        with collect_errors() as errors:
+            validator = SampleChildValidator(
+                "sample.yaml", {"name": None, "parameters": {"retries": "many"}}
+            )
+            with field_prefix("inputs[0]"):
+                self.assertIsNone(validator.parse_attribute("table"))
+            parsed_values = validator.parse_all()
+
+        self.assertIsNone(parsed_values["name"])
+        self.assertIsNone(parsed_values["retries"])
+        self.assertListEqual(
+            [(error.location, error.field_path) for error in errors],
+            [
+                ("sample.yaml", "inputs[0].parameters.target.table"),
+                ("sample.yaml", "name"),
+                ("sample.yaml", "parameters.retries"),
+                ("sample.yaml", "parameters.owner"),
+                ("sample.yaml", "parameters.target"),
+                ("sample.yaml", "parameters.target.table"),
+            ],
+        )
+        self.assertEqual(
+            errors[1],
+            ConfigError(
+                "sample.yaml", "name", "Field name cannot be empty in sample.yaml"
+            ),
+        )
+
+        # Outside of the context the first error is raised again
+        with self.assertRaises(DaggerFieldFormatException):
+            validator.parse_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,7 +33,7 @@ MODEL_NAME = "model1"
 class TestAthenaDBTConfigParser(unittest.TestCase):
     @patch("builtins.open", new_callable=MagicMock, read_data=DBT_MANIFEST_FILE_FIXTURE)
     @patch("json.loads", return_value=DBT_MANIFEST_FILE_FIXTURE)
-    @patch("yaml.safe_load", return_value=DBT_PROFILE_FIXTURE)
+    @patch("dagger.utilities.yaml_loader.safe_load", return_value=DBT_PROFILE_FIXTURE)
     def setUp(self, mock_open, mock_json_load, mock_safe_load):
         self._dbt_config_parser = AthenaDBTConfigParser(DEFAULT_CONFIG_PARAMS)
         self._sample_dbt_node = DBT_MANIFEST_FILE_FIXTURE["nodes"]["model.main.model1"]
@@ -100,7 +100,10 @@ class TestDatabricksDBTConfigParser(unittest.TestCase):
         read_data=DATABRICKS_DBT_MANIFEST_FILE_FIXTURE,
     )
     @patch("json.loads", return_value=DATABRICKS_DBT_MANIFEST_FILE_FIXTURE)
-    @patch("yaml.safe_load", return_value=DATABRICKS_DBT_PROFILE_FIXTURE)
+    @patch(
+        "dagger.utilities.yaml_loader.safe_load",
+        return_value=DATABRICKS_DBT_PROFILE_FIXTURE,
+    )
     def setUp(self, mock_open, mock_json_load, mock_safe_load):
         self._dbt_config_parser = DatabricksDBTConfigParser(
             DATABRICKS_DEFAULT_CONFIG_PARAMS
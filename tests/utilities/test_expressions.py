@@ -0,0 +1,78 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from dagger.utilities.exceptions import InvalidExpressionException
+from dagger.utilities.expressions import _evaluate_cached, evaluate
+
+
+class TestExpressions(unittest.TestCase):
+    def test_task_expressions(self):
+        self.assertEqual(evaluate("datetime.timedelta(hours=2)"), timedelta(hours=2))
+        self.assertEqual(
+            evaluate("datetime.timedelta(minutes=30) * 2 + timedelta(1)"),
+            timedelta(days=1, hours=1),
+        )
+        self.assertEqual(
+            evaluate("datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)"),
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+        self.assertEqual(evaluate("60 * 60 * 24 // 2 - 1"), 43199)
+        self.assertEqual(evaluate("2 ** 10"), 1024)
+        self.assertEqual(
+            evaluate("{'retries': [1, 2], 'delay': -1.5}"),
+            {"retries": [1, 2], "delay": -1.5},
+        )
+        self.assertEqual(evaluate("max(1, int('3'))"), 3)
+
+    def test_pipeline_expressions(self):
+        self.assertEqual(
+            evaluate("timedelta(hours=2)", namespace="pipeline"), timedelta(hours=2)
+        )
+        self.assertEqual(
+            evaluate("datetime(2024, 1, 1)", namespace="pipeline"), datetime(2024, 1, 1)
+        )
+
+    def test_results_are_cached(self):
+        _evaluate_cached.cache_clear()
+        evaluate("timedelta(seconds=5)", namespace="pipeline")
+        evaluate("timedelta(seconds=5)", namespace="pipeline")
+
+        self.assertEqual(_evaluate_cached.cache_info().hits, 1)
+
+    def test_mutable_results_are_copied(self):
+        first = evaluate("[1, 2]")
+        first.append(3)
+
+        self.assertEqual(evaluate("[1, 2]"), [1, 2])
+
+        evaluate("(1, [2])")[1].append(3)
+        self.assertEqual(evaluate("(1, [2])"), (1, [2]))
+
+    def test_rejected_expressions(self):
+        for expression in [
+            "__import__('os').system('true')",
+            "open('/etc/passwd')",
+            "datetime.datetime.now()",
+            "timedelta.__class__",
+            "(1).__class__",
+            "[x for x in range(3)]",
+            "lambda: 1",
+            "datetime.sys",
+            "2 ** 1000",
+            "((10 ** 64) ** 64) ** 64",
+            "(10 ** 64) ** 19 * (10 ** 64) ** 19",
+            "'a' * 100000",
+            "int(*[1])",
+            "1 if True else 2",
+        ]:
+            with self.assertRaises(InvalidExpressionException, msg=expression):
+                evaluate(expression)
+
+        with self.assertRaisesRegex(
+            InvalidExpressionException, "^Invalid expression: timedelta\\("
+        ):
+            evaluate("timedelta(", namespace="pipeline")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from dagger.utilities import yaml_loader
+
+
+class TestYamlLoader(unittest.TestCase):
+    def setUp(self):
+        self._environment = {"BUCKET": "my-bucket", "ENV": "local", "EMPTY": ""}
+
+    def _load(self, content, strict=True):
+        return yaml_loader.load_env_yaml_content(
+            content, strict=strict, environment=self._environment
+        )
+
+    def test_substitution(self):
+        content = (
+            "# comment with $UNDEFINED\n"
+            "named: $BUCKET\n"
+            "braced: cho${ENV}-test\n"
+            "named_default: $MISSING|fallback\n"
+            "braced_default: ${MISSING|fallback}\n"
+            "escaped: $$PRICE\n"
+            "empty: '$EMPTY'\n"
+        )
+
+        self.assertDictEqual(
+            self._load(content),
+            {
+                "named": "my-bucket",
+                "braced": "cholocal-test",
+                "named_default": "fallback",
+                "braced_default": "fallback",
+                "escaped": "$PRICE",
+                "empty": "",
+            },
+        )
+
+    def test_strict_mode(self):
+        with self.assertRaises(ValueError):
+            self._load("bucket: ${UNDEFINED}\n")
+
+        self.assertDictEqual(
+            self._load("bucket: ${UNDEFINED}\n", strict=False),
+            {"bucket": "${UNDEFINED}"},
+        )
+
+        self._environment[yaml_loader.ENVYAML_STRICT_DISABLE] = ""
+        self.assertDictEqual(
+            self._load("bucket: ${UNDEFINED}\n"), {"bucket": "${UNDEFINED}"}
+        )
+
+    def test_non_dict_documents(self):
+        self.assertDictEqual(self._load("- a\n- b\n"), {0: "a", 1: "b"})
+        self.assertDictEqual(self._load(""), {})
+        self.assertDictEqual(self._load("just a string"), {})
+
+    def test_env_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            env_file = os.path.join(tmp_dir, "test.env")
+            with open(env_file, "w") as stream:
+                stream.write("DAGGER_TEST_FROM_ENV_FILE=from_file\n")
+
+            with patch.dict(os.environ, {"ENV_FILE": env_file}):
+                environment = yaml_loader.get_environment()
+
+        self.assertEqual(environment["DAGGER_TEST_FROM_ENV_FILE"], "from_file")
+
+    def test_referenced_env_vars(self):
+        content = "a: $FIRST\nb: ${SECOND}\nc: ${THIRD|default}\nd: $$ESCAPED\n"
+
+        self.assertListEqual(
+            yaml_loader.referenced_env_vars(content), ["FIRST", "SECOND", "THIRD"]
+        )
+
+    def test_dump_roundtrip(self):
+        data = {"b": [1, 2, {"c": None}], "a": "text"}
+
+        dumped = yaml_loader.safe_dump(data, default_flow_style=False, sort_keys=False)
+
+        self.assertTrue(dumped.startswith("b:"))
+        self.assertDictEqual(yaml_loader.safe_load(dumped), data)
+
+
+if __name__ == "__main__":
+    unittest.main()